@@ -10,12 +10,23 @@ from auth.auth_routes import auth_bp
 from products.product_routes import product_bp
 from orders.order_routes import order_bp
 from logs.log_routes import log_bp
+from logs.activity_logger import init_activity_logger
+from logs.log_commands import logs_cli
+from orders.order_commands import orders_cli
+from orders.order_audit import init_integrity_audit
+from orders.order_payload import init_order_payload
+from orders.transaction_ids import init_transaction_ids
+from security.crypto_context import init_crypto_context
+from security.signing_service import init_signing_service
 from admin.admin_routes import admin_bp
 from users.user_routes import user_bp
 from security.security_routes import security_bp
+from utils.metrics import init_metrics
+from middleware.request_metrics import init_request_metrics
+from middleware.sql_profiler import init_sql_profiler
 
 
-def create_app():
+def create_app(test_config=None):
     try:
         from dotenv import load_dotenv
         env_path = os.path.join(os.path.dirname(__file__), ".env")
@@ -28,16 +39,27 @@ def create_app():
 
     app = Flask(__name__)
     app.config.from_object(Config)
+    if test_config:
+        app.config.update(test_config)
 
     # ============================
     # INIT EXTENSIONS
     # ============================
+    init_crypto_context(app)
+    init_metrics(app)
     db.init_app(app)
     Migrate(app, db)
     CORS(app, supports_credentials=True, origins=["http://localhost:3000", "http://127.0.0.1:3000"])
     jwt = JWTManager(app)
     mail = Mail(app)
     app.mail = mail
+    init_activity_logger(app)
+    init_integrity_audit(app)
+    init_order_payload(app)
+    init_transaction_ids(app)
+    init_signing_service(app)
+    init_request_metrics(app)
+    init_sql_profiler(app)
 
     # ============================
     # JWT ERROR HANDLERS
@@ -74,6 +96,12 @@ def create_app():
     app.register_blueprint(user_bp, url_prefix="/user")
     app.register_blueprint(security_bp, url_prefix="/security")
 
+    # ============================
+    # CLI COMMANDS
+    # ============================
+    app.cli.add_command(logs_cli)
+    app.cli.add_command(orders_cli)
+
     @app.route("/", methods=["GET"])
     def health_check():
         return jsonify({"status": "ok"}), 200
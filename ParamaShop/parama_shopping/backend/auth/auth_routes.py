@@ -1,7 +1,6 @@
 from flask import Blueprint, request
 import os
 from flask_jwt_extended import (
-    create_access_token,
     jwt_required,
     get_jwt_identity
 )
@@ -12,6 +11,7 @@ from utils.response_handler import success, error
 from logs.activity_logger import log_activity
 from auth.password_utils import hash_password, verify_password
 from auth.otp_service import save_otp
+from auth.session_manager import issue_access_token
 
 auth_bp = Blueprint("auth", __name__)
 
@@ -140,7 +140,7 @@ def verify_otp():
         return error("User ID and OTP required")
 
     if os.environ.get("OTP_BYPASS", "false").lower() == "true":
-        token = create_access_token(identity=user_id)
+        token = issue_access_token(user_id)
         log_activity(user_id, "OTP Bypassed")
         return success("OTP bypassed", {"token": token})
 
@@ -160,7 +160,7 @@ def verify_otp():
     otp_record.is_verified = True
     db.session.commit()
 
-    token = create_access_token(identity=user_id)
+    token = issue_access_token(user_id)
     log_activity(user_id, "OTP Verified")
 
     return success("OTP verified", {
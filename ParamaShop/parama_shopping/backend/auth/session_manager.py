@@ -0,0 +1,19 @@
+from flask_jwt_extended import create_access_token
+from middleware.principal import fetch_principal
+
+def build_token_claims(user_id):
+    """Signed authorization claims so role_required can skip the database."""
+    principal = fetch_principal(user_id)
+    if principal is None:
+        return {}
+    return {
+        "role": principal.role_name,
+        "status": principal.status,
+        "seller_status": principal.seller_status,
+        "shop_name": principal.shop_name,
+        "tv": principal.token_version,
+    }
+
+def issue_access_token(user_id):
+    lookup_id = int(user_id) if isinstance(user_id, str) and user_id.isdigit() else user_id
+    return create_access_token(identity=user_id, additional_claims=build_token_claims(lookup_id))
@@ -0,0 +1,85 @@
+"""Per-call overhead removed by CryptoContext: cached padding/hash objects and batch helpers.
+
+Run from backend/:  python -m benchmarks.bench_crypto_context --iterations 5000
+"""
+import argparse
+import base64
+import json
+import time
+from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import padding
+from security.crypto_context import CryptoContext, get_crypto_context
+
+
+def measure(func, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+
+    context = get_crypto_context()
+    payload = json.dumps({
+        "items": [{"product_id": n, "quantity": 1, "price": 19.99} for n in range(3)],
+        "total": 59.97,
+        "transaction_id": "TXN-1-20260214-105156514051141632",
+    })
+    data = payload.encode()
+    signature = context.rsa.sign(data)
+    signature_b64 = base64.b64encode(signature).decode()
+    public_key = context.rsa_public_key
+
+    def legacy_verify():
+        # What digital_signature.verify_order_signature did on every call.
+        public_key.verify(
+            signature,
+            data,
+            padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.MAX_LENGTH),
+            hashes.SHA256(),
+        )
+
+    rows = [
+        ("key load (once per process)", measure(lambda: CryptoContext.from_config({
+            "ENCRYPTION_KEY": context.fernet_keys[0], "RSA_KEY_DIR": context.key_dir,
+        }), max(1, args.iterations // 100))),
+        ("PSS padding objects only", measure(
+            lambda: (padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.MAX_LENGTH), hashes.SHA256()),
+            args.iterations,
+        )),
+        ("RSA verify, new padding/call", measure(legacy_verify, args.iterations)),
+        ("RSA verify, cached padding", measure(lambda: context.rsa.verify(data, signature), args.iterations)),
+        ("Fernet() construction", measure(lambda: Fernet(context.fernet_keys[0]), args.iterations)),
+        ("encrypt (MultiFernet)", measure(lambda: context.encrypt(payload), args.iterations)),
+    ]
+
+    texts = [payload] * args.batch
+    tokens = context.encrypt_many(texts)
+    items = [(payload, signature_b64, None, None)] * args.batch
+    start = time.perf_counter()
+    for text in texts:
+        context.encrypt(text)
+    rows.append(("encrypt loop, per item", (time.perf_counter() - start) / args.batch * 1e6))
+    start = time.perf_counter()
+    context.encrypt_many(texts)
+    rows.append(("encrypt_many, per item", (time.perf_counter() - start) / args.batch * 1e6))
+    start = time.perf_counter()
+    context.decrypt_many(tokens)
+    rows.append(("decrypt_many, per item", (time.perf_counter() - start) / args.batch * 1e6))
+    start = time.perf_counter()
+    context.verify_many(items)
+    rows.append(("verify_many, per item", (time.perf_counter() - start) / args.batch * 1e6))
+
+    print(f"{'operation':<32}{'us/call':>10}")
+    for name, micros in rows:
+        print(f"{name:<32}{micros:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
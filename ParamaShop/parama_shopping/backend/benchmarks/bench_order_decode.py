@@ -0,0 +1,71 @@
+"""Batch order decode throughput: serial vs thread pool vs process pool.
+
+Run from backend/:  python -m benchmarks.bench_order_decode --orders 10000 --workers 8
+"""
+import argparse
+import json
+import os
+import time
+from types import SimpleNamespace
+from security.encryption import encrypt_data
+from security.signers import sign_payload
+from orders.order_payload import decode_pool, decode_order_payloads, payload_cache
+
+
+def build_orders(count, sign):
+    orders = []
+    for order_id in range(1, count + 1):
+        payload = json.dumps({
+            "items": [
+                {"product_id": order_id % 50 + n, "quantity": n + 1, "price": 19.99 + n}
+                for n in range(3)
+            ],
+            "total": 99.97,
+            "timestamp": "2026-02-01T10:00:00",
+            "delivery": {"name": "Bench User", "city": "Chennai", "postal_code": "600001", "country": "IN"},
+            "transaction_id": f"TXN-1-20260201-{order_id:04d}",
+        })
+        signature, algorithm, key_id = sign_payload(payload) if sign else (None, None, None)
+        orders.append(SimpleNamespace(
+            order_id=order_id,
+            encrypted_data=encrypt_data(payload),
+            order_signature=signature,
+            signature_alg=algorithm,
+            signature_key_id=key_id,
+        ))
+    return orders
+
+
+def run(orders, kind, workers, verify):
+    decode_pool.configure(workers=workers, kind=kind, min_parallel=1)
+    decode_order_payloads(orders[:workers * 4], verify=verify)  # warm the pool
+    start = time.perf_counter()
+    results = decode_order_payloads(orders, verify=verify)
+    elapsed = time.perf_counter() - start
+    decode_pool.shutdown()
+    assert len(results) == len(orders)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orders", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--no-verify", action="store_true", help="decrypt only, skip RSA verification")
+    args = parser.parse_args()
+    verify = not args.no_verify
+
+    print(f"Building {args.orders} orders (verify={verify})...")
+    orders = build_orders(args.orders, sign=verify)
+    payload_cache.resize(0)  # measure decoding, not cache hits
+
+    baseline = run(orders, "thread", 1, verify)
+    print(f"{'mode':<10}{'workers':>8}{'seconds':>10}{'orders/s':>12}{'speedup':>9}")
+    print(f"{'serial':<10}{1:>8}{baseline:>10.2f}{args.orders / baseline:>12.0f}{1.0:>8.2f}x")
+    for kind in ("thread", "process"):
+        elapsed = run(orders, kind, args.workers, verify)
+        print(f"{kind:<10}{args.workers:>8}{elapsed:>10.2f}{args.orders / elapsed:>12.0f}{baseline / elapsed:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Sign/verify throughput of the order signers: RSA-2048 PSS vs Ed25519.
+
+Run from backend/:  python -m benchmarks.bench_signers --iterations 2000
+"""
+import argparse
+import json
+import time
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+from security.signers import RSAPSSSigner, Ed25519Signer
+
+
+def measure(func, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    payload = json.dumps({
+        "items": [{"product_id": n, "quantity": 1, "price": 19.99} for n in range(3)],
+        "total": 59.97,
+        "delivery": {"name": "Bench User", "city": "Chennai", "country": "IN"},
+        "transaction_id": "TXN-1-20260214-105156514051141632",
+    }).encode()
+    rsa_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    signers = [RSAPSSSigner(rsa_key, rsa_key.public_key()), Ed25519Signer(ed25519.Ed25519PrivateKey.generate())]
+
+    print(f"{'algorithm':<16}{'sign us':>10}{'verify us':>11}{'sign/s':>10}{'verify/s':>10}{'sig bytes':>11}")
+    for signer in signers:
+        signature = signer.sign(payload)
+        sign_time = measure(lambda: signer.sign(payload), args.iterations)
+        verify_time = measure(lambda: signer.verify(payload, signature), args.iterations)
+        print(
+            f"{signer.algorithm:<16}{sign_time * 1e6:>10.0f}{verify_time * 1e6:>11.0f}"
+            f"{1 / sign_time:>10.0f}{1 / verify_time:>10.0f}{len(signature):>11}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Hammer one hot SKU from many threads and check that stock never oversells.
+
+Run from backend/:  python -m benchmarks.bench_stock_contention --threads 32 --attempts 2000 --stock 500
+Uses DATABASE_URL when set (PostgreSQL shows real row-lock behaviour), else a temporary SQLite file.
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask
+from database.db import db
+from database.models import Product
+from orders.inventory import reserve_stock, InsufficientStock
+
+HOT_SKU = 900001
+COLD_SKU = 900002
+
+
+def build_app(database_url):
+    app = Flask(__name__)
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI=database_url,
+        SQLALCHEMY_ENGINE_OPTIONS={"pool_size": 64, "max_overflow": 0}
+        if database_url.startswith("postgresql") else {"connect_args": {"timeout": 60}},
+    )
+    db.init_app(app)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--attempts", type=int, default=2000)
+    parser.add_argument("--stock", type=int, default=500)
+    args = parser.parse_args()
+
+    database_url = os.environ.get("DATABASE_URL")
+    if not database_url:
+        database_url = f"sqlite:///{tempfile.mkstemp(suffix='.db')[1]}"
+    app = build_app(database_url)
+
+    with app.app_context():
+        db.create_all()
+        for product_id in (HOT_SKU, COLD_SKU):
+            db.session.merge(Product(product_id=product_id, product_name="Bench SKU", price=1, stock=args.stock))
+        db.session.commit()
+
+    latencies = []
+    outcomes = {"reserved": 0, "rejected": 0, "errors": 0}
+    lock = threading.Lock()
+
+    def checkout(n):
+        # Every other cart also touches a second SKU in the opposite listing
+        # order, exercising the sorted lock ordering.
+        items = [{"product_id": HOT_SKU, "quantity": 1}]
+        if n % 2:
+            items.insert(0, {"product_id": COLD_SKU, "quantity": 0})
+        with app.app_context():
+            start = time.perf_counter()
+            try:
+                reserve_stock(items)
+                db.session.commit()
+                outcome = "reserved"
+            except InsufficientStock:
+                db.session.rollback()
+                outcome = "rejected"
+            except Exception:
+                db.session.rollback()
+                outcome = "errors"
+            finally:
+                db.session.remove()
+            elapsed = time.perf_counter() - start
+        with lock:
+            outcomes[outcome] += 1
+            latencies.append(elapsed)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        list(pool.map(checkout, range(args.attempts)))
+    wall = time.perf_counter() - start
+
+    with app.app_context():
+        final_stock = db.session.get(Product, HOT_SKU).stock
+        db.session.query(Product).filter(Product.product_id.in_([HOT_SKU, COLD_SKU])).delete()
+        db.session.commit()
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(f"attempts={args.attempts} threads={args.threads} wall={wall:.2f}s ({args.attempts / wall:.0f}/s)")
+    print(f"reserved={outcomes['reserved']} rejected={outcomes['rejected']} errors={outcomes['errors']}")
+    print(f"latency ms p50={quantiles[49] * 1000:.1f} p95={quantiles[94] * 1000:.1f} p99={quantiles[98] * 1000:.1f}")
+    print(f"final stock={final_stock} expected={max(args.stock - args.attempts, 0)}")
+    oversold = outcomes["reserved"] > args.stock or final_stock < 0
+    print("OVERSOLD" if oversold else "no oversell")
+    raise SystemExit(1 if oversold else 0)
+
+
+if __name__ == "__main__":
+    main()
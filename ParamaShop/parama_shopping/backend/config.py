@@ -6,6 +6,76 @@ class Config:
     JWT_SECRET_KEY = (os.environ.get('JWT_SECRET_KEY', SECRET_KEY) or SECRET_KEY).strip()
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # development | production; production refuses unsafe defaults at startup
+    APP_ENV = os.environ.get('APP_ENV', 'development')
+
+    # Crypto keys, loaded once into security.crypto_context by create_app.
+    # ENCRYPTION_OLD_KEYS (comma separated) still decrypt; RSA_KEY_DIR defaults to security/keys
+    ENCRYPTION_KEY = os.environ.get('ENCRYPTION_KEY')
+    ENCRYPTION_OLD_KEYS = [k.strip() for k in os.environ.get('ENCRYPTION_OLD_KEYS', '').split(',') if k.strip()]
+    RSA_KEY_DIR = os.environ.get('RSA_KEY_DIR')
+
+    # Seconds a loaded Principal (role / seller status) is reused across requests; 0 disables.
+    # Entries older than the user's current token_version are ignored, so this does not add revocation lag.
+    PRINCIPAL_CACHE_TTL = int(os.environ.get('PRINCIPAL_CACHE_TTL', 30))
+    # Seconds a user's token_version is trusted before re-reading it. Admin disable / approve / reject /
+    # delete clears only the handling process's caches; other workers honour it within this many seconds
+    TOKEN_VERSION_CACHE_TTL = int(os.environ.get('TOKEN_VERSION_CACHE_TTL', 5))
+
+    # Activity log writer: rows are queued and inserted in batches by a background thread
+    ACTIVITY_LOG_ASYNC = os.environ.get('ACTIVITY_LOG_ASYNC', 'True') == 'True'
+    ACTIVITY_LOG_BATCH_SIZE = int(os.environ.get('ACTIVITY_LOG_BATCH_SIZE', 100))
+    ACTIVITY_LOG_FLUSH_INTERVAL = float(os.environ.get('ACTIVITY_LOG_FLUSH_INTERVAL', 1.0))
+    ACTIVITY_LOG_QUEUE_SIZE = int(os.environ.get('ACTIVITY_LOG_QUEUE_SIZE', 10000))
+    ACTIVITY_LOG_ENQUEUE_TIMEOUT = float(os.environ.get('ACTIVITY_LOG_ENQUEUE_TIMEOUT', 0.05))
+
+    # Log retention (flask logs archive / flask logs ensure-partitions)
+    LOG_RETENTION_DAYS = int(os.environ.get('LOG_RETENTION_DAYS', 90))
+    LOG_ARCHIVE_DIR = os.environ.get('LOG_ARCHIVE_DIR', os.path.join(os.path.dirname(__file__), 'log_archive'))
+    LOG_PARTITION_MONTHS_AHEAD = int(os.environ.get('LOG_PARTITION_MONTHS_AHEAD', 3))
+
+    # Periodic order signature re-verification; enable (seconds > 0) on one process only.
+    # Off by default: deploys run `flask orders audit-signatures --unchecked-only` after `flask db upgrade`.
+    INTEGRITY_AUDIT_INTERVAL = int(os.environ.get('INTEGRITY_AUDIT_INTERVAL', 0))
+    INTEGRITY_AUDIT_MAX_AGE_HOURS = float(os.environ.get('INTEGRITY_AUDIT_MAX_AGE_HOURS', 24))
+    INTEGRITY_AUDIT_BATCH_SIZE = int(os.environ.get('INTEGRITY_AUDIT_BATCH_SIZE', 500))
+    INTEGRITY_AUDIT_PROCESSES = int(os.environ.get('INTEGRITY_AUDIT_PROCESSES', 0))
+
+    # Decoded order payload LRU (approximate bytes); 0 disables caching
+    ORDER_PAYLOAD_CACHE_BYTES = int(os.environ.get('ORDER_PAYLOAD_CACHE_BYTES', 64 * 1024 * 1024))
+
+    # Batch order decoding pool: thread | process; 0 workers = one per CPU
+    ORDER_DECODE_EXECUTOR = os.environ.get('ORDER_DECODE_EXECUTOR', 'thread')
+    ORDER_DECODE_WORKERS = int(os.environ.get('ORDER_DECODE_WORKERS', 0))
+    ORDER_DECODE_MIN_PARALLEL = int(os.environ.get('ORDER_DECODE_MIN_PARALLEL', 64))
+
+    # Order signing: sync signs on the request; async commits first and signs on a worker pool
+    ORDER_SIGNING_MODE = os.environ.get('ORDER_SIGNING_MODE', 'sync')
+    ORDER_SIGNING_EXECUTOR = os.environ.get('ORDER_SIGNING_EXECUTOR', 'thread')
+    ORDER_SIGNING_WORKERS = int(os.environ.get('ORDER_SIGNING_WORKERS', 2))
+    ORDER_SIGNING_QUEUE_SIZE = int(os.environ.get('ORDER_SIGNING_QUEUE_SIZE', 1000))
+    # Algorithm for new order signatures: RSA-PSS-SHA256 | Ed25519 (existing orders keep verifying)
+    ORDER_SIGNATURE_ALG = os.environ.get('ORDER_SIGNATURE_ALG', 'RSA-PSS-SHA256')
+
+    # Transaction id node: 0-1023 unique per process, or "lease" to lease one from the database
+    # (required for multi-worker servers); unset is only allowed outside production
+    TXN_NODE_ID = os.environ.get('TXN_NODE_ID')
+    TXN_NODE_LEASE_SECONDS = int(os.environ.get('TXN_NODE_LEASE_SECONDS', 300))
+
+    # How long an Idempotency-Key on POST /order/place replays its first response
+    IDEMPOTENCY_KEY_TTL_HOURS = float(os.environ.get('IDEMPOTENCY_KEY_TTL_HOURS', 24))
+
+    # Encoding/crypto primitives log one call in N at DEBUG (counters at /security/metrics); 0 = never
+    METRICS_LOG_SAMPLE_RATE = int(os.environ.get('METRICS_LOG_SAMPLE_RATE', 1000))
+
+    # Prometheus text endpoint GET /metrics (latency, SQL per request, crypto timers); token = Bearer secret,
+    # required in production (APP_ENV=production refuses to start with metrics on and no token)
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'True') == 'True'
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+
+    # Development/CI: X-SQL-* headers per request and warnings for statement shapes repeated N+ times
+    SQL_PROFILER_ENABLED = os.environ.get('SQL_PROFILER_ENABLED', 'False') == 'True'
+    SQL_PROFILER_REPEAT_THRESHOLD = int(os.environ.get('SQL_PROFILER_REPEAT_THRESHOLD', 5))
 
     # Flask-Mail config
     MAIL_SERVER = os.environ.get('MAIL_SERVER')
@@ -15,6 +15,7 @@ class User(db.Model):
     role_id = db.Column(db.Integer, db.ForeignKey("roles.role_id"))
     role = db.relationship("Role", backref="users")
     status = db.Column(db.String(20), default="ACTIVE")
+    token_version = db.Column(db.Integer, nullable=False, default=0, server_default="0")
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
 class SellerProfile(db.Model):
@@ -40,21 +41,36 @@ class OTPVerification(db.Model):
 
 class Product(db.Model):
     __tablename__ = "products"
+    __table_args__ = (
+        db.Index("ix_products_category_price_id", "category", "price", "product_id"),
+        db.Index("ix_products_seller_category_price_id", "seller_id", "category", "price", "product_id"),
+    )
     product_id = db.Column(db.Integer, primary_key=True)
     seller_id = db.Column(db.Integer)
     product_name = db.Column(db.String(150))
     description = db.Column(db.Text)
-    category = db.Column(db.String(80))
-    price = db.Column(db.Float)
+    category = db.Column(db.String(80), nullable=False, default="General", server_default="General")
+    price = db.Column(db.Float, nullable=False)
     stock = db.Column(db.Integer)
 
 class Order(db.Model):
     __tablename__ = "orders"
+    __table_args__ = (
+        db.Index(
+            "ix_orders_signature_pending",
+            "order_id",
+            postgresql_where=db.text("signature_pending"),
+            sqlite_where=db.text("signature_pending"),
+        ),
+    )
     order_id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer)
     encrypted_data = db.Column(db.Text)
     order_signature = db.Column(db.Text)
-    transaction_id = db.Column(db.Text)
+    signature_alg = db.Column(db.String(32))
+    signature_key_id = db.Column(db.String(32))
+    signature_pending = db.Column(db.Boolean, nullable=False, default=False, server_default=db.false())
+    transaction_id = db.Column(db.Text, unique=True, index=True)
     delivery_name = db.Column(db.String(120))
     delivery_phone = db.Column(db.String(30))
     delivery_address_line1 = db.Column(db.String(255))
@@ -63,13 +79,70 @@ class Order(db.Model):
     delivery_state = db.Column(db.String(80))
     delivery_postal_code = db.Column(db.String(20))
     delivery_country = db.Column(db.String(80))
+    integrity_valid = db.Column(db.Boolean)
+    integrity_checked_at = db.Column(db.DateTime, index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class OrderItem(db.Model):
+    __tablename__ = "order_items"
+    __table_args__ = (
+        db.Index("ix_order_items_seller_id_order_id", "seller_id", "order_id"),
+    )
+    order_item_id = db.Column(db.Integer, primary_key=True)
+    order_id = db.Column(db.Integer, db.ForeignKey("orders.order_id", ondelete="CASCADE"), nullable=False, index=True)
+    product_id = db.Column(db.Integer)
+    seller_id = db.Column(db.Integer)
+    quantity = db.Column(db.Integer)
+    unit_price = db.Column(db.Float)
+    order = db.relationship("Order", backref=db.backref("order_items", cascade="all, delete-orphan"))
+
+class TransactionNodeLease(db.Model):
+    __tablename__ = "transaction_node_leases"
+    node_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    holder = db.Column(db.String(120), nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False)
+
+class IdempotencyKey(db.Model):
+    __tablename__ = "idempotency_keys"
+    user_id = db.Column(db.Integer, primary_key=True)
+    idempotency_key = db.Column(db.String(255), primary_key=True)
+    request_hash = db.Column(db.String(64), nullable=False)
+    status_code = db.Column(db.Integer)
+    response_body = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+class RevenueDaily(db.Model):
+    __tablename__ = "revenue_daily"
+    day = db.Column(db.Date, primary_key=True)
+    order_count = db.Column(db.Integer, nullable=False, default=0)
+    revenue = db.Column(db.Float, nullable=False, default=0)
+
+class RevenueDailySeller(db.Model):
+    __tablename__ = "revenue_daily_seller"
+    day = db.Column(db.Date, primary_key=True)
+    seller_id = db.Column(db.Integer, primary_key=True)
+    order_count = db.Column(db.Integer, nullable=False, default=0)
+    items_sold = db.Column(db.Integer, nullable=False, default=0)
+    revenue = db.Column(db.Float, nullable=False, default=0)
+
+class RevenueDailyCategory(db.Model):
+    __tablename__ = "revenue_daily_category"
+    day = db.Column(db.Date, primary_key=True)
+    category = db.Column(db.String(80), primary_key=True)
+    order_count = db.Column(db.Integer, nullable=False, default=0)
+    items_sold = db.Column(db.Integer, nullable=False, default=0)
+    revenue = db.Column(db.Float, nullable=False, default=0)
 
 class Log(db.Model):
     __tablename__ = "logs"
+    __table_args__ = (
+        db.Index("ix_logs_timestamp_log_id", "timestamp", "log_id"),
+        db.Index("ix_logs_user_id_timestamp_log_id", "user_id", "timestamp", "log_id"),
+    )
 
     log_id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer)
     action = db.Column(db.Text)
     ip_address = db.Column(db.String(50))
-    timestamp = db.Column(db.DateTime)
+    timestamp = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
@@ -0,0 +1,157 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+from datetime import datetime
+from flask import has_request_context, request
+from database.models import db, Log
+
+logger = logging.getLogger("activity_logger")
+
+# Queued by stop() so a worker waiting out a long flush interval wakes up at once.
+_WAKE = object()
+
+
+class ActivityLogBuffer:
+    """Bounded in-memory queue of log rows drained by a worker thread in multi-row INSERTs."""
+
+    def __init__(self, engine, batch_size=100, flush_interval=1.0, max_queue=10000, enqueue_timeout=0.05):
+        self._engine = engine
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._thread = None
+        self._stats_lock = threading.Lock()
+        self._stats = {"enqueued": 0, "flushed": 0, "dropped": 0, "failed": 0, "batches": 0}
+
+    def _count(self, name, amount=1):
+        with self._stats_lock:
+            self._stats[name] += amount
+
+    def stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["queued"] = self._queue.qsize()
+        return stats
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="activity-log-writer", daemon=True)
+        self._thread.start()
+
+    def enqueue(self, row):
+        """Queue a row; if the queue stays full for enqueue_timeout the row is dropped."""
+        try:
+            self._queue.put(row, timeout=self.enqueue_timeout)
+        except queue.Full:
+            self._count("dropped")
+            return False
+        self._count("enqueued")
+        return True
+
+    def stop(self, timeout=5.0):
+        """Flush everything still queued and stop the worker."""
+        self._stop.set()
+        try:
+            self._queue.put_nowait(_WAKE)
+        except queue.Full:
+            pass
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self._drain()
+
+    def _drain(self):
+        batch = []
+        while True:
+            try:
+                row = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if row is _WAKE:
+                continue
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                self._write(batch)
+                batch = []
+        if batch:
+            self._write(batch)
+
+    def _run(self):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while not self._stop.is_set():
+            try:
+                row = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                if row is not _WAKE:
+                    batch.append(row)
+            except queue.Empty:
+                pass
+            now = time.monotonic()
+            if len(batch) >= self.batch_size or now >= deadline:
+                if batch:
+                    self._write(batch)
+                    batch = []
+                deadline = now + self.flush_interval
+        if batch:
+            self._write(batch)
+
+    def _write(self, rows):
+        try:
+            with self._engine.begin() as conn:
+                conn.execute(Log.__table__.insert().values(rows))
+        except Exception as exc:
+            self._count("failed", len(rows))
+            logger.error(f"Failed to write {len(rows)} activity log rows: {exc}")
+            return
+        self._count("flushed", len(rows))
+        self._count("batches")
+
+
+_buffer = None
+
+
+def init_activity_logger(app):
+    """Start the background writer for this app unless ACTIVITY_LOG_ASYNC is off."""
+    global _buffer
+    if _buffer is not None:
+        _buffer.stop()
+        _buffer = None
+    if not app.config.get("ACTIVITY_LOG_ASYNC", True):
+        return
+    with app.app_context():
+        engine = db.engine
+    _buffer = ActivityLogBuffer(
+        engine,
+        batch_size=app.config.get("ACTIVITY_LOG_BATCH_SIZE", 100),
+        flush_interval=app.config.get("ACTIVITY_LOG_FLUSH_INTERVAL", 1.0),
+        max_queue=app.config.get("ACTIVITY_LOG_QUEUE_SIZE", 10000),
+        enqueue_timeout=app.config.get("ACTIVITY_LOG_ENQUEUE_TIMEOUT", 0.05),
+    )
+    _buffer.start()
+    atexit.register(_buffer.stop)
+
+
+def get_activity_log_stats():
+    return _buffer.stats() if _buffer is not None else None
+
+
+def log_activity(user_id, action):
+    row = {
+        "user_id": user_id,
+        "action": action,
+        # Same client address the rate limiter keys on; None outside a request (CLI, workers).
+        "ip_address": request.remote_addr if has_request_context() else None,
+        "timestamp": datetime.utcnow(),
+    }
+    if _buffer is not None:
+        _buffer.enqueue(row)
+        return
+    # No worker (scripts, tests): write on a separate connection so the
+    # caller's session is never committed as a side effect.
+    with db.engine.begin() as conn:
+        conn.execute(Log.__table__.insert().values(row))
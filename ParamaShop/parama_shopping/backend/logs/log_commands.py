@@ -0,0 +1,36 @@
+import json
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from logs.log_retention import archive_logs, ensure_partitions
+
+logs_cli = click.Group("logs", help="Activity log retention and partition maintenance.")
+
+
+@logs_cli.command("archive")
+@click.option("--retention-days", type=int, default=None, help="Keep this many days of logs (default LOG_RETENTION_DAYS).")
+@click.option("--archive-dir", default=None, help="Where to write logs_YYYY_MM.*.ndjson.gz files (default LOG_ARCHIVE_DIR).")
+@click.option("--batch-size", type=int, default=5000, show_default=True, help="Rows per delete chunk.")
+@click.option("--dry-run", is_flag=True, help="Count what would be archived without writing or deleting.")
+@with_appcontext
+def archive_command(retention_days, archive_dir, batch_size, dry_run):
+    """Archive logs older than the retention window to compressed NDJSON and remove them."""
+    config = current_app.config
+    result = archive_logs(
+        retention_days if retention_days is not None else config["LOG_RETENTION_DAYS"],
+        archive_dir or config["LOG_ARCHIVE_DIR"],
+        batch_size=batch_size,
+        dry_run=dry_run,
+    )
+    click.echo(json.dumps(result, indent=2))
+
+
+@logs_cli.command("ensure-partitions")
+@click.option("--months-ahead", type=int, default=None, help="Months of future partitions to create (default LOG_PARTITION_MONTHS_AHEAD).")
+@with_appcontext
+def ensure_partitions_command(months_ahead):
+    """Create upcoming monthly partitions for logs (PostgreSQL only)."""
+    if months_ahead is None:
+        months_ahead = current_app.config["LOG_PARTITION_MONTHS_AHEAD"]
+    created = ensure_partitions(months_ahead)
+    click.echo(f"Created partitions: {', '.join(created) if created else 'none'}")
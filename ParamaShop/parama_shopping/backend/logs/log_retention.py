@@ -0,0 +1,250 @@
+import gzip
+import json
+import logging
+import os
+import re
+import tempfile
+from datetime import datetime, timedelta
+from sqlalchemy import text
+from database.models import db, Log
+
+logger = logging.getLogger("log_retention")
+
+PARTITION_RE = re.compile(r"^logs_p(\d{4})(\d{2})$")
+TEMP_SUFFIX = ".ndjson.gz.tmp"
+
+
+def month_start(value):
+    return datetime(value.year, value.month, 1)
+
+
+def add_months(value, months):
+    index = value.year * 12 + value.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f"logs_p{month:%Y%m}"
+
+
+def is_partitioned(conn):
+    if conn.dialect.name != "postgresql":
+        return False
+    relkind = conn.execute(text("SELECT relkind FROM pg_class WHERE relname = 'logs'")).scalar()
+    return relkind == "p"
+
+
+def list_partitions(conn):
+    """Return [(name, month_start)] for the monthly partitions attached to logs, oldest first."""
+    rows = conn.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = 'logs'"
+    )).scalars()
+    partitions = []
+    for name in rows:
+        match = PARTITION_RE.match(name)
+        if match:
+            partitions.append((name, datetime(int(match.group(1)), int(match.group(2)), 1)))
+    return sorted(partitions, key=lambda pair: pair[1])
+
+
+def create_month_partition(conn, month):
+    """Create and attach the partition for month, moving any rows the DEFAULT partition caught."""
+    name = partition_name(month)
+    start, end = month, add_months(month, 1)
+    bounds = {"start": start, "end": end}
+    conn.execute(text(f"CREATE TABLE {name} (LIKE logs INCLUDING DEFAULTS)"))
+    conn.execute(text(
+        f"INSERT INTO {name} SELECT * FROM logs_default "
+        "WHERE timestamp >= :start AND timestamp < :end"
+    ), bounds)
+    conn.execute(text("DELETE FROM logs_default WHERE timestamp >= :start AND timestamp < :end"), bounds)
+    conn.execute(text(
+        f"ALTER TABLE logs ATTACH PARTITION {name} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    ))
+    logger.info(f"Created log partition {name}")
+
+
+def ensure_partitions(months_ahead, now=None):
+    """Make sure monthly partitions exist from the current month through months_ahead."""
+    current = month_start(now or datetime.utcnow())
+    created = []
+    with db.engine.begin() as conn:
+        if not is_partitioned(conn):
+            return created
+        existing = {month for _, month in list_partitions(conn)}
+        for offset in range(months_ahead + 1):
+            month = add_months(current, offset)
+            if month not in existing:
+                create_month_partition(conn, month)
+                created.append(partition_name(month))
+    return created
+
+
+class ArchiveWriter:
+    """Writes archived rows as gzip NDJSON, one file per month per chunk or partition.
+
+    Rows are written to hidden temp files; publish() closes, fsyncs and renames
+    them to logs_YYYY_MM.<first_id>-<last_id>.ndjson.gz and must return before
+    the transaction deleting those rows commits. A crash therefore leaves
+    either a temp file (the rows are still in the database) or complete files,
+    which a re-run of the same chunk simply replaces.
+    """
+
+    def __init__(self, archive_dir, enabled=True):
+        self.archive_dir = archive_dir
+        self.enabled = enabled
+        self._pending = {}
+        self.paths = set()
+
+    def write(self, row):
+        if not self.enabled:
+            return
+        timestamp = row["timestamp"]
+        key = f"{timestamp:%Y_%m}" if timestamp else "undated"
+        pending = self._pending.get(key)
+        if pending is None:
+            os.makedirs(self.archive_dir, exist_ok=True)
+            handle, temp_path = tempfile.mkstemp(dir=self.archive_dir, prefix=f".logs_{key}.", suffix=TEMP_SUFFIX)
+            raw = os.fdopen(handle, "wb")
+            pending = {"raw": raw, "text": gzip.open(raw, "wt", encoding="utf-8"), "temp_path": temp_path, "ids": []}
+            self._pending[key] = pending
+        pending["ids"].append(row["log_id"])
+        pending["text"].write(json.dumps({
+            "log_id": row["log_id"],
+            "user_id": row["user_id"],
+            "action": row["action"],
+            "ip_address": row["ip_address"],
+            "timestamp": timestamp.isoformat() if timestamp else None,
+        }) + "\n")
+
+    def publish(self):
+        """Make everything written since the last publish durable under its final name."""
+        for key, pending in self._pending.items():
+            pending["text"].close()
+            pending["raw"].flush()
+            os.fsync(pending["raw"].fileno())
+            pending["raw"].close()
+            path = os.path.join(self.archive_dir, f"logs_{key}.{min(pending['ids'])}-{max(pending['ids'])}.ndjson.gz")
+            os.replace(pending["temp_path"], path)
+            self.paths.add(path)
+        if self._pending:
+            _fsync_directory(self.archive_dir)
+        self._pending = {}
+
+    def discard(self):
+        """Drop unpublished rows; their database rows were not deleted."""
+        for pending in self._pending.values():
+            pending["text"].close()
+            pending["raw"].close()
+            os.remove(pending["temp_path"])
+        self._pending = {}
+
+    def remove_stale_temp_files(self):
+        """Temp files left by a run that was killed; their rows are still in the database."""
+        if not self.enabled or not os.path.isdir(self.archive_dir):
+            return
+        for name in os.listdir(self.archive_dir):
+            if name.startswith(".logs_") and name.endswith(TEMP_SUFFIX):
+                os.remove(os.path.join(self.archive_dir, name))
+
+
+def _fsync_directory(path):
+    # Persists the renames; not supported on Windows, where rename durability is the filesystem's.
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    handle = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(handle)
+    finally:
+        os.close(handle)
+
+
+def _archive_partitions(conn, cutoff, writer, dry_run):
+    dropped = []
+    archived = 0
+    for name, month in list_partitions(conn):
+        if add_months(month, 1) > cutoff:
+            break
+        result = conn.execution_options(stream_results=True).execute(
+            text(f"SELECT log_id, user_id, action, ip_address, timestamp FROM {name} ORDER BY timestamp, log_id")
+        )
+        for row in result.mappings():
+            writer.write(row)
+            archived += 1
+        writer.publish()
+        if not dry_run:
+            conn.execute(text(f"DROP TABLE {name}"))
+        dropped.append(name)
+    return archived, dropped
+
+
+def _archive_in_chunks(cutoff, writer, batch_size, dry_run, skip_before=None):
+    table = Log.__table__
+    archived = 0
+    last_key = None
+    while True:
+        with db.engine.begin() as conn:
+            query = (
+                table.select()
+                .where(table.c.timestamp < cutoff)
+                .order_by(table.c.timestamp, table.c.log_id)
+                .limit(batch_size)
+            )
+            if skip_before is not None:
+                query = query.where(table.c.timestamp >= skip_before)
+            if last_key is not None and dry_run:
+                query = query.where(
+                    (table.c.timestamp > last_key[0])
+                    | ((table.c.timestamp == last_key[0]) & (table.c.log_id > last_key[1]))
+                )
+            rows = conn.execute(query).mappings().all()
+            if not rows:
+                break
+            for row in rows:
+                writer.write(row)
+            # The chunk's files are complete and on disk before its DELETE
+            # commits, so a crash can at worst archive a chunk twice, never lose it.
+            writer.publish()
+            if dry_run:
+                last_key = (rows[-1]["timestamp"], rows[-1]["log_id"])
+            else:
+                conn.execute(table.delete().where(table.c.log_id.in_([row["log_id"] for row in rows])))
+            archived += len(rows)
+    return archived
+
+
+def archive_logs(retention_days, archive_dir, batch_size=5000, dry_run=False, now=None):
+    """Move logs older than retention_days into gzip NDJSON files and remove them from the database.
+
+    Whole monthly partitions are archived and dropped on partitioned PostgreSQL
+    tables; anything else (the DEFAULT partition, SQLite, unpartitioned tables)
+    is archived and deleted in chunks of batch_size rows.
+    """
+    cutoff = (now or datetime.utcnow()) - timedelta(days=retention_days)
+    writer = ArchiveWriter(archive_dir, enabled=not dry_run)
+    dropped = []
+    archived = 0
+    skip_before = None
+    writer.remove_stale_temp_files()
+    try:
+        with db.engine.begin() as conn:
+            if is_partitioned(conn):
+                archived, dropped = _archive_partitions(conn, month_start(cutoff), writer, dry_run)
+                if dry_run and dropped:
+                    # Those partitions were only exported, not dropped; don't count them twice.
+                    skip_before = add_months(datetime.strptime(dropped[-1], "logs_p%Y%m"), 1)
+        archived += _archive_in_chunks(cutoff, writer, batch_size, dry_run, skip_before)
+    finally:
+        writer.discard()
+    logger.info(f"Archived {archived} log rows older than {cutoff.isoformat()}")
+    return {
+        "cutoff": cutoff.isoformat(),
+        "archived_rows": archived,
+        "dropped_partitions": dropped,
+        "files": sorted(writer.paths),
+        "dry_run": dry_run,
+    }
@@ -0,0 +1,56 @@
+import json
+from flask import Blueprint, jsonify, request, Response, stream_with_context
+from flask_jwt_extended import jwt_required
+from middleware.role_middleware import role_required
+from logs.activity_logger import get_activity_log_stats
+from logs.log_service import build_log_query, get_logs_page, iter_logs, parse_timestamp, serialize_log
+from utils.pagination import MAX_PAGE_SIZE, parse_limit
+from utils.response_handler import error
+
+log_bp = Blueprint("logs", __name__)
+
+QUERY_PARAMS = ("limit", "cursor", "user_id", "action", "since", "until", "format")
+
+@log_bp.route("/all", methods=["GET"])
+@jwt_required()
+@role_required("ADMIN")
+def view_logs(user_id):
+    args = request.args
+    if not any(name in args for name in QUERY_PARAMS):
+        # Legacy list shape, capped to the newest page; X-Next-Cursor continues it.
+        logs, next_cursor = get_logs_page(build_log_query(), MAX_PAGE_SIZE)
+        response = jsonify([serialize_log(log) for log in logs])
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return response
+
+    try:
+        query = build_log_query(
+            user_id=int(args["user_id"]) if args.get("user_id") else None,
+            action_prefix=args.get("action") or None,
+            since=parse_timestamp(args.get("since")),
+            until=parse_timestamp(args.get("until")),
+        )
+        if args.get("format") == "ndjson":
+            def generate():
+                for log in iter_logs(query):
+                    yield json.dumps(serialize_log(log)) + "\n"
+            return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+        logs, next_cursor = get_logs_page(query, parse_limit(args.get("limit")), args.get("cursor") or None)
+    except ValueError as exc:
+        return error(f"Invalid query parameter: {exc}", 400)
+    return jsonify({
+        "items": [serialize_log(log) for log in logs],
+        "next_cursor": next_cursor,
+    })
+
+@log_bp.route("/stats", methods=["GET"])
+@jwt_required()
+@role_required("ADMIN")
+def log_writer_stats(user_id):
+    stats = get_activity_log_stats()
+    return jsonify({
+        "async": stats is not None,
+        "stats": stats or {},
+    })
@@ -0,0 +1,73 @@
+import logging
+from datetime import datetime, timezone
+from sqlalchemy import tuple_
+from database.models import Log
+from utils.pagination import encode_cursor, decode_cursor
+
+logger = logging.getLogger("log_service")
+
+EXPORT_BATCH_SIZE = 1000
+
+# Cursor is [timestamp (ISO 8601), log_id].
+CURSOR_TYPES = (str, int)
+
+
+def parse_timestamp(value):
+    """Parse an ISO 8601 timestamp into the naive UTC datetimes stored in logs.timestamp."""
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def serialize_log(log):
+    return {
+        "log_id": log.log_id,
+        "user_id": log.user_id,
+        "action": log.action,
+        "ip": log.ip_address,
+        "time": log.timestamp.isoformat() if log.timestamp else None
+    }
+
+
+def build_log_query(user_id=None, action_prefix=None, since=None, until=None):
+    query = Log.query
+    if user_id is not None:
+        query = query.filter(Log.user_id == user_id)
+    if action_prefix:
+        query = query.filter(Log.action.startswith(action_prefix, autoescape=True))
+    if since is not None:
+        query = query.filter(Log.timestamp >= since)
+    if until is not None:
+        query = query.filter(Log.timestamp < until)
+    return query.order_by(Log.timestamp.desc(), Log.log_id.desc())
+
+
+def get_logs_page(query, limit, cursor=None):
+    """Newest-first keyset page over (timestamp, log_id); returns (logs, next_cursor).
+
+    Raises ValueError for a malformed cursor.
+    """
+    if cursor:
+        timestamp, log_id = decode_cursor(cursor, 2, CURSOR_TYPES)
+        timestamp = parse_timestamp(timestamp)
+        if timestamp is None:
+            raise ValueError("Invalid cursor")
+        query = query.filter(
+            tuple_(Log.timestamp, Log.log_id) < tuple_(timestamp, log_id)
+        )
+    logs = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(logs) > limit:
+        logs = logs[:limit]
+        last = logs[-1]
+        next_cursor = encode_cursor([last.timestamp.isoformat(), last.log_id])
+    return logs, next_cursor
+
+
+def iter_logs(query):
+    """Stream every matching row without materialising the whole result set."""
+    for log in query.yield_per(EXPORT_BATCH_SIZE):
+        yield log
@@ -0,0 +1,149 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+from flask import current_app, g
+from database.models import db, User, Role, SellerProfile
+
+ROLE_MAP = {
+    1: "USER",
+    2: "ADMIN",
+    3: "SELLER",
+}
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Authorization facts about the caller, loaded once per request."""
+    user_id: int
+    role_name: Optional[str]
+    status: Optional[str]
+    seller_status: Optional[str] = None
+    shop_name: Optional[str] = None
+    token_version: int = 0
+
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Small process-wide cache with a per-entry time to live, keyed by user_id."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return default
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+principal_cache = TTLCache()
+token_version_cache = TTLCache()
+
+
+def fetch_principal(user_id):
+    row = (
+        db.session.query(
+            User.user_id,
+            User.role_id,
+            User.status,
+            Role.role_name,
+            SellerProfile.status,
+            SellerProfile.shop_name,
+            User.token_version,
+        )
+        .outerjoin(Role, Role.role_id == User.role_id)
+        .outerjoin(SellerProfile, SellerProfile.user_id == User.user_id)
+        .filter(User.user_id == user_id)
+        .first()
+    )
+    if row is None:
+        return None
+    uid, role_id, status, role_name, seller_status, shop_name, token_version = row
+    return Principal(
+        user_id=uid,
+        role_name=role_name or ROLE_MAP.get(role_id),
+        status=status,
+        seller_status=seller_status,
+        shop_name=shop_name,
+        token_version=token_version or 0,
+    )
+
+
+def load_principal(user_id, token_version=_MISSING):
+    """Return the Principal for user_id with a single joined query, or None if the user is gone.
+
+    With token_version (from current_token_version), a cached Principal loaded
+    before the version was bumped is ignored, so another process's cache cannot
+    extend a revocation beyond TOKEN_VERSION_CACHE_TTL.
+    """
+    ttl = current_app.config.get("PRINCIPAL_CACHE_TTL", 0)
+    if ttl > 0:
+        cached = principal_cache.get(user_id)
+        if cached is not None and (token_version is _MISSING or cached.token_version == token_version):
+            return cached
+    principal = fetch_principal(user_id)
+    if principal is not None and ttl > 0:
+        principal_cache.set(user_id, principal, ttl)
+    return principal
+
+
+def principal_from_claims(user_id, claims):
+    """Rebuild a Principal from the signed claims issued by auth.session_manager."""
+    return Principal(
+        user_id=user_id,
+        role_name=claims.get("role"),
+        status=claims.get("status"),
+        seller_status=claims.get("seller_status"),
+        shop_name=claims.get("shop_name"),
+        token_version=claims.get("tv", 0),
+    )
+
+
+def current_token_version(user_id):
+    """Current users.token_version (None if the user is gone), cached for TOKEN_VERSION_CACHE_TTL."""
+    version = token_version_cache.get(user_id, _MISSING)
+    if version is not _MISSING:
+        return version
+    version = db.session.query(User.token_version).filter(User.user_id == user_id).scalar()
+    ttl = current_app.config.get("TOKEN_VERSION_CACHE_TTL", 0)
+    if ttl > 0:
+        token_version_cache.set(user_id, version, ttl)
+    return version
+
+
+def bump_token_version(user_id):
+    """Mark every token issued to user_id as stale. Joins the caller's transaction."""
+    User.query.filter_by(user_id=user_id).update(
+        {User.token_version: User.token_version + 1},
+        synchronize_session=False,
+    )
+
+
+def invalidate_principal(user_id):
+    principal_cache.invalidate(user_id)
+    token_version_cache.invalidate(user_id)
+
+
+def current_principal():
+    return g.get("principal")
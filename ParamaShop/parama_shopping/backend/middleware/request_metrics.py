@@ -0,0 +1,83 @@
+import hmac
+import time
+from flask import Response, g, request
+from middleware.sql_profiler import begin_request_profile, end_request_profile
+from utils.metrics import Histogram, operation_metrics, render_operation_metrics
+
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+QUERY_TIME_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+class RequestMetrics:
+    """Per-endpoint latency and SQL histograms collected by before/after_request hooks."""
+
+    def __init__(self):
+        self.latency = Histogram(
+            "parama_http_request_duration_seconds",
+            "Request latency by endpoint, method and status.",
+            ("endpoint", "method", "status"),
+        )
+        self.queries = Histogram(
+            "parama_http_request_db_queries",
+            "SQL statements issued per request.",
+            ("endpoint",),
+            QUERY_COUNT_BUCKETS,
+        )
+        self.query_time = Histogram(
+            "parama_http_request_db_seconds",
+            "Time spent executing SQL per request.",
+            ("endpoint",),
+            QUERY_TIME_BUCKETS,
+        )
+
+    def before_request(self):
+        g.metrics_started = time.perf_counter()
+        g.metrics_sql = begin_request_profile()
+
+    def after_request(self, response):
+        started = g.pop("metrics_started", None)
+        if started is None:
+            return response
+        # Unmatched URLs share one label so scanners cannot blow up cardinality.
+        endpoint = request.endpoint or "unmatched"
+        self.latency.observe((endpoint, request.method, str(response.status_code)), time.perf_counter() - started)
+        profile = g.pop("metrics_sql")
+        self.queries.observe((endpoint,), profile.count)
+        self.query_time.observe((endpoint,), profile.seconds)
+        return response
+
+    def teardown_request(self, exc):
+        end_request_profile(exc)
+
+    def render(self):
+        lines = self.latency.render() + self.queries.render() + self.query_time.render()
+        lines += render_operation_metrics(operation_metrics)
+        return "\n".join(lines) + "\n"
+
+
+def init_request_metrics(app):
+    """Install the hooks and GET /metrics unless METRICS_ENABLED is false.
+
+    When METRICS_TOKEN is set, scrapes must send it as a Bearer token; in
+    production the app refuses to start with metrics enabled and no token.
+    """
+    if not app.config.get("METRICS_ENABLED", True):
+        return None
+    if app.config.get("APP_ENV") == "production" and not app.config.get("METRICS_TOKEN"):
+        raise RuntimeError("METRICS_TOKEN must be set in production (or set METRICS_ENABLED=False)")
+    metrics = RequestMetrics()
+    app.extensions["request_metrics"] = metrics
+    app.before_request(metrics.before_request)
+    app.after_request(metrics.after_request)
+    app.teardown_request(metrics.teardown_request)
+
+    @app.route("/metrics", methods=["GET"])
+    def prometheus_metrics():
+        token = app.config.get("METRICS_TOKEN")
+        if token:
+            supplied = request.headers.get("Authorization", "").removeprefix("Bearer ")
+            if not hmac.compare_digest(supplied.encode(), token.encode()):
+                return Response("unauthorized\n", status=401, mimetype="text/plain")
+        return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+    return metrics
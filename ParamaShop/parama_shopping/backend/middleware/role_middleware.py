@@ -1,14 +1,10 @@
-from database.models import User
-from flask_jwt_extended import get_jwt_identity
+from flask import g
+from flask_jwt_extended import get_jwt, get_jwt_identity
+from middleware.principal import load_principal, principal_from_claims, current_token_version
 from utils.response_handler import error
 
-def role_required(required_role):
+def role_required(*required_roles):
     from functools import wraps
-    role_map = {
-        1: "USER",
-        2: "ADMIN",
-        3: "SELLER",
-    }
 
     def decorator(func):
         @wraps(func)
@@ -18,23 +14,29 @@ def role_required(required_role):
                 if isinstance(user_id, str) and user_id.isdigit():
                     user_id = int(user_id)
 
-                user = User.query.get(user_id)
-                if not user:
+                # Tokens from auth.session_manager carry role/seller claims; trust them
+                # while their version matches, otherwise fall back to the database.
+                principal = None
+                claims = get_jwt()
+                token_version = current_token_version(user_id)
+                if "tv" in claims and claims["tv"] == token_version:
+                    principal = principal_from_claims(user_id, claims)
+                if principal is None:
+                    principal = load_principal(user_id, token_version)
+                if not principal:
                     return error("User not found", 404)
+                g.principal = principal
 
-                role_name = None
-                if hasattr(user, "role") and user.role:
-                    role_name = user.role.role_name
-                if not role_name:
-                    role_name = role_map.get(user.role_id)
+                if principal.status == "DISABLED":
+                    return error("Account disabled", 403)
 
-                if role_name != required_role:
+                if principal.role_name not in required_roles:
                     return error("Access Denied", 403)
 
-                if required_role == "SELLER":
-                    if not hasattr(user, "seller_profile") or not user.seller_profile:
+                if principal.role_name == "SELLER":
+                    if not principal.seller_status:
                         return error("Seller profile not found", 403)
-                    if user.seller_profile.status != "APPROVED":
+                    if principal.seller_status != "APPROVED":
                         return error("Seller approval pending", 403)
 
                 return func(user_id, *args, **kwargs)
@@ -0,0 +1,170 @@
+import contextvars
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from flask import g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger("sql_profiler")
+
+# A statement shape seen this many times in one request is reported as a likely N+1.
+DEFAULT_REPEAT_THRESHOLD = 5
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:\?|%s|:\w+)(?:\s*,\s*(?:\?|%s|:\w+))*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+# Profiles collecting statements in the current request / block; nested blocks all record.
+# This module owns the only Engine listeners: request metrics read the same per-request profile.
+_active_profiles = contextvars.ContextVar("sql_profiles", default=())
+_listening = False
+
+
+def statement_shape(statement):
+    """Statement with literals and IN-lists collapsed, so per-row variants compare equal."""
+    shape = _STRING_LITERAL.sub("?", statement)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    shape = _PLACEHOLDER_LIST.sub("(...)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+class SQLProfile:
+    """Statements executed while the profile is active, with their durations."""
+
+    def __init__(self):
+        self.statements = []
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    @property
+    def seconds(self):
+        return sum(seconds for _, seconds in self.statements)
+
+    def repeated(self, threshold=DEFAULT_REPEAT_THRESHOLD):
+        """[(shape, count)] for shapes run at least threshold times, most frequent first."""
+        shapes = Counter(statement_shape(statement) for statement, _ in self.statements)
+        return [(shape, count) for shape, count in shapes.most_common() if count >= threshold]
+
+    def report(self, threshold=DEFAULT_REPEAT_THRESHOLD):
+        lines = [f"{self.count} statements in {self.seconds * 1000:.1f} ms"]
+        for shape, count in self.repeated(threshold):
+            lines.append(f"  {count}x {shape}")
+        return "\n".join(lines)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _active_profiles.get():
+        conn.info.setdefault("sql_profiler_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profiles = _active_profiles.get()
+    started = conn.info.get("sql_profiler_started")
+    if not profiles or not started:
+        return
+    entry = (statement, time.perf_counter() - started.pop())
+    for profile in profiles:
+        profile.statements.append(entry)
+
+
+def install_listeners():
+    global _listening
+    if _listening:
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    _listening = True
+
+
+def start_profile():
+    """Begin recording; returns (profile, token) for stop_profile."""
+    install_listeners()
+    profile = SQLProfile()
+    token = _active_profiles.set(_active_profiles.get() + (profile,))
+    return profile, token
+
+
+def stop_profile(token):
+    _active_profiles.reset(token)
+
+
+def begin_request_profile():
+    """The current request's profile (g.sql_profile), started on first use.
+
+    Request metrics and the X-SQL-* headers both call this from before_request,
+    so each statement is timed once however many of them are enabled.
+    """
+    if g.get("sql_profile_token") is None:
+        g.sql_profile, g.sql_profile_token = start_profile()
+    return g.sql_profile
+
+
+def end_request_profile(exc=None):
+    token = g.pop("sql_profile_token", None)
+    if token is not None:
+        stop_profile(token)
+
+
+@contextmanager
+def profile_sql():
+    """Record every statement run in the block: `with profile_sql() as profile: ...`."""
+    profile, token = start_profile()
+    try:
+        yield profile
+    finally:
+        stop_profile(token)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@contextmanager
+def query_budget(max_queries, repeat_threshold=None):
+    """Fail (QueryBudgetExceeded) if the block runs more than max_queries statements.
+
+    With repeat_threshold, also fail when any statement shape repeats that often,
+    which catches N+1 loops whose total still fits the budget on small fixtures.
+    """
+    with profile_sql() as profile:
+        yield profile
+    if profile.count > max_queries:
+        raise QueryBudgetExceeded(f"Query budget {max_queries} exceeded: {profile.report(repeat_threshold or DEFAULT_REPEAT_THRESHOLD)}")
+    if repeat_threshold and profile.repeated(repeat_threshold):
+        raise QueryBudgetExceeded(f"Repeated statements (N+1?): {profile.report(repeat_threshold)}")
+
+
+def init_sql_profiler(app):
+    """Profile each request when SQL_PROFILER_ENABLED is set (development and CI).
+
+    Responses get X-SQL-Query-Count, X-SQL-Query-Time-Ms and X-SQL-Repeated
+    headers; requests with repeated statement shapes are logged as warnings.
+    """
+    if not app.config.get("SQL_PROFILER_ENABLED", False):
+        return
+    threshold = app.config.get("SQL_PROFILER_REPEAT_THRESHOLD", DEFAULT_REPEAT_THRESHOLD)
+
+    @app.before_request
+    def start_request_profile():
+        begin_request_profile()
+
+    @app.after_request
+    def report_request_profile(response):
+        profile = g.get("sql_profile")
+        if profile is None:
+            return response
+        repeated = profile.repeated(threshold)
+        response.headers["X-SQL-Query-Count"] = str(profile.count)
+        response.headers["X-SQL-Query-Time-Ms"] = f"{profile.seconds * 1000:.1f}"
+        response.headers["X-SQL-Repeated"] = str(len(repeated))
+        if repeated:
+            logger.warning(f"Possible N+1 in {request.method} {request.path}: {profile.report(threshold)}")
+        return response
+
+    app.teardown_request(end_request_profile)
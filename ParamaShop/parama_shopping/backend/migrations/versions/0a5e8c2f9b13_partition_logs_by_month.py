@@ -0,0 +1,98 @@
+"""partition logs by month on PostgreSQL
+
+Revision ID: 0a5e8c2f9b13
+Revises: f3b7c5d1a862
+Create Date: 2026-02-09 08:45:00.000000
+"""
+
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0a5e8c2f9b13"
+down_revision = "f3b7c5d1a862"
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = 3
+
+
+def _add_months(value, months):
+    index = value.year * 12 + value.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def _create_partition(month):
+    end = _add_months(month, 1)
+    op.execute(
+        f"CREATE TABLE logs_p{month:%Y%m} PARTITION OF logs "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{end.isoformat()}')"
+    )
+
+
+def upgrade():
+    # Other databases keep the plain table; `flask logs archive` falls back to chunked deletes there.
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    op.drop_index("ix_logs_user_id_timestamp_log_id", table_name="logs")
+    op.drop_index("ix_logs_timestamp_log_id", table_name="logs")
+    op.execute("ALTER TABLE logs RENAME TO logs_unpartitioned")
+    op.execute("ALTER TABLE logs_unpartitioned RENAME CONSTRAINT logs_pkey TO logs_unpartitioned_pkey")
+    op.execute("UPDATE logs_unpartitioned SET timestamp = now() AT TIME ZONE 'utc' WHERE timestamp IS NULL")
+
+    # The partition key has to be part of the primary key.
+    op.execute("""
+        CREATE TABLE logs (
+            log_id integer NOT NULL DEFAULT nextval('logs_log_id_seq'),
+            user_id integer,
+            action text,
+            ip_address varchar(50),
+            timestamp timestamp without time zone NOT NULL,
+            PRIMARY KEY (log_id, timestamp)
+        ) PARTITION BY RANGE (timestamp)
+    """)
+    op.execute("CREATE TABLE logs_default PARTITION OF logs DEFAULT")
+
+    first, last = bind.execute(sa.text("SELECT min(timestamp), max(timestamp) FROM logs_unpartitioned")).one()
+    now = datetime.utcnow()
+    month = datetime((first or now).year, (first or now).month, 1)
+    stop = _add_months(datetime(max(last or now, now).year, max(last or now, now).month, 1), MONTHS_AHEAD)
+    while month <= stop:
+        _create_partition(month)
+        month = _add_months(month, 1)
+
+    op.execute(
+        "INSERT INTO logs (log_id, user_id, action, ip_address, timestamp) "
+        "SELECT log_id, user_id, action, ip_address, timestamp FROM logs_unpartitioned"
+    )
+    op.execute("ALTER SEQUENCE logs_log_id_seq OWNED BY logs.log_id")
+    op.execute("DROP TABLE logs_unpartitioned")
+    op.create_index("ix_logs_timestamp_log_id", "logs", ["timestamp", "log_id"])
+    op.create_index("ix_logs_user_id_timestamp_log_id", "logs", ["user_id", "timestamp", "log_id"])
+
+
+def downgrade():
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("ALTER TABLE logs RENAME TO logs_partitioned")
+    op.execute("""
+        CREATE TABLE logs (
+            log_id integer NOT NULL DEFAULT nextval('logs_log_id_seq') PRIMARY KEY,
+            user_id integer,
+            action text,
+            ip_address varchar(50),
+            timestamp timestamp without time zone
+        )
+    """)
+    op.execute(
+        "INSERT INTO logs (log_id, user_id, action, ip_address, timestamp) "
+        "SELECT log_id, user_id, action, ip_address, timestamp FROM logs_partitioned"
+    )
+    op.execute("ALTER SEQUENCE logs_log_id_seq OWNED BY logs.log_id")
+    op.execute("DROP TABLE logs_partitioned CASCADE")
+    op.create_index("ix_logs_timestamp_log_id", "logs", ["timestamp", "log_id"])
+    op.create_index("ix_logs_user_id_timestamp_log_id", "logs", ["user_id", "timestamp", "log_id"])
@@ -0,0 +1,136 @@
+"""add daily revenue rollup tables
+
+Revision ID: 1d9f4b6e7a20
+Revises: 0a5e8c2f9b13
+Create Date: 2026-02-10 13:10:00.000000
+"""
+
+import ast
+import json
+from collections import defaultdict
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "1d9f4b6e7a20"
+down_revision = "0a5e8c2f9b13"
+branch_labels = None
+depends_on = None
+
+orders_table = sa.table(
+    "orders",
+    sa.column("order_id", sa.Integer),
+    sa.column("encrypted_data", sa.Text),
+    sa.column("created_at", sa.DateTime),
+)
+order_items_table = sa.table(
+    "order_items",
+    sa.column("order_id", sa.Integer),
+    sa.column("product_id", sa.Integer),
+    sa.column("seller_id", sa.Integer),
+    sa.column("quantity", sa.Integer),
+    sa.column("unit_price", sa.Float),
+)
+products_table = sa.table(
+    "products",
+    sa.column("product_id", sa.Integer),
+    sa.column("category", sa.String),
+)
+
+
+def upgrade():
+    revenue_daily = op.create_table(
+        "revenue_daily",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("order_count", sa.Integer(), nullable=False),
+        sa.Column("revenue", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("day"),
+    )
+    revenue_daily_seller = op.create_table(
+        "revenue_daily_seller",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("seller_id", sa.Integer(), nullable=False),
+        sa.Column("order_count", sa.Integer(), nullable=False),
+        sa.Column("items_sold", sa.Integer(), nullable=False),
+        sa.Column("revenue", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("day", "seller_id"),
+    )
+    revenue_daily_category = op.create_table(
+        "revenue_daily_category",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("category", sa.String(length=80), nullable=False),
+        sa.Column("order_count", sa.Integer(), nullable=False),
+        sa.Column("items_sold", sa.Integer(), nullable=False),
+        sa.Column("revenue", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("day", "category"),
+    )
+    _backfill(revenue_daily, revenue_daily_seller, revenue_daily_category)
+
+
+def downgrade():
+    op.drop_table("revenue_daily_category")
+    op.drop_table("revenue_daily_seller")
+    op.drop_table("revenue_daily")
+
+
+def _order_total(decrypt_data, encrypted_data):
+    if not encrypted_data:
+        return 0.0
+    try:
+        raw = decrypt_data(encrypted_data)
+        try:
+            data = json.loads(raw)
+        except json.JSONDecodeError:
+            data = ast.literal_eval(raw)
+        return float(data.get("total") or 0) if isinstance(data, dict) else 0.0
+    except Exception:
+        return 0.0
+
+
+def _backfill(revenue_daily, revenue_daily_seller, revenue_daily_category):
+    from security.encryption import decrypt_data
+
+    bind = op.get_bind()
+    order_days = {}
+    daily = defaultdict(lambda: [0, 0.0])
+    for order in bind.execute(sa.select(orders_table)).fetchall():
+        if order.created_at is None:
+            continue
+        day = order.created_at.date()
+        order_days[order.order_id] = day
+        daily[day][0] += 1
+        daily[day][1] += _order_total(decrypt_data, order.encrypted_data)
+
+    categories = {
+        row.product_id: row.category
+        for row in bind.execute(sa.select(products_table)).fetchall()
+    }
+    sellers = defaultdict(lambda: [set(), 0, 0.0])
+    category_totals = defaultdict(lambda: [set(), 0, 0.0])
+    for item in bind.execute(sa.select(order_items_table)).fetchall():
+        day = order_days.get(item.order_id)
+        if day is None:
+            continue
+        quantity = item.quantity or 0
+        amount = quantity * (item.unit_price or 0)
+        groups = [category_totals[(day, categories.get(item.product_id) or "General")]]
+        if item.seller_id is not None:
+            groups.append(sellers[(day, item.seller_id)])
+        for group in groups:
+            group[0].add(item.order_id)
+            group[1] += quantity
+            group[2] += amount
+
+    op.bulk_insert(revenue_daily, [
+        {"day": day, "order_count": count, "revenue": revenue}
+        for day, (count, revenue) in daily.items()
+    ])
+    op.bulk_insert(revenue_daily_seller, [
+        {"day": day, "seller_id": seller_id, "order_count": len(ids), "items_sold": qty, "revenue": revenue}
+        for (day, seller_id), (ids, qty, revenue) in sellers.items()
+    ])
+    op.bulk_insert(revenue_daily_category, [
+        {"day": day, "category": category, "order_count": len(ids), "items_sold": qty, "revenue": revenue}
+        for (day, category), (ids, qty, revenue) in category_totals.items()
+    ])
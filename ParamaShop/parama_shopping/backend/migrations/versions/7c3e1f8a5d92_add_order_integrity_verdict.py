@@ -0,0 +1,27 @@
+"""add stored order integrity verdict
+
+Revision ID: 7c3e1f8a5d92
+Revises: 1d9f4b6e7a20
+Create Date: 2026-02-11 10:25:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "7c3e1f8a5d92"
+down_revision = "1d9f4b6e7a20"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("orders", sa.Column("integrity_valid", sa.Boolean(), nullable=True))
+    op.add_column("orders", sa.Column("integrity_checked_at", sa.DateTime(), nullable=True))
+    op.create_index("ix_orders_integrity_checked_at", "orders", ["integrity_checked_at"])
+
+
+def downgrade():
+    op.drop_index("ix_orders_integrity_checked_at", table_name="orders")
+    op.drop_column("orders", "integrity_checked_at")
+    op.drop_column("orders", "integrity_valid")
@@ -0,0 +1,23 @@
+"""add unique index on orders.transaction_id
+
+Revision ID: 8e2d4a6c1b37
+Revises: 7c3e1f8a5d92
+Create Date: 2026-02-12 09:40:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "8e2d4a6c1b37"
+down_revision = "7c3e1f8a5d92"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_orders_transaction_id", "orders", ["transaction_id"], unique=True)
+
+
+def downgrade():
+    op.drop_index("ix_orders_transaction_id", table_name="orders")
@@ -0,0 +1,35 @@
+"""add orders.signature_pending
+
+Revision ID: a5d3f9c2e741
+Revises: 9a4c7e2b5f18
+Create Date: 2026-02-13 11:20:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "a5d3f9c2e741"
+down_revision = "9a4c7e2b5f18"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "orders",
+        sa.Column("signature_pending", sa.Boolean(), nullable=False, server_default=sa.false()),
+    )
+    # Partial index: only the few unsigned orders are ever looked up by this flag.
+    op.create_index(
+        "ix_orders_signature_pending",
+        "orders",
+        ["order_id"],
+        postgresql_where=sa.text("signature_pending"),
+        sqlite_where=sa.text("signature_pending"),
+    )
+
+
+def downgrade():
+    op.drop_index("ix_orders_signature_pending", table_name="orders")
+    op.drop_column("orders", "signature_pending")
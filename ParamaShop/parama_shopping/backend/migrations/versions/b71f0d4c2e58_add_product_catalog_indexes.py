@@ -0,0 +1,32 @@
+"""add product catalog keyset indexes
+
+Revision ID: b71f0d4c2e58
+Revises: e9eeac931351
+Create Date: 2026-02-03 09:40:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "b71f0d4c2e58"
+down_revision = "e9eeac931351"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keyset pagination compares (category, price, product_id) as a row value,
+    # which never matches NULLs, so give legacy rows the same default as /product/add.
+    op.execute("UPDATE products SET category = 'General' WHERE category IS NULL")
+    op.create_index("ix_products_category_price_id", "products", ["category", "price", "product_id"])
+    op.create_index(
+        "ix_products_seller_category_price_id",
+        "products",
+        ["seller_id", "category", "price", "product_id"],
+    )
+
+
+def downgrade():
+    op.drop_index("ix_products_seller_category_price_id", table_name="products")
+    op.drop_index("ix_products_category_price_id", table_name="products")
@@ -0,0 +1,26 @@
+"""add orders.signature_alg and orders.signature_key_id
+
+Revision ID: b8e1c6d4f203
+Revises: a5d3f9c2e741
+Create Date: 2026-02-14 10:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "b8e1c6d4f203"
+down_revision = "a5d3f9c2e741"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing rows stay NULL, which the signer registry reads as the legacy RSA-PSS key.
+    op.add_column("orders", sa.Column("signature_alg", sa.String(length=32), nullable=True))
+    op.add_column("orders", sa.Column("signature_key_id", sa.String(length=32), nullable=True))
+
+
+def downgrade():
+    op.drop_column("orders", "signature_key_id")
+    op.drop_column("orders", "signature_alg")
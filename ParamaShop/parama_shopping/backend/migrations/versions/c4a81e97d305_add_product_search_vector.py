@@ -0,0 +1,51 @@
+"""add product full-text search vector
+
+Revision ID: c4a81e97d305
+Revises: b71f0d4c2e58
+Create Date: 2026-02-04 11:20:00.000000
+"""
+
+from alembic import op
+
+
+revision = "c4a81e97d305"
+down_revision = "b71f0d4c2e58"
+branch_labels = None
+depends_on = None
+
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce({row}product_name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce({row}category, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce({row}description, '')), 'C')"
+)
+
+
+def upgrade():
+    # SQLite test databases use the in-process index in products/product_search.py.
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("ALTER TABLE products ADD COLUMN search_vector tsvector")
+    op.execute(f"UPDATE products SET search_vector = {SEARCH_VECTOR_SQL.format(row='')}")
+    op.execute("CREATE INDEX ix_products_search_vector ON products USING GIN (search_vector)")
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION products_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := {SEARCH_VECTOR_SQL.format(row='NEW.')};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER products_search_vector_trg
+        BEFORE INSERT OR UPDATE OF product_name, category, description ON products
+        FOR EACH ROW EXECUTE FUNCTION products_search_vector_update()
+    """)
+
+
+def downgrade():
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("DROP TRIGGER IF EXISTS products_search_vector_trg ON products")
+    op.execute("DROP FUNCTION IF EXISTS products_search_vector_update()")
+    op.execute("DROP INDEX IF EXISTS ix_products_search_vector")
+    op.execute("ALTER TABLE products DROP COLUMN IF EXISTS search_vector")
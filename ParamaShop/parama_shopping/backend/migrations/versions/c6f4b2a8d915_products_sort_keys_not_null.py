@@ -0,0 +1,42 @@
+"""make products.category and products.price NOT NULL
+
+Revision ID: c6f4b2a8d915
+Revises: b8e1c6d4f203
+Create Date: 2026-02-16 09:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "c6f4b2a8d915"
+down_revision = "b8e1c6d4f203"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # (category, price, product_id) is the catalog keyset; a NULL in either
+    # column makes the row-value comparison skip rows. Unpriced legacy rows get
+    # price 0 and are taken out of stock so they cannot be ordered for free.
+    op.execute("UPDATE products SET category = 'General' WHERE category IS NULL")
+    op.execute("UPDATE products SET price = 0, stock = 0 WHERE price IS NULL")
+    with op.batch_alter_table("products") as batch_op:
+        batch_op.alter_column(
+            "category",
+            existing_type=sa.String(length=80),
+            nullable=False,
+            server_default="General",
+        )
+        batch_op.alter_column("price", existing_type=sa.Float(), nullable=False)
+
+
+def downgrade():
+    with op.batch_alter_table("products") as batch_op:
+        batch_op.alter_column("price", existing_type=sa.Float(), nullable=True)
+        batch_op.alter_column(
+            "category",
+            existing_type=sa.String(length=80),
+            nullable=True,
+            server_default=None,
+        )
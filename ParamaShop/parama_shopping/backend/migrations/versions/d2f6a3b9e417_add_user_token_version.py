@@ -0,0 +1,26 @@
+"""add users.token_version for JWT claim revocation
+
+Revision ID: d2f6a3b9e417
+Revises: c4a81e97d305
+Create Date: 2026-02-05 14:30:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "d2f6a3b9e417"
+down_revision = "c4a81e97d305"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "users",
+        sa.Column("token_version", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade():
+    op.drop_column("users", "token_version")
@@ -0,0 +1,30 @@
+"""add transaction_node_leases
+
+Revision ID: d7a9e3c5b120
+Revises: c6f4b2a8d915
+Create Date: 2026-02-16 11:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "d7a9e3c5b120"
+down_revision = "c6f4b2a8d915"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # One row per transaction id node (0-1023) leased by a live process (TXN_NODE_ID=lease).
+    op.create_table(
+        "transaction_node_leases",
+        sa.Column("node_id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("holder", sa.String(length=120), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("node_id"),
+    )
+
+
+def downgrade():
+    op.drop_table("transaction_node_leases")
@@ -0,0 +1,37 @@
+"""make logs.timestamp NOT NULL
+
+Revision ID: e4b8d2f6a317
+Revises: d7a9e3c5b120
+Create Date: 2026-02-17 09:30:00.000000
+"""
+
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "e4b8d2f6a317"
+down_revision = "d7a9e3c5b120"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # (timestamp, log_id) is the /logs/all keyset: a NULL timestamp cannot be
+    # put in a cursor and is skipped by the row-value comparison. Undated legacy
+    # rows are stamped with the migration time, as partitioning did on PostgreSQL.
+    op.execute(sa.text("UPDATE logs SET timestamp = :now WHERE timestamp IS NULL").bindparams(now=datetime.utcnow()))
+    with op.batch_alter_table("logs") as batch_op:
+        batch_op.alter_column("timestamp", existing_type=sa.DateTime(), nullable=False)
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        relkind = bind.execute(sa.text("SELECT relkind FROM pg_class WHERE relname = 'logs'")).scalar()
+        if relkind == "p":
+            # Partition key: NOT NULL since 0a5e8c2f9b13.
+            return
+    with op.batch_alter_table("logs") as batch_op:
+        batch_op.alter_column("timestamp", existing_type=sa.DateTime(), nullable=True)
@@ -0,0 +1,101 @@
+"""add order_items seller index
+
+Revision ID: e9eeac931351
+Revises: 6b1c2f7a9d21
+Create Date: 2026-02-02 10:15:00.000000
+"""
+
+import ast
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "e9eeac931351"
+down_revision = "6b1c2f7a9d21"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+
+orders_table = sa.table(
+    "orders",
+    sa.column("order_id", sa.Integer),
+    sa.column("encrypted_data", sa.Text),
+)
+products_table = sa.table(
+    "products",
+    sa.column("product_id", sa.Integer),
+    sa.column("seller_id", sa.Integer),
+    sa.column("price", sa.Float),
+)
+
+
+def upgrade():
+    order_items = op.create_table(
+        "order_items",
+        sa.Column("order_item_id", sa.Integer(), nullable=False),
+        sa.Column("order_id", sa.Integer(), nullable=False),
+        sa.Column("product_id", sa.Integer(), nullable=True),
+        sa.Column("seller_id", sa.Integer(), nullable=True),
+        sa.Column("quantity", sa.Integer(), nullable=True),
+        sa.Column("unit_price", sa.Float(), nullable=True),
+        sa.ForeignKeyConstraint(["order_id"], ["orders.order_id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("order_item_id"),
+    )
+    op.create_index("ix_order_items_order_id", "order_items", ["order_id"])
+    op.create_index("ix_order_items_seller_id_order_id", "order_items", ["seller_id", "order_id"])
+    _backfill_order_items(order_items)
+
+
+def downgrade():
+    op.drop_index("ix_order_items_seller_id_order_id", table_name="order_items")
+    op.drop_index("ix_order_items_order_id", table_name="order_items")
+    op.drop_table("order_items")
+
+
+def _parse_items(decrypt_data, encrypted_data):
+    if not encrypted_data:
+        return []
+    try:
+        raw = decrypt_data(encrypted_data)
+        try:
+            data = json.loads(raw)
+        except json.JSONDecodeError:
+            data = ast.literal_eval(raw)
+    except Exception:
+        return []
+    items = data.get("items") if isinstance(data, dict) else None
+    return items if isinstance(items, list) else []
+
+
+def _backfill_order_items(order_items):
+    # Existing orders only carry their items inside the encrypted payload,
+    # so this is the one place that still has to decrypt every order.
+    from security.encryption import decrypt_data
+
+    bind = op.get_bind()
+    products = {
+        row.product_id: row
+        for row in bind.execute(sa.select(products_table)).fetchall()
+    }
+    result = bind.execute(sa.select(orders_table).order_by(orders_table.c.order_id))
+    rows = []
+    for order in result.fetchall():
+        for item in _parse_items(decrypt_data, order.encrypted_data):
+            if not isinstance(item, dict) or item.get("product_id") is None:
+                continue
+            product = products.get(item.get("product_id"))
+            rows.append({
+                "order_id": order.order_id,
+                "product_id": item.get("product_id"),
+                "seller_id": product.seller_id if product else None,
+                "quantity": item.get("quantity") or 0,
+                "unit_price": product.price if product else item.get("price"),
+            })
+        if len(rows) >= BATCH_SIZE:
+            op.bulk_insert(order_items, rows)
+            rows = []
+    if rows:
+        op.bulk_insert(order_items, rows)
@@ -0,0 +1,24 @@
+"""add logs keyset indexes
+
+Revision ID: f3b7c5d1a862
+Revises: d2f6a3b9e417
+Create Date: 2026-02-06 16:05:00.000000
+"""
+
+from alembic import op
+
+
+revision = "f3b7c5d1a862"
+down_revision = "d2f6a3b9e417"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_logs_timestamp_log_id", "logs", ["timestamp", "log_id"])
+    op.create_index("ix_logs_user_id_timestamp_log_id", "logs", ["user_id", "timestamp", "log_id"])
+
+
+def downgrade():
+    op.drop_index("ix_logs_user_id_timestamp_log_id", table_name="logs")
+    op.drop_index("ix_logs_timestamp_log_id", table_name="logs")
@@ -0,0 +1,127 @@
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta
+from functools import wraps
+from flask import Response, current_app, request
+from sqlalchemy.exc import IntegrityError
+from database.models import db, IdempotencyKey
+from utils.response_handler import error
+
+logger = logging.getLogger("idempotency")
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+
+class IdempotencyConflict(Exception):
+    pass
+
+
+def request_fingerprint(payload):
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def find_record(user_id, key, fingerprint):
+    """Live record for (user_id, key), or None. Expired records are removed.
+
+    Raises IdempotencyConflict when the key was first used with a different request body.
+    """
+    record = db.session.get(IdempotencyKey, (user_id, key))
+    if record is None:
+        return None
+    if record.expires_at <= datetime.utcnow():
+        db.session.delete(record)
+        db.session.flush()
+        return None
+    if record.request_hash != fingerprint:
+        raise IdempotencyConflict(key)
+    return record
+
+
+def claim_key(user_id, key, fingerprint, ttl):
+    """Insert the key inside the caller's transaction; a concurrent duplicate blocks or fails on the primary key."""
+    now = datetime.utcnow()
+    record = IdempotencyKey(
+        user_id=user_id,
+        idempotency_key=key,
+        request_hash=fingerprint,
+        created_at=now,
+        expires_at=now + ttl,
+    )
+    db.session.add(record)
+    db.session.flush()
+    return record
+
+
+def replay(record):
+    return Response(
+        record.response_body,
+        status=record.status_code,
+        mimetype="application/json",
+        headers={"Idempotent-Replayed": "true"},
+    )
+
+
+def idempotent(func):
+    """Replay the first successful response for a repeated Idempotency-Key instead of re-running func.
+
+    Wrap inside role_required so func receives user_id first. Only 2xx responses
+    are stored; failures roll the claim back so the client can retry the same key.
+    """
+    @wraps(func)
+    def wrapper(user_id, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return func(user_id, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return error(f"{IDEMPOTENCY_HEADER} must be at most {MAX_KEY_LENGTH} characters", 400)
+
+        fingerprint = request_fingerprint(request.get_json(silent=True))
+        ttl = timedelta(hours=current_app.config.get("IDEMPOTENCY_KEY_TTL_HOURS", 24))
+        try:
+            record = find_record(user_id, key, fingerprint)
+            if record is None:
+                try:
+                    record = claim_key(user_id, key, fingerprint, ttl)
+                except IntegrityError:
+                    # Another request with this key committed first.
+                    db.session.rollback()
+                    record = find_record(user_id, key, fingerprint)
+                    if record is None or record.status_code is None:
+                        return error("A request with this Idempotency-Key is still in progress", 409)
+                    return replay(record)
+            elif record.status_code is None:
+                return error("A request with this Idempotency-Key is still in progress", 409)
+            else:
+                return replay(record)
+        except IdempotencyConflict:
+            db.session.rollback()
+            return error(f"{IDEMPOTENCY_HEADER} was already used with a different request", 422)
+
+        try:
+            response = current_app.make_response(func(user_id, *args, **kwargs))
+        except Exception:
+            db.session.rollback()
+            raise
+        if 200 <= response.status_code < 300:
+            record = db.session.get(IdempotencyKey, (user_id, key))
+            if record is not None:
+                record.status_code = response.status_code
+                record.response_body = response.get_data(as_text=True)
+                db.session.commit()
+        else:
+            db.session.rollback()
+        return response
+    return wrapper
+
+
+def purge_expired_keys(now=None):
+    deleted = (
+        IdempotencyKey.query
+        .filter(IdempotencyKey.expires_at <= (now or datetime.utcnow()))
+        .delete(synchronize_session=False)
+    )
+    db.session.commit()
+    logger.info(f"Purged {deleted} expired idempotency keys")
+    return deleted
@@ -0,0 +1,45 @@
+import logging
+from collections import defaultdict
+from sqlalchemy import update
+from database.models import db, Product
+
+logger = logging.getLogger("inventory")
+
+
+class InsufficientStock(Exception):
+    def __init__(self, product_id):
+        super().__init__(f"Insufficient stock for product {product_id}")
+        self.product_id = product_id
+
+
+def aggregate_quantities(items):
+    """Sum quantities per product_id so repeated cart lines are reserved as one."""
+    quantities = defaultdict(int)
+    for item in items:
+        if item.get("product_id") is not None:
+            quantities[item["product_id"]] += item.get("quantity") or 0
+    return quantities
+
+
+def reserve_stock(items):
+    """Deduct stock for every item inside the caller's transaction, or raise InsufficientStock.
+
+    Each product is decremented with one conditional UPDATE, so the database
+    checks and deducts atomically and concurrent checkouts cannot oversell.
+    Rows are locked in ascending product_id order, which keeps two carts that
+    share products from deadlocking. On InsufficientStock the caller must roll
+    back to release any rows already decremented.
+    """
+    quantities = aggregate_quantities(items)
+    for product_id in sorted(quantities):
+        quantity = quantities[product_id]
+        result = db.session.execute(
+            update(Product)
+            .where(Product.product_id == product_id, Product.stock >= quantity)
+            .values(stock=Product.stock - quantity)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != 1:
+            logger.info(f"Stock reservation failed for product {product_id} (requested {quantity})")
+            raise InsufficientStock(product_id)
+    return dict(quantities)
@@ -0,0 +1,63 @@
+import logging
+import time
+from sqlalchemy import update
+from database.models import db, Order
+from security.crypto_context import get_crypto_context
+
+logger = logging.getLogger("key_rotation")
+
+
+def rotate_order_encryption(batch_size=500, pause=0.0, start_after=0, limit=None, progress=None):
+    """Re-encrypt orders.encrypted_data under the primary ENCRYPTION_KEY.
+
+    Orders are walked in order_id keyset batches, each committed on its own so
+    row locks stay short; pause sleeps between batches to throttle load on a
+    live database. Rows already under the primary key are skipped, so an
+    interrupted run can simply be started again (or resumed with start_after).
+    Each row is updated only if its ciphertext is unchanged since it was read.
+    progress, if given, is called with the running totals after every batch.
+    """
+    context = get_crypto_context()
+    totals = {"scanned": 0, "rotated": 0, "skipped": 0, "failed": 0, "last_order_id": start_after}
+    started = time.monotonic()
+    while limit is None or totals["scanned"] < limit:
+        size = batch_size if limit is None else min(batch_size, limit - totals["scanned"])
+        rows = (
+            db.session.query(Order.order_id, Order.encrypted_data)
+            .filter(Order.order_id > totals["last_order_id"])
+            .order_by(Order.order_id)
+            .limit(size)
+            .all()
+        )
+        if not rows:
+            break
+        for order_id, token in rows:
+            if not token or context.is_current(token):
+                totals["skipped"] += 1
+                continue
+            try:
+                rotated = context.rotate(token)
+            except Exception as exc:
+                totals["failed"] += 1
+                logger.error(f"Order {order_id} could not be re-encrypted: {exc}")
+                continue
+            result = db.session.execute(
+                update(Order)
+                .where(Order.order_id == order_id, Order.encrypted_data == token)
+                .values(encrypted_data=rotated)
+                .execution_options(synchronize_session=False)
+            )
+            totals["rotated" if result.rowcount else "skipped"] += 1
+        db.session.commit()
+        totals["scanned"] += len(rows)
+        totals["last_order_id"] = rows[-1][0]
+        totals["elapsed_seconds"] = round(time.monotonic() - started, 2)
+        if progress is not None:
+            progress(dict(totals))
+        if pause:
+            time.sleep(pause)
+    logger.info(
+        f"Key rotation: {totals['rotated']} re-encrypted, {totals['skipped']} skipped, "
+        f"{totals['failed']} failed, last order_id {totals['last_order_id']}"
+    )
+    return totals
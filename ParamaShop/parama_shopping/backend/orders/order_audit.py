@@ -0,0 +1,202 @@
+import atexit
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+import json
+from sqlalchemy import or_
+from database.models import db, Order
+
+logger = logging.getLogger("order_audit")
+
+
+def verify_stored_order(job):
+    """Decrypt and verify one order. Top-level so it can run in a worker process.
+
+    job is (order_id, encrypted_data, order_signature, signature_alg, signature_key_id);
+    returns (order_id, valid).
+    """
+    from orders.order_payload import decode_job
+
+    order_id, *payload_job = job
+    _, _, valid = decode_job(tuple(payload_job))
+    return order_id, bool(valid)
+
+
+def audit_order_signatures(batch_size=500, max_age=None, executor=None, unchecked_only=False):
+    """Re-verify signed orders and store the verdict on each row.
+
+    Only orders never checked, or last checked before now - max_age, are
+    verified; max_age=None re-verifies everything. unchecked_only verifies
+    just the orders without a verdict yet (the backfill after upgrading to
+    the integrity_valid columns). Verification is fanned out over executor
+    (any concurrent.futures executor) when one is given.
+    """
+    checked_at = datetime.utcnow()
+    candidates = Order.query.filter(Order.order_signature.isnot(None), Order.order_signature != "")
+    if unchecked_only:
+        candidates = candidates.filter(Order.integrity_checked_at.is_(None))
+    elif max_age is not None:
+        candidates = candidates.filter(or_(
+            Order.integrity_checked_at.is_(None),
+            Order.integrity_checked_at < checked_at - max_age,
+        ))
+
+    checked = 0
+    invalid_ids = []
+    last_id = 0
+    while True:
+        orders = (
+            candidates
+            .filter(Order.order_id > last_id)
+            .order_by(Order.order_id)
+            .limit(batch_size)
+            .all()
+        )
+        if not orders:
+            break
+        jobs = [(o.order_id, o.encrypted_data, o.order_signature, o.signature_alg, o.signature_key_id) for o in orders]
+        mapper = executor.map if executor is not None else map
+        verdicts = dict(mapper(verify_stored_order, jobs))
+        for o in orders:
+            o.integrity_valid = verdicts[o.order_id]
+            o.integrity_checked_at = checked_at
+            if not o.integrity_valid:
+                invalid_ids.append(o.order_id)
+        db.session.commit()
+        checked += len(orders)
+        last_id = orders[-1].order_id
+    logger.info(f"Integrity audit: {checked} checked, {len(invalid_ids)} invalid")
+    return {
+        "checked": checked,
+        "invalid": len(invalid_ids),
+        "invalid_order_ids": invalid_ids,
+    }
+
+
+def resign_orders(algorithm, batch_size=500, limit=None):
+    """Re-sign stored orders with the active signer when it uses algorithm.
+
+    Each order's current signature is verified first; only valid orders are
+    re-signed, so tampered rows are flagged (integrity_valid = false) rather
+    than laundered under a fresh signature. Batches are committed as they go,
+    so an interrupted run simply resumes with the orders still left.
+    """
+    from orders.order_payload import decode_job
+    from security.signers import get_signer_registry
+
+    registry = get_signer_registry()
+    signer = registry.active
+    if signer.algorithm != algorithm:
+        raise ValueError(f"Active signer is {signer.algorithm}; set ORDER_SIGNATURE_ALG={algorithm} first")
+
+    candidates = Order.query.filter(
+        Order.order_signature.isnot(None),
+        Order.order_signature != "",
+        Order.signature_pending.is_(False),
+        or_(
+            Order.signature_alg.is_(None),
+            Order.signature_alg != signer.algorithm,
+            Order.signature_key_id != signer.key_id,
+        ),
+    )
+    resigned = 0
+    skipped_ids = []
+    last_id = 0
+    while limit is None or resigned + len(skipped_ids) < limit:
+        size = batch_size if limit is None else min(batch_size, limit - resigned - len(skipped_ids))
+        orders = candidates.filter(Order.order_id > last_id).order_by(Order.order_id).limit(size).all()
+        if not orders:
+            break
+        checked_at = datetime.utcnow()
+        for o in orders:
+            data, _, valid = decode_job((o.encrypted_data, o.order_signature, o.signature_alg, o.signature_key_id))
+            o.integrity_checked_at = checked_at
+            if not valid:
+                o.integrity_valid = False
+                skipped_ids.append(o.order_id)
+                continue
+            o.order_signature, o.signature_alg, o.signature_key_id = registry.sign(json.dumps(data))
+            o.integrity_valid = True
+            resigned += 1
+        db.session.commit()
+        last_id = orders[-1].order_id
+    logger.info(f"Re-signed {resigned} orders with {algorithm}; {len(skipped_ids)} failed verification")
+    return {
+        "algorithm": algorithm,
+        "key_id": signer.key_id,
+        "resigned": resigned,
+        "skipped_invalid": len(skipped_ids),
+        "skipped_order_ids": skipped_ids,
+    }
+
+
+class IntegrityAuditWorker:
+    """Background thread that periodically re-verifies stale orders on a process pool."""
+
+    def __init__(self, app, interval, batch_size, max_age, processes=None):
+        self.app = app
+        self.interval = interval
+        self.batch_size = batch_size
+        self.max_age = max_age
+        self.processes = processes
+        self._stop = threading.Event()
+        self._thread = None
+        self._executor = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._executor = ProcessPoolExecutor(max_workers=self.processes)
+        self._thread = threading.Thread(target=self._run, name="order-integrity-audit", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=10.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def run_once(self):
+        with self.app.app_context():
+            try:
+                return audit_order_signatures(self.batch_size, self.max_age, self._executor)
+            finally:
+                db.session.remove()
+
+    def _run(self):
+        # The first pass runs straight away, so orders never checked get a verdict on startup.
+        delay = 0
+        while not self._stop.wait(delay):
+            delay = self.interval
+            try:
+                self.run_once()
+            except Exception as exc:
+                logger.error(f"Integrity audit run failed: {exc}")
+
+
+_worker = None
+
+
+def init_integrity_audit(app):
+    """Start the periodic audit when INTEGRITY_AUDIT_INTERVAL (seconds) is positive."""
+    global _worker
+    interval = app.config.get("INTEGRITY_AUDIT_INTERVAL", 0)
+    if interval <= 0 or _worker is not None:
+        return
+    _worker = IntegrityAuditWorker(
+        app,
+        interval=interval,
+        batch_size=app.config.get("INTEGRITY_AUDIT_BATCH_SIZE", 500),
+        max_age=timedelta(hours=app.config.get("INTEGRITY_AUDIT_MAX_AGE_HOURS", 24)),
+        processes=app.config.get("INTEGRITY_AUDIT_PROCESSES") or None,
+    )
+    _worker.start()
+    atexit.register(_worker.stop)
+
+
+def count_invalid_orders():
+    return Order.query.filter(Order.integrity_valid.is_(False)).count()
@@ -0,0 +1,77 @@
+import json
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+import click
+from flask.cli import with_appcontext
+from orders.order_audit import audit_order_signatures, resign_orders
+from orders.idempotency import purge_expired_keys
+from orders.key_rotation import rotate_order_encryption
+from security.signing_service import sign_pending_orders
+
+orders_cli = click.Group("orders", help="Order maintenance jobs.")
+
+
+@orders_cli.command("audit-signatures")
+@click.option("--batch-size", type=int, default=500, show_default=True, help="Orders loaded per query.")
+@click.option("--max-age-hours", type=float, default=None, help="Only re-verify orders last checked longer ago than this.")
+@click.option("--processes", type=int, default=None, help="Verify on a process pool of this size.")
+@click.option("--unchecked-only", is_flag=True, help="Only verify orders that have no verdict yet (deploy backfill).")
+@with_appcontext
+def audit_signatures_command(batch_size, max_age_hours, processes, unchecked_only):
+    """Verify order signatures and store the verdict on each order."""
+    max_age = timedelta(hours=max_age_hours) if max_age_hours is not None else None
+    if processes:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            result = audit_order_signatures(batch_size, max_age, executor, unchecked_only)
+    else:
+        result = audit_order_signatures(batch_size, max_age, unchecked_only=unchecked_only)
+    click.echo(json.dumps(result, indent=2))
+
+
+@orders_cli.command("resign")
+@click.option("--algorithm", type=click.Choice(["RSA-PSS-SHA256", "Ed25519"]), default="Ed25519", show_default=True)
+@click.option("--batch-size", type=int, default=500, show_default=True, help="Orders re-signed per commit.")
+@click.option("--limit", type=int, default=None, help="Stop after this many orders.")
+@with_appcontext
+def resign_command(algorithm, batch_size, limit):
+    """Re-sign historical orders with the active signer (ORDER_SIGNATURE_ALG must match --algorithm)."""
+    try:
+        result = resign_orders(algorithm, batch_size, limit)
+    except ValueError as exc:
+        raise click.ClickException(str(exc))
+    click.echo(json.dumps(result, indent=2))
+
+
+@orders_cli.command("rotate-key")
+@click.option("--batch-size", type=int, default=500, show_default=True, help="Orders re-encrypted per commit.")
+@click.option("--pause", type=float, default=0.0, show_default=True, help="Seconds to sleep between batches.")
+@click.option("--start-after", type=int, default=0, show_default=True, help="Resume after this order_id.")
+@click.option("--limit", type=int, default=None, help="Stop after scanning this many orders.")
+@with_appcontext
+def rotate_key_command(batch_size, pause, start_after, limit):
+    """Re-encrypt order payloads under the current ENCRYPTION_KEY (old keys in ENCRYPTION_OLD_KEYS)."""
+    def report(totals):
+        click.echo(
+            f"order_id<={totals['last_order_id']}: scanned {totals['scanned']}, "
+            f"rotated {totals['rotated']}, skipped {totals['skipped']}, failed {totals['failed']} "
+            f"({totals['elapsed_seconds']}s)",
+            err=True,
+        )
+
+    result = rotate_order_encryption(batch_size, pause, start_after, limit, progress=report)
+    click.echo(json.dumps(result, indent=2))
+
+
+@orders_cli.command("purge-idempotency-keys")
+@with_appcontext
+def purge_idempotency_keys_command():
+    """Delete Idempotency-Key records past their TTL."""
+    click.echo(json.dumps({"deleted": purge_expired_keys()}))
+
+
+@orders_cli.command("sign-pending")
+@click.option("--batch-size", type=int, default=200, show_default=True, help="Orders loaded per query.")
+@with_appcontext
+def sign_pending_command(batch_size):
+    """Sign orders still marked signature_pending (e.g. after a restart in async signing mode)."""
+    click.echo(json.dumps({"signed": sign_pending_orders(batch_size)}))
@@ -0,0 +1,79 @@
+import csv
+import io
+import json
+from datetime import datetime, time, timedelta
+from database.models import db, Order
+from security.encoding import base64_decode
+from orders.order_payload import decode_order_payloads
+
+EXPORT_BATCH_SIZE = 500
+
+DELIVERY_FIELDS = ("name", "phone", "address_line1", "address_line2", "city", "state", "postal_code", "country")
+CSV_COLUMNS = (
+    ["order_id", "user_id", "transaction_id", "created_at", "total", "items"]
+    + [f"delivery_{name}" for name in DELIVERY_FIELDS]
+)
+
+
+def parse_day_range(start_value, end_value):
+    """Turn inclusive YYYY-MM-DD from/to values into a half-open [start, end) datetime range."""
+    start = datetime.combine(datetime.strptime(start_value, "%Y-%m-%d").date(), time.min) if start_value else None
+    end = None
+    if end_value:
+        end = datetime.combine(datetime.strptime(end_value, "%Y-%m-%d").date(), time.min) + timedelta(days=1)
+    return start, end
+
+
+def build_order_query(start=None, end=None, after_id=None):
+    """Orders in ascending order_id, so an interrupted export resumes with after_id=<last order_id>."""
+    query = db.select(Order)
+    if start is not None:
+        query = query.where(Order.created_at >= start)
+    if end is not None:
+        query = query.where(Order.created_at < end)
+    if after_id is not None:
+        query = query.where(Order.order_id > after_id)
+    return query.order_by(Order.order_id)
+
+
+def serialize_admin_order(order, data):
+    data = data if isinstance(data, dict) else {}
+    return {
+        "order_id": order.order_id,
+        "user_id": order.user_id,
+        "status": getattr(order, "order_status", None),
+        "transaction_id": base64_decode(order.transaction_id) if order.transaction_id else None,
+        "items": data.get("items", []),
+        "total": data.get("total"),
+        "delivery": {name: getattr(order, f"delivery_{name}") for name in DELIVERY_FIELDS},
+        "created_at": order.created_at.isoformat() if order.created_at else None,
+        "signature_pending": bool(order.signature_pending),
+    }
+
+
+def iter_admin_orders(query, batch_size=EXPORT_BATCH_SIZE):
+    """Yield serialized orders, fetching and decoding batch_size rows at a time."""
+    result = db.session.execute(query.execution_options(yield_per=batch_size))
+    for orders in result.scalars().partitions():
+        for order, data in zip(orders, decode_order_payloads(orders, use_cache=False)):
+            yield serialize_admin_order(order, data)
+
+
+def iter_ndjson(rows):
+    for row in rows:
+        yield json.dumps(row) + "\n"
+
+
+def iter_csv(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_COLUMNS)
+    yield buffer.getvalue()
+    for row in rows:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(
+            [row["order_id"], row["user_id"], row["transaction_id"], row["created_at"], row["total"], json.dumps(row["items"])]
+            + [row["delivery"][name] for name in DELIVERY_FIELDS]
+        )
+        yield buffer.getvalue()
@@ -0,0 +1,227 @@
+import ast
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from security.encryption import decrypt_data
+
+# Parsed dicts take several times the space of their JSON text; the memory
+# budget charges each entry this multiple of the decrypted payload length.
+PARSED_SIZE_FACTOR = 4
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Below this many cache misses a batch is decoded inline; pool overhead would dominate.
+DEFAULT_MIN_PARALLEL = 64
+
+
+def parse_payload(raw):
+    try:
+        return json.loads(raw)
+    except json.JSONDecodeError:
+        return ast.literal_eval(raw)
+
+
+def decode_payload(encrypted_data):
+    """Decrypt and parse an orders.encrypted_data value; {} if it is missing or unreadable."""
+    if not encrypted_data:
+        return {}
+    try:
+        return parse_payload(decrypt_data(encrypted_data))
+    except Exception:
+        return {}
+
+
+class OrderPayloadCache:
+    """Thread-safe LRU of decoded order payloads bounded by an approximate byte budget."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, size):
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def resize(self, max_bytes):
+        with self._lock:
+            self.max_bytes = max_bytes
+            while self._entries and self._bytes > max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            }
+
+
+payload_cache = OrderPayloadCache()
+
+
+class DecodePool:
+    """Lazily created executor that fans batch decodes out over threads or processes."""
+
+    def __init__(self, workers=None, kind="thread", min_parallel=DEFAULT_MIN_PARALLEL):
+        self.workers = workers or os.cpu_count() or 1
+        self.kind = kind
+        self.min_parallel = min_parallel
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def configure(self, workers=None, kind="thread", min_parallel=DEFAULT_MIN_PARALLEL):
+        self.shutdown()
+        self.workers = workers or os.cpu_count() or 1
+        self.kind = kind
+        self.min_parallel = min_parallel
+
+    def executor(self):
+        with self._lock:
+            if self._executor is None:
+                if self.kind == "process":
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="order-decode")
+            return self._executor
+
+    def map(self, fn, jobs):
+        """Ordered map of fn over jobs; runs inline for small batches or a single worker."""
+        if self.workers <= 1 or len(jobs) < self.min_parallel:
+            return [fn(job) for job in jobs]
+        chunksize = max(1, len(jobs) // (self.workers * 4)) if self.kind == "process" else 1
+        return list(self.executor().map(fn, jobs, chunksize=chunksize))
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+decode_pool = DecodePool()
+
+
+def init_order_payload(app):
+    payload_cache.resize(app.config.get("ORDER_PAYLOAD_CACHE_BYTES", DEFAULT_MAX_BYTES))
+    decode_pool.configure(
+        workers=app.config.get("ORDER_DECODE_WORKERS") or None,
+        kind=app.config.get("ORDER_DECODE_EXECUTOR", "thread"),
+        min_parallel=app.config.get("ORDER_DECODE_MIN_PARALLEL", DEFAULT_MIN_PARALLEL),
+    )
+
+
+def decode_job(job):
+    """Decrypt, parse and optionally verify one payload. Top-level so worker processes can run it.
+
+    job is (encrypted_data, signature or None, signature_alg, signature_key_id);
+    returns (data, raw_length, valid), with valid None when no signature was given.
+    """
+    from security.signers import verify_payload
+
+    encrypted_data, signature, algorithm, key_id = job
+    try:
+        raw = decrypt_data(encrypted_data)
+        data = parse_payload(raw)
+    except Exception:
+        return {}, 0, False if signature else None
+    if not signature:
+        return data, len(raw), None
+    valid = isinstance(data, dict) and verify_payload(json.dumps(data), signature, algorithm, key_id)
+    return data, len(raw), valid
+
+
+def decode_order_payload(order):
+    """Decoded payload for an Order row, served from the shared LRU when possible.
+
+    Entries are keyed by (order_id, sha256 of the ciphertext), so a re-encrypted
+    order never serves a stale payload. The returned dict is shared between
+    requests and must be treated as read-only.
+    """
+    if not order.encrypted_data:
+        return {}
+    if payload_cache.max_bytes <= 0:
+        return decode_payload(order.encrypted_data)
+    key = (order.order_id, hashlib.sha256(order.encrypted_data.encode()).digest())
+    cached = payload_cache.get(key)
+    if cached is not None:
+        return cached
+    try:
+        raw = decrypt_data(order.encrypted_data)
+        data = parse_payload(raw)
+    except Exception:
+        return {}
+    payload_cache.put(key, data, len(raw) * PARSED_SIZE_FACTOR)
+    return data
+
+
+def decode_order_payloads(orders, verify=False, use_cache=True):
+    """Decoded payloads for a list of Order rows, in the same order.
+
+    Cache hits are served directly; misses are decrypted (and, with verify=True,
+    signature-checked) on decode_pool. With verify=True each result is a
+    (payload, valid) pair instead of a bare payload. Bulk exports pass
+    use_cache=False so a full scan does not evict the hot working set.
+    """
+    results = [None] * len(orders)
+    pending = []
+    for index, order in enumerate(orders):
+        if not order.encrypted_data:
+            results[index] = ({}, None) if verify else {}
+            continue
+        key = None
+        if use_cache and payload_cache.max_bytes > 0:
+            key = (order.order_id, hashlib.sha256(order.encrypted_data.encode()).digest())
+            if not verify:
+                cached = payload_cache.get(key)
+                if cached is not None:
+                    results[index] = cached
+                    continue
+        job = (order.encrypted_data, order.order_signature, order.signature_alg, order.signature_key_id) if verify \
+            else (order.encrypted_data, None, None, None)
+        pending.append((index, key, job))
+
+    decoded = decode_pool.map(decode_job, [job for _, _, job in pending])
+    for (index, key, _), (data, raw_length, valid) in zip(pending, decoded):
+        if key is not None and raw_length:
+            payload_cache.put(key, data, raw_length * PARSED_SIZE_FACTOR)
+        results[index] = (data, valid) if verify else data
+    return results
@@ -1,33 +1,33 @@
 from flask import Blueprint, request
 import json
-import ast
-import secrets
+import logging
 from datetime import datetime
 from typing import Optional
 from flask_jwt_extended import jwt_required
 from database.models import Product
 from database.models import db, Order
-from security.encryption import encrypt_data, decrypt_data
-from security.digital_signature import sign_text_base64, verify_text_base64
+from sqlalchemy.exc import IntegrityError
+from security.encryption import encrypt_data
+from security.signers import sign_payload, verify_payload
 from security.encoding import base64_encode, base64_decode
 from utils.response_handler import success, error
 from logs.activity_logger import log_activity
-from products.product_service import get_products_by_seller
+from orders.order_service import record_order_items, get_seller_order_products, get_order_seller_products
+from orders.revenue_service import record_order_revenue, order_total
+from orders.order_payload import decode_order_payload, decode_order_payloads
+from orders.order_export import serialize_admin_order
+from orders.inventory import reserve_stock, InsufficientStock
+from orders.transaction_ids import generate_transaction_id, is_duplicate_transaction_id
+from orders.idempotency import idempotent
 from middleware.role_middleware import role_required
+from security.signing_service import get_signing_service
+from middleware.principal import current_principal
 
 order_bp = Blueprint("order", __name__)
+logger = logging.getLogger("order_routes")
 
-def parse_order_data(order):
-    if not order.encrypted_data:
-        return {}
-    try:
-        raw = decrypt_data(order.encrypted_data)
-        try:
-            return json.loads(raw)
-        except json.JSONDecodeError:
-            return ast.literal_eval(raw)
-    except Exception:
-        return {}
+# A duplicate transaction id (two processes sharing a node id) is regenerated this many times.
+TXN_ID_ATTEMPTS = 3
 
 def decode_transaction_id(encoded: Optional[str]) -> Optional[str]:
     if not encoded:
@@ -35,47 +35,58 @@ def decode_transaction_id(encoded: Optional[str]) -> Optional[str]:
     decoded = base64_decode(encoded)
     return decoded or None
 
-def generate_transaction_id(seller_id_token: str) -> str:
-    date_str = datetime.utcnow().strftime("%Y%m%d")
-    while True:
-        suffix = secrets.randbelow(10000)
-        candidate = f"TXN-{seller_id_token}-{date_str}-{suffix:04d}"
-        encoded = base64_encode(candidate)
-        if not encoded:
-            continue
-        if not Order.query.filter_by(transaction_id=encoded).first():
-            return candidate
+def serialize_delivery(o):
+    return {
+        "name": o.delivery_name,
+        "phone": o.delivery_phone,
+        "address_line1": o.delivery_address_line1,
+        "address_line2": o.delivery_address_line2,
+        "city": o.delivery_city,
+        "state": o.delivery_state,
+        "postal_code": o.delivery_postal_code,
+        "country": o.delivery_country,
+    }
+
+def serialize_user_order(o, data):
+    items = data.get("items") if isinstance(data, dict) else []
+    total = data.get("total") if isinstance(data, dict) else None
+    return {
+        "order_id": o.order_id,
+        "transaction_id": decode_transaction_id(o.transaction_id),
+        "created_at": o.created_at.isoformat() if o.created_at else None,
+        "items": items or [],
+        "total": total,
+        "integrity_valid": o.integrity_valid,
+        "signature_pending": bool(o.signature_pending),
+        "delivery": serialize_delivery(o),
+    }
+
+def serialize_seller_order(o, data, product_ids):
+    """The seller's slice of an order, or None when none of its items are theirs."""
+    if not isinstance(data, dict):
+        return None
+    items = data.get("items")
+    if not isinstance(items, list):
+        return None
+    filtered = [i for i in items if isinstance(i, dict) and i.get("product_id") in product_ids]
+    if not filtered:
+        return None
+    total = sum((i.get("price", 0) or 0) * (i.get("quantity", 0) or 0) for i in filtered)
+    return {
+        "order_id": o.order_id,
+        "transaction_id": decode_transaction_id(o.transaction_id),
+        "user_id": o.user_id,
+        "created_at": o.created_at.isoformat() if o.created_at else None,
+        "items": filtered,
+        "total_for_seller": total,
+        "integrity_valid": o.integrity_valid,
+        "signature_pending": bool(o.signature_pending),
+        "delivery": serialize_delivery(o),
+    }
 
 def build_user_orders(user_id):
     orders = Order.query.filter_by(user_id=user_id).all()
-    payload = []
-    for o in orders:
-        data = parse_order_data(o)
-        items = data.get("items") if isinstance(data, dict) else []
-        total = data.get("total") if isinstance(data, dict) else None
-        integrity = None
-        if o.order_signature and isinstance(data, dict):
-            integrity = verify_text_base64(json.dumps(data), o.order_signature)
-        transaction_id = decode_transaction_id(o.transaction_id)
-        payload.append({
-            "order_id": o.order_id,
-            "transaction_id": transaction_id,
-            "created_at": o.created_at.isoformat() if o.created_at else None,
-            "items": items or [],
-            "total": total,
-            "integrity_valid": integrity,
-            "delivery": {
-                "name": o.delivery_name,
-                "phone": o.delivery_phone,
-                "address_line1": o.delivery_address_line1,
-                "address_line2": o.delivery_address_line2,
-                "city": o.delivery_city,
-                "state": o.delivery_state,
-                "postal_code": o.delivery_postal_code,
-                "country": o.delivery_country,
-            },
-        })
-    return payload
+    return [serialize_user_order(o, data) for o, data in zip(orders, decode_order_payloads(orders))]
 
 # User: View their orders
 @order_bp.route("/user-orders", methods=["GET"])
@@ -99,52 +110,53 @@ def order_history(user_id):
 @role_required("SELLER")
 def view_seller_orders(user_id):
     try:
-        products = get_products_by_seller(user_id)
-        product_ids = {p.product_id for p in products}
-
-        orders = Order.query.all()
+        order_products = get_seller_order_products(user_id)
+        orders = []
+        if order_products:
+            orders = (
+                Order.query
+                .filter(Order.order_id.in_(order_products.keys()))
+                .order_by(Order.order_id)
+                .all()
+            )
         seller_orders = []
-        for o in orders:
-            data = parse_order_data(o)
-            if not isinstance(data, dict):
-                continue
-            items = data.get("items")
-            if not isinstance(items, list):
-                continue
-            filtered = [i for i in items if isinstance(i, dict) and i.get("product_id") in product_ids]
-            if not filtered:
-                continue
-            integrity = None
-            if o.order_signature:
-                integrity = verify_text_base64(json.dumps(data), o.order_signature)
-            total = sum((i.get("price", 0) or 0) * (i.get("quantity", 0) or 0) for i in filtered)
-            seller_orders.append({
-                "order_id": o.order_id,
-                "transaction_id": decode_transaction_id(o.transaction_id),
-                "user_id": o.user_id,
-                "created_at": o.created_at.isoformat() if o.created_at else None,
-                "items": filtered,
-                "total_for_seller": total,
-                "integrity_valid": integrity,
-                "delivery": {
-                    "name": o.delivery_name,
-                    "phone": o.delivery_phone,
-                    "address_line1": o.delivery_address_line1,
-                    "address_line2": o.delivery_address_line2,
-                    "city": o.delivery_city,
-                    "state": o.delivery_state,
-                    "postal_code": o.delivery_postal_code,
-                    "country": o.delivery_country,
-                },
-            })
+        for o, data in zip(orders, decode_order_payloads(orders)):
+            entry = serialize_seller_order(o, data, order_products.get(o.order_id, set()))
+            if entry is not None:
+                seller_orders.append(entry)
 
         return success("Seller orders fetched", seller_orders)
     except Exception:
         return error("Failed to load seller orders", 500)
 
+# Admin, owning user or involved seller: look up one order by its TXN id
+@order_bp.route("/by-transaction/<txn>", methods=["GET"])
+@jwt_required()
+@role_required("USER", "SELLER", "ADMIN")
+def order_by_transaction(user_id, txn):
+    order = Order.query.filter_by(transaction_id=base64_encode(txn)).first()
+    if order is None:
+        return error("Order not found", 404)
+    role = current_principal().role_name
+    if role == "ADMIN":
+        payload = serialize_admin_order(order, decode_order_payload(order))
+        payload["integrity_valid"] = order.integrity_valid
+        payload["signature_pending"] = bool(order.signature_pending)
+        return success("Order fetched", payload)
+    if role == "USER":
+        if order.user_id != user_id:
+            return error("Order not found", 404)
+        return success("Order fetched", serialize_user_order(order, decode_order_payload(order)))
+    product_ids = get_order_seller_products(order.order_id, user_id)
+    payload = serialize_seller_order(order, decode_order_payload(order), product_ids) if product_ids else None
+    if payload is None:
+        return error("Order not found", 404)
+    return success("Order fetched", payload)
+
 @order_bp.route("/place", methods=["POST"])
 @jwt_required()
 @role_required("USER")
+@idempotent
 def place_order(user_id):
     data = request.json or {}
 
@@ -152,6 +164,7 @@ def place_order(user_id):
     if not isinstance(items, list) or len(items) == 0:
         return error("No items provided", 400)
     product_ids = [item.get("product_id") for item in items if item.get("product_id") is not None]
+    product_map = {}
     seller_ids = set()
     if product_ids:
         products = Product.query.filter(Product.product_id.in_(product_ids)).all()
@@ -164,19 +177,12 @@ def place_order(user_id):
             if qty <= 0:
                 return error("Invalid quantity in order", 400)
             product = product_map[pid]
+            # Fast path only; reserve_stock below is the authoritative check.
             if product.stock is None or product.stock < qty:
                 return error(f"Insufficient stock for product {pid}", 400)
-        # apply stock deductions
-        for item in items:
-            pid = item.get("product_id")
-            qty = item.get("quantity") or 0
-            product = product_map[pid]
-            product.stock -= qty
             if product.seller_id is not None:
                 seller_ids.add(str(product.seller_id))
     seller_id_token = "MULTI" if len(seller_ids) > 1 else (next(iter(seller_ids), None) or "UNKNOWN")
-    transaction_decoded = generate_transaction_id(seller_id_token)
-    transaction_encoded = base64_encode(transaction_decoded)
 
     delivery = data.get("delivery") or {}
     delivery_payload = {
@@ -190,33 +196,85 @@ def place_order(user_id):
         "country": delivery.get("country"),
     }
 
-    payload_json = json.dumps({
-        "items": items,
-        "total": data.get("total"),
-        "timestamp": data.get("timestamp"),
-        "delivery": delivery_payload,
-        "transaction_id": transaction_decoded,
-    })
-    encrypted = encrypt_data(payload_json)
-    signature = sign_text_base64(payload_json)
-
-    order = Order(
-        user_id=user_id,
-        encrypted_data=encrypted,
-        order_signature=signature,
-        transaction_id=transaction_encoded,
-        delivery_name=delivery_payload.get("name"),
-        delivery_phone=delivery_payload.get("phone"),
-        delivery_address_line1=delivery_payload.get("address_line1"),
-        delivery_address_line2=delivery_payload.get("address_line2"),
-        delivery_city=delivery_payload.get("city"),
-        delivery_state=delivery_payload.get("state"),
-        delivery_postal_code=delivery_payload.get("postal_code"),
-        delivery_country=delivery_payload.get("country"),
-    )
-
-    db.session.add(order)
-    db.session.commit()
+    # With ORDER_SIGNING_MODE=async the order is committed unsigned and signed on
+    # the signing pool; a full queue (or sync mode) signs on this thread instead.
+    signer = get_signing_service()
+    sign_async = signer is not None and signer.reserve()
+    for attempt in range(1, TXN_ID_ATTEMPTS + 1):
+        transaction_decoded = generate_transaction_id(seller_id_token)
+        payload_json = json.dumps({
+            "items": items,
+            "total": data.get("total"),
+            "timestamp": data.get("timestamp"),
+            "delivery": delivery_payload,
+            "transaction_id": transaction_decoded,
+        })
+        encrypted = encrypt_data(payload_json)
+        signature, signature_alg, signature_key_id, integrity_valid = None, None, None, None
+        if not sign_async:
+            signature, signature_alg, signature_key_id = sign_payload(payload_json)
+            # Verified once here; read paths serve this stored verdict instead of re-verifying.
+            integrity_valid = verify_payload(payload_json, signature, signature_alg, signature_key_id) if signature else None
+
+        placed_at = datetime.utcnow()
+        order = Order(
+            user_id=user_id,
+            created_at=placed_at,
+            encrypted_data=encrypted,
+            order_signature=signature,
+            signature_alg=signature_alg,
+            signature_key_id=signature_key_id,
+            signature_pending=sign_async,
+            integrity_valid=integrity_valid,
+            integrity_checked_at=placed_at if signature else None,
+            transaction_id=base64_encode(transaction_decoded),
+            delivery_name=delivery_payload.get("name"),
+            delivery_phone=delivery_payload.get("phone"),
+            delivery_address_line1=delivery_payload.get("address_line1"),
+            delivery_address_line2=delivery_payload.get("address_line2"),
+            delivery_city=delivery_payload.get("city"),
+            delivery_state=delivery_payload.get("state"),
+            delivery_postal_code=delivery_payload.get("postal_code"),
+            delivery_country=delivery_payload.get("country"),
+        )
+
+        # Reserve as late as possible so the product row locks are held only
+        # for the inserts below, not while encrypting and signing. The savepoint
+        # lets a duplicate transaction id be retried without losing the
+        # caller's transaction (e.g. an Idempotency-Key claim).
+        try:
+            with db.session.begin_nested():
+                reserve_stock(items)
+                db.session.add(order)
+                order_items = record_order_items(order, items, product_map)
+                record_order_revenue(
+                    placed_at.date(),
+                    order_total(data),
+                    order_items,
+                    {pid: p.category for pid, p in product_map.items()},
+                )
+            break
+        except InsufficientStock as exc:
+            db.session.rollback()
+            if sign_async:
+                signer.release()
+            return error(str(exc), 400)
+        except IntegrityError as exc:
+            if attempt < TXN_ID_ATTEMPTS and is_duplicate_transaction_id(exc):
+                logger.warning(f"Duplicate transaction id {transaction_decoded}; retrying ({attempt}/{TXN_ID_ATTEMPTS})")
+                continue
+            db.session.rollback()
+            if sign_async:
+                signer.release()
+            raise
+    try:
+        db.session.commit()
+    except Exception:
+        if sign_async:
+            signer.release()
+        raise
+    if sign_async:
+        signer.submit(order.order_id, payload_json)
 
     log_activity(user_id, "Order Placed")
     return success("Order placed successfully", {
@@ -1,5 +1,5 @@
 import logging
-from database.models import db, Order
+from database.models import db, Order, OrderItem
 from datetime import datetime
 
 logger = logging.getLogger("order_service")
@@ -51,3 +51,41 @@ def get_order_by_id(order_id):
     except Exception as e:
         logger.error(f"Error fetching order by id {order_id}: {e}")
         return None
+
+def record_order_items(order, items, product_map):
+    """Attach denormalized order_items rows so seller lookups can skip decryption."""
+    rows = []
+    for item in items:
+        product = product_map.get(item.get("product_id"))
+        if product is None:
+            continue
+        rows.append(OrderItem(
+            order=order,
+            product_id=product.product_id,
+            seller_id=product.seller_id,
+            quantity=item.get("quantity") or 0,
+            unit_price=product.price,
+        ))
+    db.session.add_all(rows)
+    return rows
+
+def get_seller_order_products(seller_id):
+    """Map order_id -> product ids sold by this seller, read from the order_items index."""
+    rows = (
+        db.session.query(OrderItem.order_id, OrderItem.product_id)
+        .filter(OrderItem.seller_id == seller_id)
+        .all()
+    )
+    order_products = {}
+    for order_id, product_id in rows:
+        order_products.setdefault(order_id, set()).add(product_id)
+    return order_products
+
+def get_order_seller_products(order_id, seller_id):
+    """Product ids this seller sold in one order (empty when the seller is not involved)."""
+    rows = (
+        db.session.query(OrderItem.product_id)
+        .filter(OrderItem.order_id == order_id, OrderItem.seller_id == seller_id)
+        .all()
+    )
+    return {product_id for (product_id,) in rows}
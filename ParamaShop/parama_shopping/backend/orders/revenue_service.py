@@ -0,0 +1,117 @@
+import logging
+from collections import defaultdict
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+from database.models import db, RevenueDaily, RevenueDailySeller, RevenueDailyCategory
+
+logger = logging.getLogger("revenue_service")
+
+GROUPINGS = {
+    "day": (RevenueDaily, RevenueDaily.day),
+    "seller": (RevenueDailySeller, RevenueDailySeller.seller_id),
+    "category": (RevenueDailyCategory, RevenueDailyCategory.category),
+}
+
+
+def order_total(data):
+    try:
+        return float(data.get("total") or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _increment(model, keys, amounts):
+    """Add amounts to the rollup row identified by keys, creating it if needed."""
+    table = model.__table__
+    dialect = db.session.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = insert(table).values(**keys, **amounts)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={name: table.c[name] + stmt.excluded[name] for name in amounts},
+        )
+        db.session.execute(stmt)
+        return
+    row = db.session.get(model, tuple(keys.values()) if len(keys) > 1 else next(iter(keys.values())))
+    if row is None:
+        db.session.add(model(**keys, **amounts))
+    else:
+        for name, amount in amounts.items():
+            setattr(row, name, (getattr(row, name) or 0) + amount)
+
+
+def record_order_revenue(day, total, order_items, categories):
+    """Fold one order into the daily rollups. Runs inside the caller's transaction.
+
+    order_items are OrderItem rows; categories maps product_id -> category.
+    """
+    by_seller = defaultdict(lambda: [0, 0.0])
+    by_category = defaultdict(lambda: [0, 0.0])
+    for item in order_items:
+        quantity = item.quantity or 0
+        amount = quantity * (item.unit_price or 0)
+        if item.seller_id is not None:
+            by_seller[item.seller_id][0] += quantity
+            by_seller[item.seller_id][1] += amount
+        category = categories.get(item.product_id) or "General"
+        by_category[category][0] += quantity
+        by_category[category][1] += amount
+
+    _increment(RevenueDaily, {"day": day}, {"order_count": 1, "revenue": total})
+    for seller_id, (quantity, amount) in by_seller.items():
+        _increment(
+            RevenueDailySeller,
+            {"day": day, "seller_id": seller_id},
+            {"order_count": 1, "items_sold": quantity, "revenue": amount},
+        )
+    for category, (quantity, amount) in by_category.items():
+        _increment(
+            RevenueDailyCategory,
+            {"day": day, "category": category},
+            {"order_count": 1, "items_sold": quantity, "revenue": amount},
+        )
+
+
+def _in_range(query, model, start, end):
+    if start is not None:
+        query = query.filter(model.day >= start)
+    if end is not None:
+        query = query.filter(model.day <= end)
+    return query
+
+
+def get_revenue_summary(start=None, end=None, group_by=None):
+    """Totals (and optional breakdown) for the inclusive [start, end] day range."""
+    total_revenue, order_count = _in_range(
+        db.session.query(
+            func.coalesce(func.sum(RevenueDaily.revenue), 0),
+            func.coalesce(func.sum(RevenueDaily.order_count), 0),
+        ),
+        RevenueDaily,
+        start,
+        end,
+    ).one()
+    summary = {
+        "total_revenue": float(total_revenue),
+        "order_count": int(order_count),
+    }
+    if group_by:
+        model, key = GROUPINGS[group_by]
+        columns = [key, func.sum(model.order_count), func.sum(model.revenue)]
+        if model is not RevenueDaily:
+            columns.append(func.sum(model.items_sold))
+        rows = _in_range(db.session.query(*columns), model, start, end).group_by(key).order_by(key).all()
+        groups = []
+        for row in rows:
+            group = {
+                group_by: row[0].isoformat() if group_by == "day" else row[0],
+                "order_count": int(row[1] or 0),
+                "revenue": float(row[2] or 0),
+            }
+            if len(row) > 3:
+                group["items_sold"] = int(row[3] or 0)
+            groups.append(group)
+        summary["group_by"] = group_by
+        summary["groups"] = groups
+    return summary
@@ -0,0 +1,205 @@
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+import zlib
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import insert, update
+from sqlalchemy.exc import IntegrityError
+
+logger = logging.getLogger("transaction_ids")
+
+# Snowflake layout for the numeric part of TXN-<seller>-<date>-<n>:
+# 41 bits of milliseconds since EPOCH_MS | 10 bits node | 12 bits sequence.
+EPOCH_MS = 1767225600000  # 2026-01-01T00:00:00Z
+NODE_BITS = 10
+SEQUENCE_BITS = 12
+MAX_NODE = (1 << NODE_BITS) - 1
+MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+# A leased node id is renewed once less than half of this is left.
+DEFAULT_LEASE_SECONDS = 300
+
+
+def default_node_id():
+    """Node id hashed from hostname and pid. Collisions are likely with a few dozen
+    processes, so this is only a development fallback and a starting point for leases."""
+    return zlib.crc32(f"{socket.gethostname()}:{os.getpid()}".encode()) & MAX_NODE
+
+
+class NodeLease:
+    """Node id leased from transaction_node_leases, so every live process holds a distinct one.
+
+    The lease is renewed once less than half of ttl remains; if it was lost
+    (e.g. the process stalled past expiry and another took the id) a new free
+    id is leased. Lease writes use their own connection, not the request session.
+    """
+
+    def __init__(self, engine, ttl_seconds=DEFAULT_LEASE_SECONDS):
+        from database.models import TransactionNodeLease
+
+        self.table = TransactionNodeLease.__table__
+        self.engine = engine
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.holder = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.node_id = None
+        self.expires_at = None
+
+    def current(self):
+        now = datetime.utcnow()
+        if self.node_id is not None and now < self.expires_at - self.ttl / 2:
+            return self.node_id
+        if self.node_id is not None and self._renew(now):
+            return self.node_id
+        self._acquire(now)
+        return self.node_id
+
+    def _renew(self, now):
+        with self.engine.begin() as conn:
+            renewed = conn.execute(
+                update(self.table)
+                .where(self.table.c.node_id == self.node_id, self.table.c.holder == self.holder)
+                .values(expires_at=now + self.ttl)
+            ).rowcount
+        if renewed:
+            self.expires_at = now + self.ttl
+            return True
+        logger.warning(f"Transaction node id {self.node_id} lease was lost; leasing a new one")
+        return False
+
+    def _acquire(self, now):
+        values = {"holder": self.holder, "expires_at": now + self.ttl}
+        with self.engine.connect() as conn:
+            live = {row[0] for row in conn.execute(
+                self.table.select().with_only_columns(self.table.c.node_id).where(self.table.c.expires_at >= now)
+            )}
+        start = default_node_id()
+        for offset in range(MAX_NODE + 1):
+            candidate = (start + offset) & MAX_NODE
+            if candidate in live:
+                continue
+            with self.engine.begin() as conn:
+                claimed = conn.execute(
+                    update(self.table)
+                    .where(self.table.c.node_id == candidate, self.table.c.expires_at < now)
+                    .values(**values)
+                ).rowcount
+            if not claimed:
+                try:
+                    with self.engine.begin() as conn:
+                        conn.execute(insert(self.table).values(node_id=candidate, **values))
+                except IntegrityError:
+                    continue  # live row, or another process inserted it first
+            self.node_id = candidate
+            self.expires_at = values["expires_at"]
+            logger.info(f"Leased transaction node id {candidate} for {self.holder}")
+            return
+        raise RuntimeError("No free transaction node id: all 1024 are leased")
+
+
+class TransactionIdGenerator:
+    """Lock-protected time + node + counter generator; ids are unique without any database lookup."""
+
+    def __init__(self, node_id=None, clock=None):
+        self.node_id = (default_node_id() if node_id is None else node_id) & MAX_NODE
+        self._clock = clock or (lambda: int(time.time() * 1000))
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._sequence = 0
+
+    def next_value(self):
+        """Return (n, millis) where millis is the timestamp encoded in n."""
+        with self._lock:
+            now = max(self._clock(), self._last_ms)  # never step backwards with the wall clock
+            if now == self._last_ms:
+                self._sequence = (self._sequence + 1) & MAX_SEQUENCE
+                if self._sequence == 0:
+                    # Sequence exhausted within this millisecond; wait for the next one.
+                    while now <= self._last_ms:
+                        time.sleep(0.0001)
+                        now = self._clock()
+            else:
+                self._sequence = 0
+            self._last_ms = now
+            value = ((now - EPOCH_MS) << (NODE_BITS + SEQUENCE_BITS)) | (self.node_id << SEQUENCE_BITS) | self._sequence
+            return value, now
+
+    def next_id(self, seller_token):
+        value, millis = self.next_value()
+        date_str = datetime.utcfromtimestamp(millis / 1000).strftime("%Y%m%d")
+        return f"TXN-{seller_token}-{date_str}-{value}"
+
+
+_generator = None
+_generator_lock = threading.Lock()
+# TXN_NODE_ID as applied by init_transaction_ids: an int, "lease", or None (hashed fallback).
+_node_setting = None
+_lease = None
+
+
+def _reset_after_fork():
+    # A forked worker must not reuse its parent's node id, lease or sequence.
+    global _generator, _generator_lock, _lease
+    _generator = None
+    _generator_lock = threading.Lock()
+    _lease = None
+
+
+def parse_node_setting(value):
+    """TXN_NODE_ID as an int in 0..1023, "lease", or None when unset."""
+    if value in (None, ""):
+        return None
+    if isinstance(value, str) and value.strip().lower() == "lease":
+        return "lease"
+    node_id = int(value)
+    if not 0 <= node_id <= MAX_NODE:
+        raise ValueError(f"TXN_NODE_ID must be between 0 and {MAX_NODE} or 'lease'")
+    return node_id
+
+
+def init_transaction_ids(app):
+    """Apply TXN_NODE_ID; refuse to start in production without one.
+
+    A fixed id must be unique per process, so multi-worker servers should use
+    TXN_NODE_ID=lease. Unset, development falls back to a hashed node id.
+    """
+    global _node_setting, _generator
+    setting = parse_node_setting(app.config.get("TXN_NODE_ID"))
+    if setting is None:
+        if app.config.get("APP_ENV") == "production":
+            raise RuntimeError("TXN_NODE_ID must be set in production (an id 0-1023 unique per process, or 'lease')")
+        logger.warning("TXN_NODE_ID not set; using a hashed node id (may collide across processes)")
+    _node_setting = setting
+    _generator = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def generate_transaction_id(seller_token):
+    """Next TXN-<seller>-<YYYYMMDD>-<n> id for this process. Lease mode needs an app context."""
+    global _generator, _lease
+    if _node_setting == "lease":
+        from database.models import db
+
+        with _generator_lock:
+            if _lease is None:
+                _lease = NodeLease(db.engine, current_app.config.get("TXN_NODE_LEASE_SECONDS", DEFAULT_LEASE_SECONDS))
+            if _generator is None:
+                _generator = TransactionIdGenerator(node_id=0)
+            # Checked and applied under the lock so no id is minted with a lost lease.
+            _generator.node_id = _lease.current()
+            return _generator.next_id(seller_token)
+    if _generator is None:
+        with _generator_lock:
+            if _generator is None:
+                _generator = TransactionIdGenerator(node_id=_node_setting)
+    return _generator.next_id(seller_token)
+
+
+def is_duplicate_transaction_id(exc):
+    """True when an IntegrityError came from the orders.transaction_id unique index."""
+    return "transaction_id" in str(getattr(exc, "orig", exc))
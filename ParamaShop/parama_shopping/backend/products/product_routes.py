@@ -3,41 +3,123 @@ import logging
 from flask_jwt_extended import jwt_required
 from database.models import db, Product, SellerProfile
 from middleware.role_middleware import role_required
+from middleware.principal import current_principal
 from utils.response_handler import success, error
 from logs.activity_logger import log_activity
-from products.product_service import get_all_products
+from products.product_service import get_all_products, get_products_page
+from products.product_search import search_catalog
+from utils.pagination import parse_limit
 
 product_bp = Blueprint("product", __name__)
 
+PAGE_PARAMS = ("limit", "cursor", "category", "seller_id", "min_price", "max_price", "in_stock")
+
+
+def _shop_names(products):
+    seller_ids = {p.seller_id for p in products if p.seller_id is not None}
+    if not seller_ids:
+        return {}
+    return {
+        sp.user_id: sp.shop_name
+        for sp in SellerProfile.query.filter(SellerProfile.user_id.in_(seller_ids)).all()
+    }
+
+
+def _product_payload(p, shop_name):
+    return {
+        "product_id": p.product_id,
+        "name": p.product_name,
+        "description": p.description,
+        "category": p.category,
+        "price": p.price,
+        "stock": p.stock,
+        "seller_id": p.seller_id,
+        "shop_name": shop_name
+    }
+
+
+def _catalog_field_error(data, partial=False):
+    """Message for a missing/invalid category or price (both catalog sort keys), else None."""
+    if "category" in data and (not isinstance(data["category"], str) or not data["category"].strip()):
+        return "category must be a non-empty string"
+    if partial and "price" not in data:
+        return None
+    price = data.get("price")
+    if isinstance(price, bool) or not isinstance(price, (int, float)) or price < 0:
+        return "price must be a non-negative number"
+    return None
+
+
+def _optional(args, name, cast):
+    value = args.get(name)
+    if value in (None, ""):
+        return None
+    return cast(value)
+
+
 # View all products
 @product_bp.route("/all", methods=["GET"])
 def view_all_products():
-    products = get_all_products()
-    seller_ids = {p.seller_id for p in products if p.seller_id is not None}
-    seller_profiles = {}
-    if seller_ids:
-        seller_profiles = {
-            sp.user_id: sp.shop_name
-            for sp in SellerProfile.query.filter(SellerProfile.user_id.in_(seller_ids)).all()
-        }
-    return success("Products fetched", [
-        {
-            "product_id": p.product_id,
-            "name": p.product_name,
-            "description": p.description,
-            "category": p.category,
-            "price": p.price,
-            "stock": p.stock,
-            "seller_id": p.seller_id,
-            "shop_name": seller_profiles.get(p.seller_id)
-        } for p in products
-    ])
+    args = request.args
+    if not any(name in args for name in PAGE_PARAMS):
+        products = get_all_products()
+        seller_profiles = _shop_names(products)
+        return success("Products fetched", [
+            _product_payload(p, seller_profiles.get(p.seller_id)) for p in products
+        ])
+
+    try:
+        products, next_cursor = get_products_page(
+            limit=parse_limit(args.get("limit")),
+            cursor=args.get("cursor") or None,
+            category=args.get("category") or None,
+            seller_id=_optional(args, "seller_id", int),
+            min_price=_optional(args, "min_price", float),
+            max_price=_optional(args, "max_price", float),
+            in_stock=(args.get("in_stock") or "").lower() in ("1", "true", "yes"),
+        )
+    except ValueError as exc:
+        return error(f"Invalid query parameter: {exc}", 400)
+    seller_profiles = _shop_names(products)
+    return success("Products fetched", {
+        "items": [_product_payload(p, seller_profiles.get(p.seller_id)) for p in products],
+        "next_cursor": next_cursor,
+    })
+
+@product_bp.route("/search", methods=["GET"])
+def search_products():
+    query = (request.args.get("q") or "").strip()
+    if not query:
+        return error("Search query is required", 400)
+    try:
+        limit = parse_limit(request.args.get("limit"))
+        page = int(request.args.get("page") or 1)
+        if page <= 0:
+            raise ValueError("page must be positive")
+    except ValueError as exc:
+        return error(f"Invalid query parameter: {exc}", 400)
+    results = search_catalog(query, offset=(page - 1) * limit, limit=limit + 1)
+    has_more = len(results) > limit
+    results = results[:limit]
+    seller_profiles = _shop_names([p for p, _ in results])
+    return success("Products found", {
+        "items": [
+            dict(_product_payload(p, seller_profiles.get(p.seller_id)), score=round(score, 6))
+            for p, score in results
+        ],
+        "page": page,
+        "limit": limit,
+        "has_more": has_more,
+    })
 
 @product_bp.route("/add", methods=["POST"])
 @jwt_required()
 @role_required("SELLER")
 def add_product(user_id):
     data = request.json
+    invalid = _catalog_field_error(data)
+    if invalid:
+        return error(invalid, 400)
 
     product = Product(
         seller_id=user_id,
@@ -62,20 +144,8 @@ def my_products(user_id):
     if isinstance(user_id, str) and user_id.isdigit():
         user_id = int(user_id)
     products = Product.query.filter_by(seller_id=user_id).all()
-    profile = SellerProfile.query.filter_by(user_id=user_id).first()
-    shop_name = profile.shop_name if profile else None
-    return success("Products fetched", [
-        {
-            "product_id": p.product_id,
-            "name": p.product_name,
-            "description": p.description,
-            "category": p.category,
-            "price": p.price,
-            "stock": p.stock,
-            "seller_id": p.seller_id,
-            "shop_name": shop_name
-        } for p in products
-    ])
+    shop_name = current_principal().shop_name
+    return success("Products fetched", [_product_payload(p, shop_name) for p in products])
 
 
 @product_bp.route("/update/<int:product_id>", methods=["PUT"])
@@ -100,6 +170,9 @@ def update_product(user_id, product_id):
             product.seller_id,
         )
         return error("Not allowed to update this product", 403)
+    invalid = _catalog_field_error(data, partial=True)
+    if invalid:
+        return error(invalid, 400)
     product.product_name = data.get("name", product.product_name)
     product.description = data.get("description", product.description)
     product.category = data.get("category", product.category)
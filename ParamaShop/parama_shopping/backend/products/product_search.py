@@ -0,0 +1,151 @@
+import logging
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from sqlalchemy import event, func, literal_column
+from database.models import db, Product
+
+logger = logging.getLogger("product_search")
+
+# Same A/B/C weighting the PostgreSQL trigger uses for setweight().
+FIELD_WEIGHTS = {
+    "product_name": 1.0,
+    "category": 0.4,
+    "description": 0.2,
+}
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    return TOKEN_RE.findall((text or "").lower())
+
+
+class InvertedIndex:
+    """In-process full-text index used when the database has no tsvector support (SQLite)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings = defaultdict(dict)  # term -> {product_id: weighted tf}
+        self._docs = {}                     # product_id -> set of terms
+        self._built = False
+        self._stale_ids = set()
+
+    def mark_stale(self, product_id):
+        with self._lock:
+            self._stale_ids.add(product_id)
+
+    def reset(self):
+        with self._lock:
+            self._postings.clear()
+            self._docs.clear()
+            self._stale_ids.clear()
+            self._built = False
+
+    def _remove(self, product_id):
+        for term in self._docs.pop(product_id, ()):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(product_id, None)
+                if not postings:
+                    del self._postings[term]
+
+    def _add(self, product):
+        self._remove(product.product_id)
+        weights = Counter()
+        for field, weight in FIELD_WEIGHTS.items():
+            for term in tokenize(getattr(product, field, None)):
+                weights[term] += weight
+        for term, weight in weights.items():
+            self._postings[term][product.product_id] = weight
+        self._docs[product.product_id] = set(weights)
+
+    def _sync(self):
+        # Callers hold the lock. Stale ids are re-read rather than trusting the
+        # flushed ORM state, so rolled-back writes never leak into the index.
+        if not self._built:
+            for product in Product.query.all():
+                self._add(product)
+            self._built = True
+            self._stale_ids.clear()
+            return
+        if not self._stale_ids:
+            return
+        stale = set(self._stale_ids)
+        self._stale_ids.clear()
+        found = Product.query.filter(Product.product_id.in_(stale)).all()
+        for product in found:
+            self._add(product)
+        for product_id in stale - {p.product_id for p in found}:
+            self._remove(product_id)
+
+    def search(self, query, offset, limit):
+        """Return [(product_id, score)] for products matching every query term, best first."""
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+        with self._lock:
+            self._sync()
+            candidates = None
+            for term in terms:
+                ids = set(self._postings.get(term, ()))
+                candidates = ids if candidates is None else candidates & ids
+                if not candidates:
+                    return []
+            total_docs = max(len(self._docs), 1)
+            scores = {}
+            for product_id in candidates:
+                score = 0.0
+                for term in terms:
+                    postings = self._postings[term]
+                    idf = math.log(1 + total_docs / len(postings))
+                    score += postings[product_id] * idf
+                scores[product_id] = score
+        ranked = sorted(scores.items(), key=lambda pair: (-pair[1], pair[0]))
+        return ranked[offset:offset + limit]
+
+
+_fallback_index = InvertedIndex()
+
+
+@event.listens_for(Product, "after_insert")
+@event.listens_for(Product, "after_update")
+@event.listens_for(Product, "after_delete")
+def _product_changed(mapper, connection, target):
+    _fallback_index.mark_stale(target.product_id)
+
+
+def _search_postgres(query, offset, limit):
+    ts_query = func.websearch_to_tsquery("english", query)
+    vector = literal_column("products.search_vector")
+    rank = func.ts_rank(vector, ts_query).label("rank")
+    rows = (
+        db.session.query(Product, rank)
+        .filter(vector.op("@@")(ts_query))
+        .order_by(rank.desc(), Product.product_id)
+        .offset(offset)
+        .limit(limit)
+        .all()
+    )
+    return [(product, float(score)) for product, score in rows]
+
+
+def _search_fallback(query, offset, limit):
+    ranked = _fallback_index.search(query, offset, limit)
+    if not ranked:
+        return []
+    products = {
+        p.product_id: p
+        for p in Product.query.filter(Product.product_id.in_([pid for pid, _ in ranked])).all()
+    }
+    return [(products[pid], score) for pid, score in ranked if pid in products]
+
+
+def search_catalog(query, offset=0, limit=20):
+    """Relevance-ranked product search; returns [(product, score)]."""
+    query = (query or "").strip()
+    if not query:
+        return []
+    if db.engine.dialect.name == "postgresql":
+        return _search_postgres(query, offset, limit)
+    return _search_fallback(query, offset, limit)
@@ -1,15 +1,20 @@
 import logging
+from sqlalchemy import tuple_
 from database.models import db, Product
+from utils.pagination import encode_cursor, decode_cursor
 
 logger = logging.getLogger("product_service")
 
+# JSON types of the (category, price, product_id) values in a catalog cursor.
+CURSOR_TYPES = (str, (int, float), int)
+
 def create_product(seller_id, name, description, price, stock):
     try:
         product = Product(
             seller_id=seller_id,
             product_name=name,
             description=description,
-            category=None,
+            category="General",
             price=price,
             stock=stock
         )
@@ -27,6 +32,10 @@ def update_product(product_id, data):
         if not product:
             logger.warning(f"Product not found for update: {product_id}")
             return None
+        # category and price are catalog sort keys and must never be NULL.
+        if ("category" in data and not data["category"]) or ("price" in data and data["price"] is None):
+            logger.warning(f"Rejected empty category/price update for product {product_id}")
+            return None
         product.product_name = data.get("name", product.product_name)
         product.description = data.get("description", product.description)
         if "category" in data:
@@ -73,9 +82,10 @@ def get_products_by_seller(seller_id):
         logger.error(f"Error fetching products for seller {seller_id}: {e}")
         return []
 
-def search_products(query):
+def search_products(query, offset=0, limit=20):
     try:
-        products = Product.query.filter(Product.product_name.ilike(f"%{query}%")).all()
+        from products.product_search import search_catalog
+        products = [product for product, _ in search_catalog(query, offset, limit)]
         logger.info(f"Products searched with query: {query}")
         return products
     except Exception as e:
@@ -90,3 +100,33 @@ def get_all_products():
     except Exception as e:
         logger.error(f"Error fetching all products: {e}")
         return []
+
+def get_products_page(limit, cursor=None, category=None, seller_id=None,
+                      min_price=None, max_price=None, in_stock=False):
+    """Keyset page over (category, price, product_id); returns (products, next_cursor).
+
+    All three sort columns are NOT NULL, so the row-value comparison never
+    drops rows. Raises ValueError for a malformed cursor.
+    """
+    sort_key = (Product.category, Product.price, Product.product_id)
+    query = Product.query
+    if category:
+        query = query.filter(Product.category == category)
+    if seller_id is not None:
+        query = query.filter(Product.seller_id == seller_id)
+    if min_price is not None:
+        query = query.filter(Product.price >= min_price)
+    if max_price is not None:
+        query = query.filter(Product.price <= max_price)
+    if in_stock:
+        query = query.filter(Product.stock > 0)
+    if cursor:
+        query = query.filter(tuple_(*sort_key) > tuple_(*decode_cursor(cursor, len(sort_key), CURSOR_TYPES)))
+    products = query.order_by(*sort_key).limit(limit + 1).all()
+    next_cursor = None
+    if len(products) > limit:
+        products = products[:limit]
+        last = products[-1]
+        next_cursor = encode_cursor([last.category, last.price, last.product_id])
+    logger.info(f"Products page fetched: {len(products)} rows")
+    return products, next_cursor
@@ -0,0 +1,174 @@
+import logging
+import os
+import threading
+from cryptography.fernet import Fernet, InvalidToken, MultiFernet
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from security.key_files import load_or_create_private_key, publish_file
+from security.signers import (
+    RSAPSSSigner,
+    Ed25519Signer,
+    SignerRegistry,
+    RSA_PSS_SHA256,
+    ED25519,
+    load_or_generate_ed25519,
+)
+
+logger = logging.getLogger("crypto_context")
+
+MODULE_KEY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "keys")
+# Older deployments resolved "backend/security/keys" against the working directory.
+LEGACY_KEY_DIR = os.path.join("backend", "security", "keys")
+
+
+def resolve_key_dir(configured=None):
+    """RSA_KEY_DIR when set; otherwise the first of security/keys or the legacy CWD-relative dir holding keys."""
+    if configured:
+        return os.path.abspath(configured)
+    for candidate in (MODULE_KEY_DIR, os.path.abspath(LEGACY_KEY_DIR)):
+        if os.path.exists(os.path.join(candidate, "private_key.pem")):
+            return candidate
+    return MODULE_KEY_DIR
+
+
+def load_or_generate_rsa(key_dir):
+    """(private_key, public_key) from key_dir, generating the pair on first boot.
+
+    private_key.pem is the source of truth and is created atomically, so workers
+    booting together agree on one key; public_key.pem is derived from it.
+    """
+    private_path = os.path.join(key_dir, "private_key.pem")
+    public_path = os.path.join(key_dir, "public_key.pem")
+    private_key, created = load_or_create_private_key(
+        private_path,
+        lambda: rsa.generate_private_key(public_exponent=65537, key_size=2048),
+    )
+    public_key = private_key.public_key()
+    if not os.path.exists(public_path):
+        publish_file(public_path, public_key.public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo
+        ), mode=0o644)
+    logger.info(f"RSA keys {'generated and saved to' if created else 'loaded from'} {key_dir}.")
+    return private_key, public_key
+
+
+class CryptoContext:
+    """Keys, ciphers and signers loaded once and shared by every crypto call.
+
+    fernet_keys is ordered newest first: the first key encrypts, all of them decrypt.
+    """
+
+    def __init__(self, fernet_keys, rsa_private_key, rsa_public_key, ed25519_private_key=None,
+                 signature_algorithm=RSA_PSS_SHA256, key_dir=None):
+        if not fernet_keys:
+            raise ValueError("ENCRYPTION_KEY not found in environment variables.")
+        self.fernet_keys = list(fernet_keys)
+        self.primary_fernet = Fernet(self.fernet_keys[0])
+        self.fernet = MultiFernet([self.primary_fernet] + [Fernet(key) for key in self.fernet_keys[1:]])
+        self.key_dir = key_dir
+        self.rsa_private_key = rsa_private_key
+        self.rsa_public_key = rsa_public_key
+        signers = [RSAPSSSigner(rsa_private_key, rsa_public_key)]
+        if ed25519_private_key is not None:
+            signers.append(Ed25519Signer(ed25519_private_key))
+        self.signers = SignerRegistry(signers, signature_algorithm)
+        self.rsa = signers[0]
+
+    @classmethod
+    def from_config(cls, config):
+        """Build from a Flask config (or any mapping with .get), reading keys from disk once."""
+        keys = [config.get("ENCRYPTION_KEY")] + list(config.get("ENCRYPTION_OLD_KEYS") or [])
+        key_dir = resolve_key_dir(config.get("RSA_KEY_DIR"))
+        private_key, public_key = load_or_generate_rsa(key_dir)
+        algorithm = config.get("ORDER_SIGNATURE_ALG") or RSA_PSS_SHA256
+        # The Ed25519 key is created only when it signs; an existing one is
+        # still loaded so orders signed with it keep verifying.
+        return cls(
+            [key for key in keys if key],
+            private_key,
+            public_key,
+            ed25519_private_key=load_or_generate_ed25519(key_dir, generate=algorithm == ED25519),
+            signature_algorithm=algorithm,
+            key_dir=key_dir,
+        )
+
+    def encrypt(self, text):
+        return self.fernet.encrypt(text.encode()).decode()
+
+    def decrypt(self, token):
+        return self.fernet.decrypt(token.encode()).decode()
+
+    def encrypt_many(self, texts):
+        encrypt = self.fernet.encrypt
+        return [encrypt(text.encode()).decode() for text in texts]
+
+    def decrypt_many(self, tokens):
+        decrypt = self.fernet.decrypt
+        return [decrypt(token.encode()).decode() for token in tokens]
+
+    def is_current(self, token):
+        """True when token is already encrypted under the primary key (a failed HMAC check is cheap)."""
+        try:
+            self.primary_fernet.decrypt(token.encode())
+            return True
+        except InvalidToken:
+            return False
+
+    def rotate(self, token):
+        """Re-encrypt token under the primary key, keeping its original timestamp."""
+        return self.fernet.rotate(token.encode()).decode()
+
+    def sign(self, text):
+        """(signature_b64, algorithm, key_id) from the active signer."""
+        return self.signers.sign(text)
+
+    def verify(self, text, signature_b64, algorithm=None, key_id=None):
+        return self.signers.verify(text, signature_b64, algorithm, key_id)
+
+    def verify_many(self, items):
+        """items are (text, signature_b64, algorithm, key_id) tuples; returns a list of bools."""
+        verify = self.signers.verify
+        return [verify(text, signature, algorithm, key_id) for text, signature, algorithm, key_id in items]
+
+
+_context = None
+_context_lock = threading.Lock()
+
+
+def _config_from_env():
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    old_keys = os.environ.get("ENCRYPTION_OLD_KEYS", "")
+    return {
+        "ENCRYPTION_KEY": os.environ.get("ENCRYPTION_KEY"),
+        "ENCRYPTION_OLD_KEYS": [key.strip() for key in old_keys.split(",") if key.strip()],
+        "RSA_KEY_DIR": os.environ.get("RSA_KEY_DIR"),
+        "ORDER_SIGNATURE_ALG": os.environ.get("ORDER_SIGNATURE_ALG"),
+    }
+
+
+def init_crypto_context(app):
+    """Build the process-wide context from app.config; create_app calls this once."""
+    global _context
+    with _context_lock:
+        _context = CryptoContext.from_config(app.config)
+    app.extensions["crypto_context"] = _context
+    return _context
+
+
+def set_crypto_context(context):
+    global _context
+    with _context_lock:
+        _context = context
+
+
+def get_crypto_context():
+    """The context built by create_app, or one built from the environment for scripts and worker processes."""
+    global _context
+    if _context is None:
+        with _context_lock:
+            if _context is None:
+                _context = CryptoContext.from_config(_config_from_env())
+    return _context
@@ -1,94 +1,37 @@
 import logging
-import os
 import base64
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.asymmetric import rsa, padding
+import time
 from cryptography.hazmat.primitives import serialization
-from cryptography.exceptions import InvalidSignature
+from security.crypto_context import get_crypto_context
+from utils.metrics import operation_metrics
 
 logger = logging.getLogger("digital_signature")
 
-KEY_DIR = os.getenv("RSA_KEY_DIR", "backend/security/keys")
-PRIVATE_KEY_PATH = os.path.join(KEY_DIR, "private_key.pem")
-PUBLIC_KEY_PATH = os.path.join(KEY_DIR, "public_key.pem")
-
-def load_or_generate_keys():
-    if not os.path.exists(KEY_DIR):
-        os.makedirs(KEY_DIR)
-    private_key = None
-    public_key = None
-    if os.path.exists(PRIVATE_KEY_PATH) and os.path.exists(PUBLIC_KEY_PATH):
-        try:
-            with open(PRIVATE_KEY_PATH, "rb") as pk_file:
-                private_key = serialization.load_pem_private_key(pk_file.read(), password=None)
-            with open(PUBLIC_KEY_PATH, "rb") as pub_file:
-                public_key = serialization.load_pem_public_key(pub_file.read())
-            logger.info("RSA keys loaded from disk.")
-        except Exception as e:
-            logger.error(f"Error loading RSA keys: {e}")
-    else:
-        try:
-            private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
-            public_key = private_key.public_key()
-            with open(PRIVATE_KEY_PATH, "wb") as pk_file:
-                pk_file.write(private_key.private_bytes(
-                    encoding=serialization.Encoding.PEM,
-                    format=serialization.PrivateFormat.TraditionalOpenSSL,
-                    encryption_algorithm=serialization.NoEncryption()
-                ))
-            with open(PUBLIC_KEY_PATH, "wb") as pub_file:
-                pub_file.write(public_key.public_bytes(
-                    encoding=serialization.Encoding.PEM,
-                    format=serialization.PublicFormat.SubjectPublicKeyInfo
-                ))
-            logger.info("RSA keys generated and saved to disk.")
-        except Exception as e:
-            logger.error(f"Error generating/saving RSA keys: {e}")
-    return private_key, public_key
-
-private_key, public_key = load_or_generate_keys()
-
 def sign_order(order_data: str) -> bytes:
+    started = time.perf_counter()
     try:
-        if not private_key:
-            logger.error("Private key not available for signing.")
-            return b""
-        signature = private_key.sign(
-            order_data.encode(),
-            padding.PSS(
-                mgf=padding.MGF1(hashes.SHA256()),
-                salt_length=padding.PSS.MAX_LENGTH
-            ),
-            hashes.SHA256()
-        )
-        logger.info("Order signed successfully.")
-        return signature
+        signature = get_crypto_context().rsa.sign(order_data.encode())
     except Exception as e:
+        operation_metrics.record("rsa_sign", started, error=True)
         logger.error(f"Error signing order: {e}")
         return b""
+    if operation_metrics.record("rsa_sign", started, len(order_data)):
+        logger.debug("Order signed successfully (sampled).")
+    return signature
 
 def verify_order_signature(order_data: str, signature: bytes) -> bool:
+    started = time.perf_counter()
     try:
-        if not public_key:
-            logger.error("Public key not available for verification.")
-            return False
-        public_key.verify(
-            signature,
-            order_data.encode(),
-            padding.PSS(
-                mgf=padding.MGF1(hashes.SHA256()),
-                salt_length=padding.PSS.MAX_LENGTH
-            ),
-            hashes.SHA256()
-        )
-        logger.info("Order signature verified successfully.")
-        return True
-    except InvalidSignature:
-        logger.warning("Invalid signature detected.")
-        return False
+        valid = get_crypto_context().rsa.verify(order_data.encode(), signature)
     except Exception as e:
+        operation_metrics.record("rsa_verify", started, error=True)
         logger.error(f"Error verifying order signature: {e}")
         return False
+    if operation_metrics.record("rsa_verify", started, len(order_data)):
+        logger.debug("Order signature verified (sampled).")
+    if not valid:
+        logger.warning("Invalid signature detected.")
+    return valid
 
 def sign_text_base64(data: str) -> str:
     signature = sign_order(data)
@@ -105,10 +48,7 @@ def verify_text_base64(data: str, signature_b64: str) -> bool:
 
 def export_public_key() -> str:
     try:
-        if not public_key:
-            logger.error("Public key not available for export.")
-            return ""
-        pem = public_key.public_bytes(
+        pem = get_crypto_context().rsa_public_key.public_bytes(
             encoding=serialization.Encoding.PEM,
             format=serialization.PublicFormat.SubjectPublicKeyInfo
         )
@@ -1,59 +1,40 @@
 import base64
 import binascii
 import logging
+import time
+from utils.metrics import operation_metrics
 
 logger = logging.getLogger("encoding_utils")
 
-def base64_encode(data: str) -> str:
+# These run several times per order row, so successes are counted in
+# utils.metrics (and logged at DEBUG for a sample of calls) rather than at INFO.
+
+def _convert(operation, transform, data):
+    started = time.perf_counter()
     try:
-        encoded = base64.b64encode(data.encode()).decode()
-        logger.info("Base64 encoding successful.")
-        return encoded
+        converted = transform(data.encode()).decode()
     except Exception as e:
-        logger.error(f"Error in base64_encode: {e}")
+        operation_metrics.record(operation, started, error=True)
+        logger.error(f"Error in {operation}: {e}")
         return ""
+    if operation_metrics.record(operation, started, len(data)):
+        logger.debug(f"{operation} successful (sampled).")
+    return converted
+
+def base64_encode(data: str) -> str:
+    return _convert("base64_encode", base64.b64encode, data)
 
 def base64_decode(data: str) -> str:
-    try:
-        decoded = base64.b64decode(data.encode()).decode()
-        logger.info("Base64 decoding successful.")
-        return decoded
-    except Exception as e:
-        logger.error(f"Error in base64_decode: {e}")
-        return ""
+    return _convert("base64_decode", base64.b64decode, data)
 
 def hex_encode(data: str) -> str:
-    try:
-        encoded = binascii.hexlify(data.encode()).decode()
-        logger.info("Hex encoding successful.")
-        return encoded
-    except Exception as e:
-        logger.error(f"Error in hex_encode: {e}")
-        return ""
+    return _convert("hex_encode", binascii.hexlify, data)
 
 def hex_decode(data: str) -> str:
-    try:
-        decoded = binascii.unhexlify(data.encode()).decode()
-        logger.info("Hex decoding successful.")
-        return decoded
-    except Exception as e:
-        logger.error(f"Error in hex_decode: {e}")
-        return ""
+    return _convert("hex_decode", binascii.unhexlify, data)
 
 def urlsafe_base64_encode(data: str) -> str:
-    try:
-        encoded = base64.urlsafe_b64encode(data.encode()).decode()
-        logger.info("URL-safe Base64 encoding successful.")
-        return encoded
-    except Exception as e:
-        logger.error(f"Error in urlsafe_base64_encode: {e}")
-        return ""
+    return _convert("urlsafe_base64_encode", base64.urlsafe_b64encode, data)
 
 def urlsafe_base64_decode(data: str) -> str:
-    try:
-        decoded = base64.urlsafe_b64decode(data.encode()).decode()
-        logger.info("URL-safe Base64 decoding successful.")
-        return decoded
-    except Exception as e:
-        logger.error(f"Error in urlsafe_base64_decode: {e}")
-        return ""
+    return _convert("urlsafe_base64_decode", base64.urlsafe_b64decode, data)
@@ -1,17 +1,26 @@
-import os
-from cryptography.fernet import Fernet
-from dotenv import load_dotenv
+import time
+from security.crypto_context import get_crypto_context
+from utils.metrics import operation_metrics
 
-load_dotenv()
-
-key = os.getenv("ENCRYPTION_KEY")
-if not key:
-    raise ValueError("ENCRYPTION_KEY not found in environment variables.")
-
-cipher = Fernet(key)
+# Keys are loaded once into the CryptoContext (create_app, or lazily from the
+# environment for scripts); these wrappers keep the original call sites working.
 
 def encrypt_data(data):
-    return cipher.encrypt(data.encode()).decode()
+    started = time.perf_counter()
+    try:
+        token = get_crypto_context().encrypt(data)
+    except Exception:
+        operation_metrics.record("encrypt", started, error=True)
+        raise
+    operation_metrics.record("encrypt", started, len(data))
+    return token
 
 def decrypt_data(token):
-    return cipher.decrypt(token.encode()).decode()
+    started = time.perf_counter()
+    try:
+        data = get_crypto_context().decrypt(token)
+    except Exception:
+        operation_metrics.record("decrypt", started, error=True)
+        raise
+    operation_metrics.record("decrypt", started, len(token))
+    return data
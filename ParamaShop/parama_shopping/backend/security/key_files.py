@@ -0,0 +1,52 @@
+import os
+import tempfile
+from cryptography.hazmat.primitives import serialization
+
+
+def read_private_key(path):
+    with open(path, "rb") as key_file:
+        return serialization.load_pem_private_key(key_file.read(), password=None)
+
+
+def publish_file(path, data, mode=0o600):
+    """Create path holding data atomically; returns False if it already exists.
+
+    The bytes go to a temp file in the same directory which is then hard-linked
+    into place, so concurrent workers never see a partial file and exactly one
+    of them wins; the others should re-read what the winner published.
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    handle, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(handle, "wb") as temp_file:
+            temp_file.write(data)
+            temp_file.flush()
+            os.fsync(temp_file.fileno())
+        os.chmod(temp_path, mode)
+        try:
+            os.link(temp_path, path)
+        except FileExistsError:
+            return False
+        return True
+    finally:
+        os.remove(temp_path)
+
+
+def load_or_create_private_key(path, generate):
+    """(private_key, created): the key at path, or a new one from generate() published atomically.
+
+    When another process publishes first, its key is loaded instead, so every
+    worker ends up with the same key.
+    """
+    if os.path.exists(path):
+        return read_private_key(path), False
+    private_key = generate()
+    pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+    if publish_file(path, pem):
+        return private_key, True
+    return read_private_key(path), False
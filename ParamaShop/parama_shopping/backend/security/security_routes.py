@@ -1,5 +1,8 @@
 from flask import Blueprint, request, jsonify
 import os
+from flask_jwt_extended import jwt_required
+from middleware.role_middleware import role_required
+from utils.metrics import operation_metrics
 from security.encoding import base64_encode, base64_decode
 from security.digital_signature import sign_text_base64, verify_text_base64, export_public_key
 
@@ -37,3 +40,10 @@ def key_info():
         "fernet_key_configured": has_fernet_key,
         "rsa_public_key_pem": export_public_key()
     }), 200
+
+# Admin: call counts, bytes, errors and timings of encoding / crypto primitives
+@security_bp.route("/metrics", methods=["GET"])
+@jwt_required()
+@role_required("ADMIN")
+def security_metrics(user_id):
+    return jsonify(operation_metrics.snapshot()), 200
@@ -0,0 +1,147 @@
+import base64
+import hashlib
+import logging
+import os
+import time
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, padding
+from security.key_files import load_or_create_private_key
+from utils.metrics import operation_metrics
+
+logger = logging.getLogger("signers")
+
+RSA_PSS_SHA256 = "RSA-PSS-SHA256"
+ED25519 = "Ed25519"
+ALGORITHMS = (RSA_PSS_SHA256, ED25519)
+
+
+def key_id_for(public_key):
+    """Short stable id: first 16 hex chars of sha256 over the DER public key."""
+    der = public_key.public_bytes(
+        encoding=serialization.Encoding.DER,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+    return hashlib.sha256(der).hexdigest()[:16]
+
+
+class RSAPSSSigner:
+    algorithm = RSA_PSS_SHA256
+
+    def __init__(self, private_key, public_key):
+        self.private_key = private_key
+        self.public_key = public_key
+        self.key_id = key_id_for(public_key)
+        self._padding = padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.MAX_LENGTH)
+        self._hash = hashes.SHA256()
+
+    def sign(self, data: bytes) -> bytes:
+        return self.private_key.sign(data, self._padding, self._hash)
+
+    def verify(self, data: bytes, signature: bytes) -> bool:
+        try:
+            self.public_key.verify(signature, data, self._padding, self._hash)
+            return True
+        except InvalidSignature:
+            return False
+
+
+class Ed25519Signer:
+    algorithm = ED25519
+
+    def __init__(self, private_key, public_key=None):
+        self.private_key = private_key
+        self.public_key = public_key or private_key.public_key()
+        self.key_id = key_id_for(self.public_key)
+
+    def sign(self, data: bytes) -> bytes:
+        return self.private_key.sign(data)
+
+    def verify(self, data: bytes, signature: bytes) -> bool:
+        try:
+            self.public_key.verify(signature, data)
+            return True
+        except InvalidSignature:
+            return False
+
+
+def load_or_generate_ed25519(key_dir, generate=True):
+    """The Ed25519 key in key_dir; created (atomically) only when generate is true, else None if absent."""
+    path = os.path.join(key_dir, "ed25519_private_key.pem")
+    if not generate and not os.path.exists(path):
+        return None
+    private_key, created = load_or_create_private_key(path, ed25519.Ed25519PrivateKey.generate)
+    if created:
+        logger.info("Ed25519 signing key generated and saved to disk.")
+    return private_key
+
+
+class SignerRegistry:
+    """The active signer for new orders plus every known verifier, keyed by (algorithm, key_id).
+
+    Orders stored before algorithm tagging have no algorithm/key id and verify
+    against the RSA key.
+    """
+
+    def __init__(self, signers, active_algorithm):
+        self._by_key = {(s.algorithm, s.key_id): s for s in signers}
+        self._by_algorithm = {}
+        for signer in signers:
+            self._by_algorithm.setdefault(signer.algorithm, signer)
+        if active_algorithm not in self._by_algorithm:
+            raise ValueError(f"No signer configured for {active_algorithm}")
+        self.active = self._by_algorithm[active_algorithm]
+
+    def signer_for(self, algorithm=None, key_id=None):
+        algorithm = algorithm or RSA_PSS_SHA256
+        if key_id:
+            return self._by_key.get((algorithm, key_id))
+        return self._by_algorithm.get(algorithm)
+
+    def sign(self, text):
+        """Return (signature_b64, algorithm, key_id) from the active signer."""
+        signature = self.active.sign(text.encode())
+        return base64.b64encode(signature).decode(), self.active.algorithm, self.active.key_id
+
+    def verify(self, text, signature_b64, algorithm=None, key_id=None):
+        signer = self.signer_for(algorithm, key_id)
+        if signer is None or not signature_b64:
+            return False
+        try:
+            signature = base64.b64decode(signature_b64.encode())
+        except Exception:
+            return False
+        return signer.verify(text.encode(), signature)
+
+
+def get_signer_registry():
+    from security.crypto_context import get_crypto_context
+
+    return get_crypto_context().signers
+
+
+def sign_payload(text):
+    """Sign with the active algorithm; returns (signature_b64, algorithm, key_id), or ("", None, None) on failure."""
+    started = time.perf_counter()
+    try:
+        signed = get_signer_registry().sign(text)
+    except Exception as e:
+        operation_metrics.record("sign_payload", started, error=True)
+        logger.error(f"Error signing order: {e}")
+        return "", None, None
+    if operation_metrics.record("sign_payload", started, len(text)):
+        logger.debug(f"Order signed with {signed[1]} (sampled).")
+    return signed
+
+
+def verify_payload(text, signature_b64, algorithm=None, key_id=None):
+    started = time.perf_counter()
+    try:
+        valid = get_signer_registry().verify(text, signature_b64, algorithm, key_id)
+    except Exception as e:
+        operation_metrics.record("verify_payload", started, error=True)
+        logger.error(f"Error verifying order signature: {e}")
+        return False
+    if operation_metrics.record("verify_payload", started, len(text)):
+        logger.debug(f"Order signature checked with {algorithm or 'default'} (sampled).")
+    return valid
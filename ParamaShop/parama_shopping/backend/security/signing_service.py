@@ -0,0 +1,168 @@
+import atexit
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from datetime import datetime
+from sqlalchemy import update
+from database.models import db, Order
+
+logger = logging.getLogger("signing_service")
+
+
+def sign_and_verify(payload_json):
+    """Sign payload_json with the active signer and check the result. Top-level so a worker process can run it.
+
+    Returns (signature_b64, algorithm, key_id, valid).
+    """
+    from security.signers import sign_payload, verify_payload
+
+    signature, algorithm, key_id = sign_payload(payload_json)
+    valid = verify_payload(payload_json, signature, algorithm, key_id) if signature else None
+    return signature, algorithm, key_id, valid
+
+
+class SigningService:
+    """Signs committed orders on a worker pool and writes the signature back to the row.
+
+    At most queue_size orders are outstanding; reserve() fails when the queue is
+    full so the caller can sign on the request thread instead.
+    """
+
+    def __init__(self, app, workers=2, queue_size=1000, kind="thread"):
+        self.app = app
+        self.workers = workers
+        self.kind = kind
+        self.queue_size = queue_size
+        self._slots = threading.BoundedSemaphore(queue_size)
+        self._executor = None
+        self._lock = threading.Lock()
+        self._counters = {"submitted": 0, "signed": 0, "failed": 0, "rejected": 0}
+
+    def start(self):
+        if self.kind == "process":
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="order-signing")
+
+    def stop(self, wait=True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+        stats["outstanding"] = stats["submitted"] - stats["signed"] - stats["failed"]
+        stats["queue_size"] = self.queue_size
+        return stats
+
+    def reserve(self):
+        """Claim a queue slot; False means the queue is full and the caller should sign inline."""
+        if self._executor is not None and self._slots.acquire(blocking=False):
+            return True
+        self._count("rejected")
+        return False
+
+    def release(self):
+        self._slots.release()
+
+    def submit(self, order_id, payload_json):
+        """Queue a committed order; requires a slot from reserve()."""
+        self._count("submitted")
+        try:
+            future = self._executor.submit(sign_and_verify, payload_json)
+        except RuntimeError:
+            # Shutting down; the order stays pending for sign-pending to pick up.
+            self._count("failed")
+            self.release()
+            return
+        future.add_done_callback(lambda f: self._store(order_id, f))
+
+    def _store(self, order_id, future):
+        try:
+            signature, algorithm, key_id, valid = future.result()
+            if not signature:
+                raise ValueError("empty signature")
+            with self.app.app_context():
+                try:
+                    store_signature(order_id, signature, algorithm, key_id, valid)
+                finally:
+                    db.session.remove()
+            self._count("signed")
+        except Exception as exc:
+            self._count("failed")
+            logger.error(f"Signing order {order_id} failed: {exc}")
+        finally:
+            self.release()
+
+
+def store_signature(order_id, signature, algorithm, key_id, valid):
+    checked_at = datetime.utcnow()
+    db.session.execute(
+        update(Order)
+        .where(Order.order_id == order_id)
+        .values(
+            order_signature=signature,
+            signature_alg=algorithm,
+            signature_key_id=key_id,
+            signature_pending=False,
+            integrity_valid=valid,
+            integrity_checked_at=checked_at,
+        )
+    )
+    db.session.commit()
+
+
+def sign_pending_orders(batch_size=200):
+    """Synchronously sign orders left pending (e.g. by a restart); returns how many were signed."""
+    from orders.order_payload import decode_payload
+
+    signed = 0
+    last_id = 0
+    while True:
+        orders = (
+            Order.query
+            .filter(Order.signature_pending.is_(True), Order.order_id > last_id)
+            .order_by(Order.order_id)
+            .limit(batch_size)
+            .all()
+        )
+        if not orders:
+            break
+        for order in orders:
+            data = decode_payload(order.encrypted_data)
+            if data:
+                signature, algorithm, key_id, valid = sign_and_verify(json.dumps(data))
+                if signature:
+                    store_signature(order.order_id, signature, algorithm, key_id, valid)
+                    signed += 1
+        last_id = orders[-1].order_id
+    logger.info(f"Signed {signed} pending orders")
+    return signed
+
+
+_service = None
+
+
+def init_signing_service(app):
+    """Start the async signer when ORDER_SIGNING_MODE is "async"; "sync" keeps signing on the request."""
+    global _service
+    if app.config.get("ORDER_SIGNING_MODE", "sync") != "async" or _service is not None:
+        return
+    _service = SigningService(
+        app,
+        workers=app.config.get("ORDER_SIGNING_WORKERS", 2),
+        queue_size=app.config.get("ORDER_SIGNING_QUEUE_SIZE", 1000),
+        kind=app.config.get("ORDER_SIGNING_EXECUTOR", "thread"),
+    )
+    _service.start()
+    atexit.register(_service.stop)
+
+
+def get_signing_service():
+    return _service
@@ -0,0 +1,95 @@
+import os
+import tempfile
+import unittest
+from flask import Flask
+from flask_jwt_extended import JWTManager
+from sqlalchemy.pool import StaticPool
+from database.db import db
+from database.models import Role, User, SellerProfile
+from auth.session_manager import issue_access_token
+from middleware.principal import invalidate_principal
+
+
+class DatabaseTestCase(unittest.TestCase):
+    """Flask app with an app context pushed and every table created on a fresh SQLite database.
+
+    Subclasses add app settings through `config`, set `threaded = True` when
+    worker threads share the in-memory database, or `file_database = True`
+    when threads need real concurrent connections (and SQLite's locking).
+    """
+
+    config = {}
+    threaded = False
+    file_database = False
+
+    def setUp(self):
+        self.db_path = None
+        self.app = Flask(__name__)
+        if self.file_database:
+            handle, self.db_path = tempfile.mkstemp(suffix=".db")
+            os.close(handle)
+            self.app.config.update(
+                SQLALCHEMY_DATABASE_URI=f"sqlite:///{self.db_path}",
+                SQLALCHEMY_ENGINE_OPTIONS={"connect_args": {"timeout": 30}},
+            )
+        elif self.threaded:
+            self.app.config.update(
+                SQLALCHEMY_DATABASE_URI="sqlite://",
+                SQLALCHEMY_ENGINE_OPTIONS={"poolclass": StaticPool, "connect_args": {"check_same_thread": False}},
+            )
+        else:
+            self.app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+        self.app.config.update(self.config)
+        db.init_app(self.app)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        db.engine.dispose()
+        self.ctx.pop()
+        if self.db_path:
+            os.remove(self.db_path)
+
+
+class ApiTestCase(DatabaseTestCase):
+    """DatabaseTestCase with JWT, the given blueprints and helpers for role-bearing users."""
+
+    blueprints = ()
+
+    def setUp(self):
+        super().setUp()
+        self.app.config["JWT_SECRET_KEY"] = "test-secret-key-with-enough-length"
+        JWTManager(self.app)
+        for blueprint, prefix in self.blueprints:
+            self.app.register_blueprint(blueprint, url_prefix=prefix)
+        db.session.add_all([
+            Role(role_id=1, role_name="USER"),
+            Role(role_id=2, role_name="ADMIN"),
+            Role(role_id=3, role_name="SELLER"),
+        ])
+        db.session.commit()
+        self.user_ids = []
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        for user_id in self.user_ids:
+            invalidate_principal(user_id)
+        super().tearDown()
+
+    def make_user(self, name, role="USER"):
+        """Create an active user (an approved seller for role="SELLER") and return its id."""
+        role_id = {"USER": 1, "ADMIN": 2, "SELLER": 3}[role]
+        user = User(name=name, email=f"{name.lower()}@example.com", password_hash="x", role_id=role_id)
+        db.session.add(user)
+        db.session.flush()
+        if role == "SELLER":
+            db.session.add(SellerProfile(user_id=user.user_id, shop_name=f"{name} shop", status="APPROVED"))
+        db.session.commit()
+        self.user_ids.append(user.user_id)
+        return user.user_id
+
+    def auth(self, user_id):
+        return {"Authorization": f"Bearer {issue_access_token(str(user_id))}"}
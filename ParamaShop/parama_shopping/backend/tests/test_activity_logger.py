@@ -0,0 +1,76 @@
+import unittest
+from datetime import datetime
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.pool import StaticPool
+from flask_jwt_extended import JWTManager
+from database.models import Log
+from auth.auth_routes import auth_bp
+from auth.session_manager import issue_access_token
+from logs import activity_logger
+from logs.activity_logger import ActivityLogBuffer, init_activity_logger, get_activity_log_stats, log_activity
+from db_test_case import DatabaseTestCase
+
+class ActivityLogBufferTestCase(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+        Log.__table__.create(self.engine)
+
+    def _row_count(self):
+        with self.engine.connect() as conn:
+            return conn.execute(select(func.count()).select_from(Log.__table__)).scalar()
+
+    def test_stop_flushes_queued_rows_in_batches(self):
+        buffer = ActivityLogBuffer(self.engine, batch_size=50, flush_interval=10)
+        buffer.start()
+        for i in range(120):
+            self.assertTrue(buffer.enqueue({"user_id": i, "action": "Test", "timestamp": datetime.utcnow()}))
+        buffer.stop()
+        stats = buffer.stats()
+        self.assertEqual(stats["flushed"], 120)
+        self.assertEqual(stats["dropped"], 0)
+        self.assertGreaterEqual(stats["batches"], 3)
+        self.assertEqual(self._row_count(), 120)
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        buffer = ActivityLogBuffer(self.engine, max_queue=2, enqueue_timeout=0)
+        results = [buffer.enqueue({"user_id": 1, "action": "Test", "timestamp": datetime.utcnow()}) for _ in range(5)]
+        self.assertEqual(results.count(True), 2)
+        self.assertEqual(buffer.stats()["dropped"], 3)
+        buffer.stop()
+        self.assertEqual(self._row_count(), 2)
+
+class LogActivityTestCase(DatabaseTestCase):
+    threaded = True
+    config = {
+        "JWT_SECRET_KEY": "test-secret-key-with-enough-length",
+        "ACTIVITY_LOG_FLUSH_INTERVAL": 60,
+    }
+
+    def setUp(self):
+        super().setUp()
+        JWTManager(self.app)
+        self.app.register_blueprint(auth_bp, url_prefix="/auth")
+        init_activity_logger(self.app)
+
+    def tearDown(self):
+        activity_logger._buffer.stop()
+        activity_logger._buffer = None
+        super().tearDown()
+
+    def test_route_activity_reaches_table_through_buffer(self):
+        headers = {"Authorization": f"Bearer {issue_access_token('7')}"}
+        response = self.app.test_client().post("/auth/logout", headers=headers, environ_base={"REMOTE_ADDR": "203.0.113.9"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Log.query.count(), 0)  # queued, not written on the request
+        activity_logger._buffer.stop()
+        self.assertEqual(get_activity_log_stats()["flushed"], 1)
+        log = Log.query.one()
+        self.assertEqual((log.user_id, log.action, log.ip_address), (7, "User Logged Out", "203.0.113.9"))
+
+    def test_ip_is_empty_outside_requests(self):
+        log_activity(1, "Nightly job")
+        activity_logger._buffer.stop()
+        self.assertIsNone(Log.query.one().ip_address)
+
+if __name__ == "__main__":
+    unittest.main()
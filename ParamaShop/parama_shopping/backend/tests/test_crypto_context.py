@@ -0,0 +1,61 @@
+import os
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives import serialization
+from security.crypto_context import CryptoContext, load_or_generate_rsa
+from security.key_files import publish_file
+from security.signers import load_or_generate_ed25519, ED25519
+
+def _boot_worker(key_dir):
+    """What each worker does at startup; returns the public keys it ended up with."""
+    rsa_private, _ = load_or_generate_rsa(key_dir)
+    ed_private = load_or_generate_ed25519(key_dir)
+    return tuple(
+        key.public_key().public_bytes(serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo)
+        for key in (rsa_private, ed_private)
+    )
+
+class CryptoKeyFilesTestCase(unittest.TestCase):
+    def setUp(self):
+        self.key_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.key_dir)
+
+    def _config(self, algorithm):
+        return {"ENCRYPTION_KEY": Fernet.generate_key().decode(), "RSA_KEY_DIR": self.key_dir,
+                "ORDER_SIGNATURE_ALG": algorithm}
+
+    def test_publish_file_never_overwrites(self):
+        path = os.path.join(self.key_dir, "key.pem")
+        self.assertTrue(publish_file(path, b"first"))
+        self.assertFalse(publish_file(path, b"second"))
+        with open(path, "rb") as key_file:
+            self.assertEqual(key_file.read(), b"first")
+        self.assertEqual(sorted(os.listdir(self.key_dir)), ["key.pem"])
+
+    def test_concurrent_first_boot_agrees_on_keys(self):
+        with ProcessPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(_boot_worker, [self.key_dir] * 8))
+        self.assertEqual(len(set(results)), 1)
+        self.assertEqual(_boot_worker(self.key_dir), results[0])
+
+    def test_ed25519_key_created_only_when_configured(self):
+        ed_path = os.path.join(self.key_dir, "ed25519_private_key.pem")
+        context = CryptoContext.from_config(self._config(None))
+        self.assertFalse(os.path.exists(ed_path))
+        self.assertIsNone(context.signers.signer_for(ED25519))
+
+        signer = CryptoContext.from_config(self._config(ED25519))
+        self.assertTrue(os.path.exists(ed_path))
+        signature, algorithm, key_id = signer.sign("payload")
+
+        # Back on RSA, the existing Ed25519 key still verifies old signatures.
+        context = CryptoContext.from_config(self._config(None))
+        self.assertTrue(context.verify("payload", signature, algorithm, key_id))
+
+if __name__ == "__main__":
+    unittest.main()
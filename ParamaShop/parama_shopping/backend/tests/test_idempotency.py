@@ -0,0 +1,66 @@
+import unittest
+from datetime import datetime, timedelta
+from database.db import db
+from database.models import IdempotencyKey
+from orders.idempotency import idempotent, purge_expired_keys
+from utils.response_handler import success, error
+from db_test_case import DatabaseTestCase
+
+class IdempotencyTestCase(DatabaseTestCase):
+    config = {"IDEMPOTENCY_KEY_TTL_HOURS": 1}
+
+    def setUp(self):
+        super().setUp()
+        self.calls = 0
+
+        @idempotent
+        def create(user_id):
+            self.calls += 1
+            if self.app.config.get("FAIL_NEXT"):
+                self.app.config["FAIL_NEXT"] = False
+                return error("Insufficient stock", 400)
+            db.session.commit()
+            return success("Created", {"call": self.calls})
+
+        @self.app.route("/create", methods=["POST"])
+        def create_route():
+            return create(7)
+
+        self.client = self.app.test_client()
+
+    def _post(self, body, key="key-1"):
+        return self.client.post("/create", json=body, headers={"Idempotency-Key": key} if key else {})
+
+    def test_repeat_replays_first_response(self):
+        first = self._post({"total": 5})
+        second = self._post({"total": 5})
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(second.get_json(), first.get_json())
+        self.assertEqual(second.headers.get("Idempotent-Replayed"), "true")
+
+    def test_different_body_is_rejected(self):
+        self._post({"total": 5})
+        self.assertEqual(self._post({"total": 6}).status_code, 422)
+        self.assertEqual(self.calls, 1)
+
+    def test_failures_are_not_stored(self):
+        self.app.config["FAIL_NEXT"] = True
+        self.assertEqual(self._post({"total": 5}).status_code, 400)
+        self.assertEqual(self._post({"total": 5}).status_code, 200)
+        self.assertEqual(self.calls, 2)
+
+    def test_without_header_every_request_runs(self):
+        self._post({"total": 5}, key=None)
+        self._post({"total": 5}, key=None)
+        self.assertEqual(self.calls, 2)
+
+    def test_expired_keys_run_again_and_are_purged(self):
+        self._post({"total": 5})
+        record = db.session.get(IdempotencyKey, (7, "key-1"))
+        record.expires_at = datetime.utcnow() - timedelta(seconds=1)
+        db.session.commit()
+        self.assertEqual(self._post({"total": 5}).get_json()["data"]["call"], 2)
+        self.assertEqual(purge_expired_keys(now=datetime.utcnow() + timedelta(hours=2)), 1)
+
+if __name__ == "__main__":
+    unittest.main()
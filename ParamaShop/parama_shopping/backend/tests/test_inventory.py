@@ -0,0 +1,61 @@
+import threading
+import unittest
+from database.db import db
+from database.models import Product
+from orders.inventory import reserve_stock, InsufficientStock
+from db_test_case import DatabaseTestCase
+
+class InventoryTestCase(DatabaseTestCase):
+    file_database = True
+
+    def setUp(self):
+        super().setUp()
+        db.session.add_all([
+            Product(product_id=1, product_name="Hot", price=10, stock=10),
+            Product(product_id=2, product_name="Cold", price=5, stock=3),
+        ])
+        db.session.commit()
+
+    def _stock(self, product_id):
+        db.session.expire_all()
+        return db.session.get(Product, product_id).stock
+
+    def test_reserve_deducts_and_merges_repeated_lines(self):
+        reserve_stock([{"product_id": 1, "quantity": 2}, {"product_id": 1, "quantity": 3}, {"product_id": 2, "quantity": 1}])
+        db.session.commit()
+        self.assertEqual(self._stock(1), 5)
+        self.assertEqual(self._stock(2), 2)
+
+    def test_shortfall_raises_and_rollback_restores(self):
+        with self.assertRaises(InsufficientStock) as ctx:
+            reserve_stock([{"product_id": 1, "quantity": 1}, {"product_id": 2, "quantity": 4}])
+        db.session.rollback()
+        self.assertEqual(ctx.exception.product_id, 2)
+        self.assertEqual(self._stock(1), 10)
+        self.assertEqual(self._stock(2), 3)
+
+    def test_concurrent_checkouts_never_oversell(self):
+        results = []
+
+        def checkout():
+            with self.app.app_context():
+                try:
+                    reserve_stock([{"product_id": 1, "quantity": 1}])
+                    db.session.commit()
+                    results.append(True)
+                except InsufficientStock:
+                    db.session.rollback()
+                    results.append(False)
+                finally:
+                    db.session.remove()
+
+        threads = [threading.Thread(target=checkout) for _ in range(25)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results.count(True), 10)
+        self.assertEqual(self._stock(1), 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+from cryptography.fernet import Fernet
+from database.db import db
+from database.models import Order
+from security.crypto_context import get_crypto_context, set_crypto_context, CryptoContext
+from orders.key_rotation import rotate_order_encryption
+from db_test_case import DatabaseTestCase
+
+class KeyRotationTestCase(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.previous = get_crypto_context()
+        self.old_key = Fernet.generate_key().decode()
+        self.new_key = Fernet.generate_key().decode()
+        set_crypto_context(self._context([self.old_key]))
+        for n in range(5):
+            db.session.add(Order(user_id=1, encrypted_data=get_crypto_context().encrypt(f'{{"n": {n}}}')))
+        db.session.commit()
+        set_crypto_context(self._context([self.new_key, self.old_key]))
+
+    def tearDown(self):
+        set_crypto_context(self.previous)
+        super().tearDown()
+
+    def _context(self, keys):
+        return CryptoContext(keys, self.previous.rsa_private_key, self.previous.rsa_public_key)
+
+    def _tokens(self):
+        db.session.expire_all()
+        return [o.encrypted_data for o in Order.query.order_by(Order.order_id)]
+
+    def test_old_key_still_decrypts_before_rotation(self):
+        self.assertEqual(get_crypto_context().decrypt(self._tokens()[0]), '{"n": 0}')
+
+    def test_rotation_reencrypts_under_new_key_in_batches(self):
+        batches = []
+        result = rotate_order_encryption(batch_size=2, progress=batches.append)
+        self.assertEqual(result["rotated"], 5)
+        self.assertEqual(len(batches), 3)
+        new_only = Fernet(self.new_key.encode())
+        self.assertEqual([new_only.decrypt(t.encode()).decode() for t in self._tokens()],
+                         [f'{{"n": {n}}}' for n in range(5)])
+
+    def test_rerun_and_resume_skip_rotated_rows(self):
+        first = rotate_order_encryption(batch_size=2, limit=3)
+        self.assertEqual((first["rotated"], first["last_order_id"]), (3, 3))
+        second = rotate_order_encryption(batch_size=2)
+        self.assertEqual((second["rotated"], second["skipped"]), (2, 3))
+        resumed = rotate_order_encryption(start_after=4)
+        self.assertEqual((resumed["scanned"], resumed["rotated"]), (1, 0))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import importlib.util
+import os
+import unittest
+from datetime import datetime, timedelta
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+from database.db import db
+from database.models import Log
+from logs.log_routes import log_bp
+from utils.pagination import MAX_PAGE_SIZE, encode_cursor
+from db_test_case import ApiTestCase
+
+class LogPaginationTestCase(ApiTestCase):
+    blueprints = ((log_bp, "/logs"),)
+
+    def setUp(self):
+        super().setUp()
+        self.admin = self.auth(self.make_user("Admin", "ADMIN"))
+        start = datetime(2026, 1, 1)
+        # Pairs of rows share a timestamp, so paging has to break ties on log_id.
+        db.session.add_all([
+            Log(user_id=1, action=f"event {i}", ip_address="127.0.0.1", timestamp=start + timedelta(minutes=i // 2))
+            for i in range(MAX_PAGE_SIZE + 5)
+        ])
+        db.session.commit()
+
+    def test_cursor_walk_returns_every_log_once(self):
+        seen, cursor = [], None
+        while True:
+            query = {"limit": 7}
+            if cursor:
+                query["cursor"] = cursor
+            response = self.client.get("/logs/all", query_string=query, headers=self.admin)
+            self.assertEqual(response.status_code, 200)
+            data = response.get_json()
+            seen += [item["log_id"] for item in data["items"]]
+            cursor = data["next_cursor"]
+            if not cursor:
+                break
+        self.assertEqual(seen, sorted(range(1, MAX_PAGE_SIZE + 6), reverse=True))
+
+    def test_malformed_cursors_are_rejected(self):
+        for values in ([1, 2], ["2026-01-01T00:00:00", "5"], ["not a time", 5], [None, 5], ["2026-01-01T00:00:00", True]):
+            response = self.client.get("/logs/all", query_string={"cursor": encode_cursor(values)}, headers=self.admin)
+            self.assertEqual(response.status_code, 400, values)
+        response = self.client.get("/logs/all?cursor=WzEsMl0", headers=self.admin)
+        self.assertEqual(response.status_code, 400)
+
+    def test_unparameterised_listing_is_capped(self):
+        response = self.client.get("/logs/all", headers=self.admin)
+        self.assertEqual(response.status_code, 200)
+        logs = response.get_json()
+        self.assertEqual(len(logs), MAX_PAGE_SIZE)
+        self.assertEqual(logs[0]["log_id"], MAX_PAGE_SIZE + 5)
+
+        rest = self.client.get("/logs/all", query_string={"cursor": response.headers["X-Next-Cursor"]}, headers=self.admin)
+        self.assertEqual([item["log_id"] for item in rest.get_json()["items"]], [5, 4, 3, 2, 1])
+
+    def test_ndjson_export_is_not_capped(self):
+        response = self.client.get("/logs/all", query_string={"format": "ndjson"}, headers=self.admin)
+        self.assertEqual(len(response.get_data(as_text=True).splitlines()), MAX_PAGE_SIZE + 5)
+
+    def test_requires_admin(self):
+        user = self.auth(self.make_user("Shopper"))
+        self.assertEqual(self.client.get("/logs/all", headers=user).status_code, 403)
+
+MIGRATION = os.path.join(os.path.dirname(__file__), "..", "migrations", "versions", "e4b8d2f6a317_logs_timestamp_not_null.py")
+
+class NullTimestampTestCase(ApiTestCase):
+    blueprints = ((log_bp, "/logs"),)
+
+    def setUp(self):
+        super().setUp()
+        self.admin = self.auth(self.make_user("Admin", "ADMIN"))
+        # The pre-migration schema: timestamp nullable, 50 dated rows and 60 legacy undated ones.
+        with db.engine.begin() as connection:
+            connection.execute(text("DROP TABLE logs"))
+            connection.execute(text(
+                "CREATE TABLE logs (log_id INTEGER PRIMARY KEY, user_id INTEGER, action TEXT, "
+                "ip_address VARCHAR(50), timestamp DATETIME)"
+            ))
+            for log_id in range(1, 111):
+                stamp = datetime(2026, 1, 1) + timedelta(minutes=log_id) if log_id <= 50 else None
+                connection.execute(
+                    text("INSERT INTO logs (log_id, user_id, action, timestamp) VALUES (:id, 1, 'Login', :ts)"),
+                    {"id": log_id, "ts": stamp},
+                )
+        spec = importlib.util.spec_from_file_location("logs_timestamp_migration", MIGRATION)
+        self.migration = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(self.migration)
+
+    def test_migration_backfills_so_every_row_pages(self):
+        with db.engine.begin() as connection:
+            with Operations.context(MigrationContext.configure(connection)):
+                self.migration.upgrade()
+        self.assertEqual(Log.query.filter(Log.timestamp.is_(None)).count(), 0)
+
+        response = self.client.get("/logs/all", headers=self.admin)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.get_json()), 100)
+
+        seen, cursor = [], None
+        while True:
+            query = {"limit": 55}
+            if cursor:
+                query["cursor"] = cursor
+            response = self.client.get("/logs/all", query_string=query, headers=self.admin)
+            self.assertEqual(response.status_code, 200)
+            data = response.get_json()
+            seen += [item["log_id"] for item in data["items"]]
+            cursor = data["next_cursor"]
+            if not cursor:
+                break
+        self.assertEqual(sorted(seen), list(range(1, 111)))
+        self.assertEqual(len(seen), 110)
+
+        with self.assertRaises(IntegrityError):
+            with db.engine.begin() as connection:
+                connection.execute(text("INSERT INTO logs (user_id, action, timestamp) VALUES (1, 'Login', NULL)"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import gzip
+import json
+import glob
+import os
+import signal
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+from database.db import db
+from database.models import Log
+from logs.log_retention import ArchiveWriter, archive_logs, add_months
+from db_test_case import DatabaseTestCase
+
+class LogRetentionTestCase(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.now = datetime(2026, 6, 15)
+        db.session.add_all([
+            Log(user_id=1, action="Login OTP Sent", timestamp=self.now - timedelta(days=day))
+            for day in range(0, 200, 10)
+        ])
+        db.session.commit()
+        self.archive_dir = tempfile.mkdtemp()
+
+    def test_add_months(self):
+        self.assertEqual(add_months(datetime(2026, 11, 1), 3), datetime(2027, 2, 1))
+        self.assertEqual(add_months(datetime(2026, 1, 1), -1), datetime(2025, 12, 1))
+
+    def test_dry_run_changes_nothing(self):
+        result = archive_logs(90, self.archive_dir, dry_run=True, now=self.now)
+        self.assertEqual(result["archived_rows"], 10)
+        self.assertEqual(Log.query.count(), 20)
+        self.assertEqual(os.listdir(self.archive_dir), [])
+
+    def test_archive_moves_old_rows_to_monthly_files(self):
+        result = archive_logs(90, self.archive_dir, batch_size=3, now=self.now)
+        self.assertEqual(result["archived_rows"], 10)
+        self.assertEqual(Log.query.count(), 10)
+        archived = []
+        for path in result["files"]:
+            with gzip.open(path, "rt", encoding="utf-8") as handle:
+                archived.extend(json.loads(line) for line in handle)
+        self.assertEqual(len(archived), 10)
+        cutoff = self.now - timedelta(days=90)
+        self.assertTrue(all(datetime.fromisoformat(row["timestamp"]) < cutoff for row in archived))
+
+def read_archive(archive_dir):
+    rows = []
+    for path in sorted(glob.glob(os.path.join(archive_dir, "*.ndjson.gz"))):
+        with gzip.open(path, "rt", encoding="utf-8") as handle:
+            rows.extend(json.loads(line) for line in handle)
+    return rows
+
+@unittest.skipUnless(hasattr(os, "fork"), "needs os.fork to kill a run")
+class ArchiveCrashTestCase(DatabaseTestCase):
+    file_database = True
+
+    def setUp(self):
+        super().setUp()
+        self.now = datetime(2026, 6, 15)
+        db.session.add_all([
+            Log(user_id=1, action="Login OTP Sent", timestamp=self.now - timedelta(days=day))
+            for day in range(0, 200, 10)
+        ])
+        db.session.commit()
+        cutoff = self.now - timedelta(days=90)
+        self.old_ids = {log.log_id for log in Log.query.filter(Log.timestamp < cutoff)}
+        self.archive_dir = tempfile.mkdtemp()
+
+    def archive_and_kill(self, method, calls):
+        """Run the archive in a child process that is SIGKILLed right after the given call of ArchiveWriter.method."""
+        original = getattr(ArchiveWriter, method)
+        seen = []
+
+        def patched(writer, *args):
+            result = original(writer, *args)
+            seen.append(method)
+            if len(seen) == calls:
+                os.kill(os.getpid(), signal.SIGKILL)
+            return result
+
+        pid = os.fork()
+        if pid == 0:
+            try:
+                db.engine.dispose(close=False)
+                with mock.patch.object(ArchiveWriter, method, patched):
+                    archive_logs(90, self.archive_dir, batch_size=3, now=self.now)
+            finally:
+                os._exit(0)
+        _, status = os.waitpid(pid, 0)
+        self.assertTrue(os.WIFSIGNALED(status))
+        db.session.remove()
+
+    def assert_rerun_archives_everything(self):
+        self.assertLess(Log.query.count(), 20)
+        archive_logs(90, self.archive_dir, batch_size=3, now=self.now)
+        archived = read_archive(self.archive_dir)
+        self.assertEqual(sorted(row["log_id"] for row in archived), sorted(self.old_ids))
+        self.assertEqual(Log.query.filter(Log.log_id.in_(self.old_ids)).count(), 0)
+        self.assertEqual(Log.query.count(), 10)
+        self.assertEqual([name for name in os.listdir(self.archive_dir) if name.endswith(".tmp")], [])
+
+    def test_kill_while_writing_a_chunk(self):
+        self.archive_and_kill("write", 5)
+        self.assert_rerun_archives_everything()
+
+    def test_kill_after_publishing_before_delete_commits(self):
+        self.archive_and_kill("publish", 2)
+        self.assert_rerun_archives_everything()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import logging
+import time
+import unittest
+from security.encoding import base64_encode, base64_decode
+from security.encryption import encrypt_data, decrypt_data
+from security.signers import sign_payload, verify_payload
+from utils.metrics import OperationMetrics, operation_metrics
+
+class OperationMetricsTestCase(unittest.TestCase):
+    def setUp(self):
+        operation_metrics.reset()
+
+    def test_record_aggregates_calls_bytes_and_errors(self):
+        metrics = OperationMetrics(log_sample_rate=0)
+        metrics.record("op", time.perf_counter(), 10)
+        metrics.record("op", time.perf_counter(), 5)
+        metrics.record("op", time.perf_counter(), error=True)
+        stats = metrics.snapshot()["op"]
+        self.assertEqual((stats["calls"], stats["bytes"], stats["errors"]), (3, 15, 1))
+        self.assertGreaterEqual(stats["max_us"], 0)
+
+    def test_log_sampling_picks_one_call_in_n(self):
+        metrics = OperationMetrics(log_sample_rate=3)
+        sampled = [metrics.record("op", time.perf_counter()) for _ in range(7)]
+        self.assertEqual(sampled, [True, False, False, True, False, False, True])
+        self.assertFalse(OperationMetrics(log_sample_rate=0).record("op", time.perf_counter()))
+
+    def test_encoding_counts_instead_of_logging(self):
+        logging.getLogger("encoding_utils").setLevel(logging.INFO)
+        with self.assertNoLogs("encoding_utils", level="INFO"):
+            for _ in range(50):
+                base64_decode(base64_encode("order"))
+        with self.assertLogs("encoding_utils", level="ERROR"):
+            self.assertEqual(base64_decode("abc"), "")
+        snapshot = operation_metrics.snapshot()
+        self.assertEqual(snapshot["base64_encode"]["calls"], 50)
+        self.assertEqual(snapshot["base64_encode"]["bytes"], 250)
+        self.assertEqual(snapshot["base64_decode"]["errors"], 1)
+
+    def test_crypto_primitives_are_timed(self):
+        self.assertEqual(decrypt_data(encrypt_data("payload")), "payload")
+        signature, algorithm, key_id = sign_payload("payload")
+        self.assertTrue(verify_payload("payload", signature, algorithm, key_id))
+        snapshot = operation_metrics.snapshot()
+        for name in ("encrypt", "decrypt", "sign_payload", "verify_payload"):
+            self.assertEqual(snapshot[name]["calls"], 1, name)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import json
+import unittest
+from datetime import datetime, timedelta
+from cryptography.hazmat.primitives.asymmetric import ed25519
+from database.db import db
+from database.models import Order
+from security.encryption import encrypt_data
+from security.digital_signature import sign_text_base64
+from security.crypto_context import CryptoContext, get_crypto_context, set_crypto_context
+from security.signers import ED25519
+from orders.order_audit import IntegrityAuditWorker, audit_order_signatures, count_invalid_orders, resign_orders
+from db_test_case import DatabaseTestCase
+
+class OrderAuditTestCase(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.valid_id = self.add_order({"total": 10})
+        self.tampered_id = self.add_order({"total": 20})
+        self.original_data = db.session.get(Order, self.tampered_id).encrypted_data
+        db.session.get(Order, self.tampered_id).encrypted_data = encrypt_data(json.dumps({"total": 1}))
+        db.session.commit()
+
+    def add_order(self, payload):
+        payload_json = json.dumps(payload)
+        order = Order(user_id=1, encrypted_data=encrypt_data(payload_json), order_signature=sign_text_base64(payload_json))
+        db.session.add(order)
+        db.session.commit()
+        return order.order_id
+
+    def test_tampered_payload_is_flagged(self):
+        result = audit_order_signatures(batch_size=1)
+        self.assertEqual((result["checked"], result["invalid_order_ids"]), (2, [self.tampered_id]))
+        self.assertTrue(db.session.get(Order, self.valid_id).integrity_valid)
+        self.assertFalse(db.session.get(Order, self.tampered_id).integrity_valid)
+        self.assertIsNotNone(db.session.get(Order, self.tampered_id).integrity_checked_at)
+        self.assertEqual(count_invalid_orders(), 1)
+
+    def test_resign_clears_flag_once_payload_is_restored(self):
+        audit_order_signatures()
+        order = db.session.get(Order, self.tampered_id)
+        order.encrypted_data = self.original_data
+        db.session.commit()
+
+        original = get_crypto_context()
+        set_crypto_context(CryptoContext(
+            original.fernet_keys,
+            original.rsa_private_key,
+            original.rsa_public_key,
+            ed25519_private_key=ed25519.Ed25519PrivateKey.generate(),
+            signature_algorithm=ED25519,
+        ))
+        try:
+            self.assertEqual(resign_orders(ED25519)["resigned"], 2)
+            self.assertTrue(db.session.get(Order, self.tampered_id).integrity_valid)
+            self.assertEqual(count_invalid_orders(), 0)
+            self.assertEqual(audit_order_signatures()["invalid"], 0)
+        finally:
+            set_crypto_context(original)
+
+    def test_unchecked_only_backfills_missing_verdicts(self):
+        checked_at = datetime.utcnow() - timedelta(days=30)
+        order = db.session.get(Order, self.tampered_id)
+        order.integrity_valid, order.integrity_checked_at = True, checked_at
+        db.session.commit()
+
+        result = audit_order_signatures(unchecked_only=True)
+        self.assertEqual(result["checked"], 1)
+        self.assertTrue(db.session.get(Order, self.valid_id).integrity_valid)
+        order = db.session.get(Order, self.tampered_id)
+        self.assertEqual((order.integrity_valid, order.integrity_checked_at), (True, checked_at))
+
+    def test_worker_pass_rechecks_stale_verdicts(self):
+        worker = IntegrityAuditWorker(self.app, interval=3600, batch_size=10, max_age=timedelta(hours=1))
+        self.assertEqual(worker.run_once()["checked"], 2)
+        self.assertEqual(worker.run_once()["checked"], 0)
+        self.assertEqual(count_invalid_orders(), 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import csv
+import io
+import json
+import unittest
+from datetime import datetime
+from database.db import db
+from database.models import Order
+from security.encryption import encrypt_data
+from orders.order_export import build_order_query, iter_admin_orders, iter_csv, iter_ndjson, parse_day_range
+from db_test_case import DatabaseTestCase
+
+class OrderExportTestCase(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        for day in range(1, 6):
+            payload = {"items": [{"product_id": day, "quantity": 1, "price": 10}], "total": 10 * day}
+            db.session.add(Order(
+                user_id=1,
+                encrypted_data=encrypt_data(json.dumps(payload)),
+                delivery_city="Chennai",
+                created_at=datetime(2026, 2, day, 12, 0),
+            ))
+        db.session.commit()
+
+    def test_streams_all_orders_in_id_order(self):
+        rows = list(iter_admin_orders(build_order_query(), batch_size=2))
+        self.assertEqual([r["order_id"] for r in rows], [1, 2, 3, 4, 5])
+        self.assertEqual(rows[2]["total"], 30)
+        self.assertEqual(rows[0]["delivery"]["city"], "Chennai")
+
+    def test_day_range_is_inclusive(self):
+        start, end = parse_day_range("2026-02-02", "2026-02-04")
+        rows = list(iter_admin_orders(build_order_query(start, end)))
+        self.assertEqual([r["order_id"] for r in rows], [2, 3, 4])
+
+    def test_after_id_resumes_export(self):
+        rows = list(iter_admin_orders(build_order_query(after_id=3)))
+        self.assertEqual([r["order_id"] for r in rows], [4, 5])
+
+    def test_ndjson_and_csv_encoding(self):
+        rows = list(iter_admin_orders(build_order_query(after_id=4)))
+        lines = list(iter_ndjson(rows))
+        self.assertEqual(json.loads(lines[0])["order_id"], 5)
+        parsed = list(csv.DictReader(io.StringIO("".join(iter_csv(rows)))))
+        self.assertEqual(parsed[0]["order_id"], "5")
+        self.assertEqual(json.loads(parsed[0]["items"])[0]["product_id"], 5)
+        self.assertEqual(parsed[0]["delivery_city"], "Chennai")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+from database.db import db
+from database.models import Product
+from orders.order_routes import order_bp
+from db_test_case import ApiTestCase
+
+class OrderByTransactionTestCase(ApiTestCase):
+    blueprints = ((order_bp, "/order"),)
+
+    def setUp(self):
+        super().setUp()
+        self.buyer = self.make_user("Buyer")
+        self.other_buyer = self.make_user("Other")
+        self.seller_a = self.make_user("Alice", "SELLER")
+        self.seller_b = self.make_user("Bob", "SELLER")
+        self.seller_c = self.make_user("Carol", "SELLER")
+        self.admin = self.make_user("Admin", "ADMIN")
+        db.session.add_all([
+            Product(product_id=1, product_name="Mug", price=5, stock=10, seller_id=self.seller_a),
+            Product(product_id=2, product_name="Novel", price=12, stock=10, seller_id=self.seller_b),
+        ])
+        db.session.commit()
+        response = self.client.post(
+            "/order/place",
+            json={
+                "items": [{"product_id": 1, "quantity": 2, "price": 5}, {"product_id": 2, "quantity": 1, "price": 12}],
+                "total": 22,
+                "delivery": {"name": "Buyer", "city": "Chennai"},
+            },
+            headers=self.auth(self.buyer),
+        )
+        self.assertEqual(response.status_code, 200, response.get_json())
+        self.txn = response.get_json()["data"]["transaction_id"]
+
+    def lookup(self, user_id, txn=None):
+        return self.client.get(f"/order/by-transaction/{txn or self.txn}", headers=self.auth(user_id))
+
+    def test_owner_sees_whole_order(self):
+        response = self.lookup(self.buyer)
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()["data"]
+        self.assertEqual((data["transaction_id"], data["total"]), (self.txn, 22))
+        self.assertEqual([i["product_id"] for i in data["items"]], [1, 2])
+        self.assertTrue(data["integrity_valid"])
+
+    def test_other_user_gets_not_found(self):
+        self.assertEqual(self.lookup(self.other_buyer).status_code, 404)
+
+    def test_uninvolved_seller_gets_not_found(self):
+        self.assertEqual(self.lookup(self.seller_c).status_code, 404)
+
+    def test_seller_sees_only_their_items(self):
+        data = self.lookup(self.seller_a).get_json()["data"]
+        self.assertEqual([i["product_id"] for i in data["items"]], [1])
+        self.assertEqual(data["total_for_seller"], 10)
+        self.assertNotIn("total", data)
+        data = self.lookup(self.seller_b).get_json()["data"]
+        self.assertEqual(([i["product_id"] for i in data["items"]], data["total_for_seller"]), ([2], 12))
+
+    def test_admin_sees_everything(self):
+        response = self.lookup(self.admin)
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()["data"]
+        self.assertEqual((data["user_id"], data["total"]), (self.buyer, 22))
+        self.assertEqual([i["product_id"] for i in data["items"]], [1, 2])
+        self.assertEqual(data["delivery"]["city"], "Chennai")
+        self.assertTrue(data["integrity_valid"])
+
+    def test_unknown_transaction_is_not_found(self):
+        for user_id in (self.buyer, self.seller_a, self.admin):
+            self.assertEqual(self.lookup(user_id, "TXN-NOPE-20260101-1").status_code, 404)
+
+if __name__ == "__main__":
+    unittest.main()
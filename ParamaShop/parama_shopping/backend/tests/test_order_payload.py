@@ -0,0 +1,85 @@
+import json
+import unittest
+from types import SimpleNamespace
+from security.encryption import encrypt_data
+from security.digital_signature import sign_text_base64
+from orders.order_payload import OrderPayloadCache, decode_order_payload, decode_order_payloads, decode_pool, payload_cache
+
+def make_order(order_id, payload):
+    return SimpleNamespace(order_id=order_id, encrypted_data=encrypt_data(json.dumps(payload)))
+
+class OrderPayloadCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.original_max = payload_cache.max_bytes
+        payload_cache.clear()
+
+    def tearDown(self):
+        payload_cache.resize(self.original_max)
+        payload_cache.clear()
+
+    def test_second_decode_is_a_hit(self):
+        order = make_order(1, {"items": [{"product_id": 1}], "total": 10})
+        before = payload_cache.stats()
+        self.assertEqual(decode_order_payload(order)["total"], 10)
+        self.assertEqual(decode_order_payload(order)["total"], 10)
+        after = payload_cache.stats()
+        self.assertEqual(after["misses"] - before["misses"], 1)
+        self.assertEqual(after["hits"] - before["hits"], 1)
+
+    def test_new_ciphertext_is_not_served_stale(self):
+        order = make_order(2, {"total": 1})
+        decode_order_payload(order)
+        order.encrypted_data = encrypt_data(json.dumps({"total": 2}))
+        self.assertEqual(decode_order_payload(order)["total"], 2)
+
+    def test_unreadable_payload_is_not_cached(self):
+        order = SimpleNamespace(order_id=3, encrypted_data="not-a-token")
+        self.assertEqual(decode_order_payload(order), {})
+        self.assertEqual(payload_cache.stats()["entries"], 0)
+
+    def test_budget_evicts_least_recently_used(self):
+        cache = OrderPayloadCache(max_bytes=100)
+        cache.put("a", {}, 40)
+        cache.put("b", {}, 40)
+        cache.get("a")
+        cache.put("c", {}, 40)
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        stats = cache.stats()
+        self.assertEqual(stats["evictions"], 1)
+        self.assertEqual(stats["bytes"], 80)
+
+    def test_oversized_entry_is_skipped(self):
+        cache = OrderPayloadCache(max_bytes=10)
+        cache.put("a", {}, 11)
+        self.assertEqual(cache.stats()["entries"], 0)
+
+class BatchDecodeTestCase(unittest.TestCase):
+    def setUp(self):
+        payload_cache.clear()
+        decode_pool.configure(workers=4, kind="thread", min_parallel=1)
+
+    def tearDown(self):
+        decode_pool.configure()
+        payload_cache.clear()
+
+    def test_results_keep_input_order(self):
+        orders = [make_order(i, {"total": i}) for i in range(1, 41)]
+        orders.append(SimpleNamespace(order_id=99, encrypted_data=None))
+        results = decode_order_payloads(orders)
+        self.assertEqual([r.get("total") for r in results], list(range(1, 41)) + [None])
+
+    def test_verify_reports_signature_validity(self):
+        payload = json.dumps({"total": 5})
+        good = SimpleNamespace(order_id=1, encrypted_data=encrypt_data(payload), order_signature=sign_text_base64(payload),
+                               signature_alg=None, signature_key_id=None)
+        bad = SimpleNamespace(order_id=2, encrypted_data=encrypt_data(json.dumps({"total": 6})), order_signature=good.order_signature,
+                              signature_alg=None, signature_key_id=None)
+        (good_data, good_valid), (bad_data, bad_valid) = decode_order_payloads([good, bad], verify=True)
+        self.assertEqual(good_data["total"], 5)
+        self.assertTrue(good_valid)
+        self.assertEqual(bad_data["total"], 6)
+        self.assertFalse(bad_valid)
+
+if __name__ == "__main__":
+    unittest.main()
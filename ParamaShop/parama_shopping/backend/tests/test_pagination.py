@@ -0,0 +1,23 @@
+import unittest
+from utils.pagination import encode_cursor, decode_cursor, parse_limit
+
+class PaginationTestCase(unittest.TestCase):
+    def test_cursor_round_trip(self):
+        cursor = encode_cursor(["Electronics", 1999.0, 42])
+        self.assertEqual(decode_cursor(cursor, 3), ["Electronics", 1999.0, 42])
+
+    def test_decode_rejects_garbage(self):
+        with self.assertRaises(ValueError):
+            decode_cursor("not-a-cursor", 3)
+        with self.assertRaises(ValueError):
+            decode_cursor(encode_cursor([1, 2]), 3)
+
+    def test_parse_limit(self):
+        self.assertEqual(parse_limit(None), 20)
+        self.assertEqual(parse_limit("5"), 5)
+        self.assertEqual(parse_limit("5000"), 100)
+        with self.assertRaises(ValueError):
+            parse_limit("0")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+from flask import g
+from flask_jwt_extended import create_access_token, jwt_required
+from database.db import db
+from database.models import SellerProfile
+from admin.admin_routes import admin_bp
+from orders.order_routes import order_bp
+from middleware.principal import load_principal, principal_cache, token_version_cache
+from middleware.role_middleware import role_required
+from middleware.sql_profiler import query_budget
+from db_test_case import ApiTestCase
+
+class PrincipalTestCase(ApiTestCase):
+    blueprints = ((admin_bp, "/admin"), (order_bp, "/order"))
+    config = {"PRINCIPAL_CACHE_TTL": 300, "TOKEN_VERSION_CACHE_TTL": 300}
+
+    def setUp(self):
+        super().setUp()
+        self.admin = self.auth(self.make_user("Admin", "ADMIN"))
+        self.shopper_id = self.make_user("Shopper")
+        self.seller_id = self.make_user("Seller", "SELLER")
+
+        @self.app.route("/whoami")
+        @jwt_required()
+        @role_required("USER", "SELLER", "ADMIN")
+        def whoami(user_id):
+            return {"role": g.principal.role_name, "seller_status": g.principal.seller_status}
+
+    def set_seller_status(self, status):
+        SellerProfile.query.filter_by(user_id=self.seller_id).update({"status": status})
+        db.session.commit()
+
+    def test_principal_is_one_query_then_cached(self):
+        with self.app.test_request_context():
+            with query_budget(1):
+                principal = load_principal(self.seller_id)
+            self.assertEqual((principal.role_name, principal.seller_status, principal.shop_name),
+                             ("SELLER", "APPROVED", "Seller shop"))
+            with query_budget(0):
+                self.assertIs(load_principal(self.seller_id), principal)
+
+    def test_token_without_claims_loads_principal_from_database(self):
+        with self.app.test_request_context():
+            headers = {"Authorization": f"Bearer {create_access_token(identity=str(self.seller_id))}"}
+        principal_cache.clear()
+        token_version_cache.clear()
+        with query_budget(2):  # token_version check + the one joined principal query
+            response = self.client.get("/whoami", headers=headers)
+        self.assertEqual(response.get_json(), {"role": "SELLER", "seller_status": "APPROVED"})
+        with query_budget(0):
+            self.assertEqual(self.client.get("/whoami", headers=headers).status_code, 200)
+
+    def test_toggle_user_disables_the_next_request(self):
+        headers = self.auth(self.shopper_id)
+        self.assertEqual(self.client.get("/order/history", headers=headers).status_code, 200)
+        response = self.client.put(f"/admin/user/{self.shopper_id}/toggle", headers=self.admin)
+        self.assertEqual(response.get_json()["status"], "DISABLED")
+        response = self.client.get("/order/history", headers=headers)
+        self.assertEqual((response.status_code, response.get_json()["message"]), (403, "Account disabled"))
+        self.client.put(f"/admin/user/{self.shopper_id}/toggle", headers=self.admin)
+        self.assertEqual(self.client.get("/order/history", headers=headers).status_code, 200)
+
+    def test_approve_seller_admits_the_next_request(self):
+        self.set_seller_status("PENDING")
+        headers = self.auth(self.seller_id)
+        response = self.client.get("/order/seller-orders", headers=headers)
+        self.assertEqual((response.status_code, response.get_json()["message"]), (403, "Seller approval pending"))
+        self.assertEqual(self.client.post(f"/admin/sellers/{self.seller_id}/approve", headers=self.admin).status_code, 200)
+        self.assertEqual(self.client.get("/order/seller-orders", headers=headers).status_code, 200)
+        self.assertEqual(self.client.get("/whoami", headers=headers).get_json()["seller_status"], "APPROVED")
+
+    def test_reject_seller_blocks_the_next_request(self):
+        headers = self.auth(self.seller_id)
+        self.assertEqual(self.client.get("/order/seller-orders", headers=headers).status_code, 200)
+        self.assertEqual(self.client.post(f"/admin/sellers/{self.seller_id}/reject", headers=self.admin).status_code, 200)
+        self.assertEqual(self.client.get("/order/seller-orders", headers=headers).status_code, 403)
+
+    def test_deleted_users_are_not_found(self):
+        seller_headers, shopper_headers = self.auth(self.seller_id), self.auth(self.shopper_id)
+        self.assertEqual(self.client.get("/whoami", headers=seller_headers).status_code, 200)
+        self.assertEqual(self.client.get("/whoami", headers=shopper_headers).status_code, 200)
+        self.assertEqual(self.client.delete(f"/admin/sellers/{self.seller_id}", headers=self.admin).status_code, 200)
+        self.assertEqual(self.client.delete(f"/admin/users/{self.shopper_id}", headers=self.admin).status_code, 200)
+        self.assertEqual(self.client.get("/whoami", headers=seller_headers).status_code, 404)
+        self.assertEqual(self.client.get("/whoami", headers=shopper_headers).status_code, 404)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+from sqlalchemy.exc import IntegrityError
+from database.db import db
+from database.models import Product
+from products.product_routes import product_bp
+from products.product_service import update_product
+from utils.pagination import encode_cursor
+from db_test_case import DatabaseTestCase
+
+class ProductPaginationTestCase(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.app.register_blueprint(product_bp, url_prefix="/product")
+        db.session.add_all([
+            Product(product_name="Blue shirt", category="Apparel", price=10, stock=1),
+            Product(product_name="Blue mug", category="Home", price=3, stock=1),
+            Product(product_name="Red mug", category="Home", price=3, stock=1),
+            Product(product_name="Green mug", category="Home", price=3, stock=1),
+            Product(product_name="Lamp", category="Home", price=25, stock=1),
+        ])
+        db.session.commit()
+        self.client = self.app.test_client()
+
+    def _walk(self, **params):
+        names, cursor = [], None
+        while True:
+            query = dict(params, limit=1)
+            if cursor:
+                query["cursor"] = cursor
+            response = self.client.get("/product/all", query_string=query)
+            self.assertEqual(response.status_code, 200)
+            data = response.get_json()["data"]
+            names += [item["name"] for item in data["items"]]
+            cursor = data["next_cursor"]
+            if not cursor:
+                return names
+
+    def test_tied_sort_keys_page_through_every_product(self):
+        self.assertEqual(
+            self._walk(),
+            ["Blue shirt", "Blue mug", "Red mug", "Green mug", "Lamp"],
+        )
+        self.assertEqual(self._walk(category="Home", max_price=3), ["Blue mug", "Red mug", "Green mug"])
+
+    def test_sort_keys_cannot_be_null(self):
+        product = Product.query.filter_by(product_name="Lamp").first()
+        self.assertIsNone(update_product(product.product_id, {"price": None}))
+        self.assertIsNone(update_product(product.product_id, {"category": None}))
+        db.session.add(Product(product_name="Unpriced", category="Home", price=None, stock=1))
+        with self.assertRaises(IntegrityError):
+            db.session.commit()
+        db.session.rollback()
+        self.assertEqual(len(self._walk()), 5)
+
+    def test_cursor_values_are_type_checked(self):
+        for values in (["Home", None, 3], ["Home", "3", 3], [1, 2, 3], ["Home", 3, True], ["Home", 3.0, 2.5]):
+            response = self.client.get("/product/all", query_string={"limit": 1, "cursor": encode_cursor(values)})
+            self.assertEqual(response.status_code, 400, values)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+from database.db import db
+from database.models import Product
+from products.product_search import search_catalog, tokenize, _fallback_index
+from db_test_case import DatabaseTestCase
+
+class ProductSearchTestCase(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        _fallback_index.reset()
+        db.session.add_all([
+            Product(product_name="Desk Lamp", description="Warm light for reading", category="Home", price=10, stock=1),
+            Product(product_name="Reading Glasses", description="Blue light filter", category="Accessories", price=5, stock=1),
+            Product(product_name="Kettle", description="Boils water", category="Kitchen", price=20, stock=1),
+        ])
+        db.session.commit()
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize("USB-C Fast, Charging!"), ["usb", "c", "fast", "charging"])
+
+    def test_name_matches_rank_above_description_matches(self):
+        names = [p.product_name for p, _ in search_catalog("reading")]
+        self.assertEqual(names, ["Reading Glasses", "Desk Lamp"])
+
+    def test_all_terms_must_match(self):
+        names = [p.product_name for p, _ in search_catalog("blue light")]
+        self.assertEqual(names, ["Reading Glasses"])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.assertEqual(search_catalog("teapot"), [])
+        kettle = Product.query.filter_by(product_name="Kettle").first()
+        kettle.product_name = "Teapot"
+        db.session.commit()
+        self.assertEqual([p.product_name for p, _ in search_catalog("teapot")], ["Teapot"])
+        db.session.delete(kettle)
+        db.session.commit()
+        self.assertEqual(search_catalog("teapot"), [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+from flask_jwt_extended import JWTManager
+from database.db import db
+from database.models import Role, User, SellerProfile
+from admin.admin_routes import admin_bp
+from auth.session_manager import issue_access_token
+from middleware.principal import invalidate_principal
+from middleware.sql_profiler import init_sql_profiler, profile_sql, query_budget, statement_shape, QueryBudgetExceeded
+from db_test_case import DatabaseTestCase
+
+SELLERS = 8
+
+class QueryBudgetTestCase(DatabaseTestCase):
+    config = {
+        "JWT_SECRET_KEY": "test-secret-key-with-enough-length",
+        "SQL_PROFILER_ENABLED": True,
+        "SQL_PROFILER_REPEAT_THRESHOLD": 3,
+    }
+
+    def setUp(self):
+        super().setUp()
+        JWTManager(self.app)
+        init_sql_profiler(self.app)
+        self.app.register_blueprint(admin_bp, url_prefix="/admin")
+        db.session.add_all([Role(role_id=2, role_name="ADMIN"), Role(role_id=3, role_name="SELLER")])
+        admin = User(name="Admin", email="admin@example.com", password_hash="x", role_id=2)
+        db.session.add(admin)
+        for n in range(SELLERS):
+            seller = User(name=f"Seller {n}", email=f"s{n}@example.com", password_hash="x", role_id=3)
+            db.session.add(seller)
+            db.session.flush()
+            db.session.add(SellerProfile(user_id=seller.user_id, shop_name=f"Shop {n}",
+                                         status="APPROVED" if n % 2 else "PENDING"))
+        db.session.commit()
+        self.admin_id = admin.user_id
+        self.headers = {"Authorization": f"Bearer {issue_access_token(str(admin.user_id))}"}
+        db.session.remove()
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        invalidate_principal(self.admin_id)
+        super().tearDown()
+
+    def test_statement_shape_ignores_literals_and_in_lists(self):
+        self.assertEqual(
+            statement_shape("SELECT * FROM users WHERE user_id IN (?, ?, ?) AND name = 'x'"),
+            statement_shape("SELECT * FROM users\n WHERE user_id IN (?) AND name = 'y'"),
+        )
+
+    def test_seller_lists_fit_query_budget(self):
+        for path in ("/admin/sellers", "/admin/seller-requests"):
+            with query_budget(3, repeat_threshold=3):
+                response = self.client.get(path, headers=self.headers)
+            self.assertEqual(response.status_code, 200, path)
+            self.assertEqual(len(response.get_json()), SELLERS // 2)
+            self.assertTrue(all(row["user_email"] for row in response.get_json()))
+            self.assertEqual(response.headers["X-SQL-Repeated"], "0")
+
+    def test_n_plus_one_is_reported(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            with query_budget(100, repeat_threshold=3):
+                for profile in SellerProfile.query.all():
+                    profile.user.email
+        with self.assertRaises(QueryBudgetExceeded):
+            with query_budget(1):
+                SellerProfile.query.all()
+                User.query.all()
+
+    def test_response_headers_report_query_count(self):
+        with profile_sql() as profile:
+            response = self.client.get("/admin/users", headers=self.headers)
+        self.assertEqual(response.headers["X-SQL-Query-Count"], str(profile.count))
+        self.assertIn("X-SQL-Query-Time-Ms", response.headers)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+from flask import Flask, jsonify
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from database.models import Product
+from middleware import sql_profiler
+from middleware.request_metrics import init_request_metrics
+from middleware.sql_profiler import init_sql_profiler
+from db_test_case import DatabaseTestCase
+
+class RequestMetricsTestCase(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.metrics = init_request_metrics(self.app)
+
+        @self.app.route("/three-queries")
+        def three_queries():
+            for _ in range(3):
+                Product.query.count()
+            return jsonify({}), 200
+
+        @self.app.route("/boom")
+        def boom():
+            return jsonify({"error": "bad"}), 400
+
+        self.client = self.app.test_client()
+
+    def _scrape(self, **kwargs):
+        response = self.client.get("/metrics", **kwargs)
+        return response, response.get_data(as_text=True)
+
+    def test_latency_histogram_per_endpoint_and_status(self):
+        self.client.get("/three-queries")
+        self.client.get("/boom")
+        self.client.get("/boom")
+        self.client.get("/no-such-page")
+        response, text = self._scrape()
+        self.assertTrue(response.content_type.startswith("text/plain"))
+        self.assertIn('parama_http_request_duration_seconds_count{endpoint="three_queries",method="GET",status="200"} 1', text)
+        self.assertIn('parama_http_request_duration_seconds_count{endpoint="boom",method="GET",status="400"} 2', text)
+        self.assertIn('parama_http_request_duration_seconds_bucket{endpoint="boom",method="GET",status="400",le="+Inf"} 2', text)
+        self.assertIn('endpoint="unmatched",method="GET",status="404"', text)
+
+    def test_sql_statements_counted_per_request(self):
+        self.client.get("/three-queries")
+        _, text = self._scrape()
+        self.assertIn('parama_http_request_db_queries_sum{endpoint="three_queries"} 3', text)
+        self.assertIn('parama_http_request_db_queries_bucket{endpoint="three_queries",le="2"} 0', text)
+        self.assertIn('parama_http_request_db_queries_bucket{endpoint="three_queries",le="5"} 1', text)
+        Product.query.count()
+        _, text = self._scrape()
+        self.assertIn('parama_http_request_db_queries_sum{endpoint="three_queries"} 3', text)
+
+    def test_crypto_timers_exposed(self):
+        from security.encoding import base64_encode
+        base64_encode("x")
+        _, text = self._scrape()
+        self.assertIn('parama_crypto_operation_seconds_count{operation="base64_encode"}', text)
+
+    def test_token_required_when_configured(self):
+        self.app.config["METRICS_TOKEN"] = "s3cret"
+        self.assertEqual(self._scrape()[0].status_code, 401)
+        self.assertEqual(self._scrape(headers={"Authorization": "Bearer s3cret"})[0].status_code, 200)
+
+    def test_profiler_shares_the_request_record(self):
+        self.app.config["SQL_PROFILER_ENABLED"] = True
+        init_sql_profiler(self.app)
+        response = self.client.get("/three-queries")
+        self.assertEqual(response.headers["X-SQL-Query-Count"], "3")
+        _, text = self._scrape()
+        self.assertIn('parama_http_request_db_queries_sum{endpoint="three_queries"} 3', text)
+        self.assertTrue(event.contains(Engine, "after_cursor_execute", sql_profiler._after_cursor_execute))
+
+class MetricsConfigTestCase(unittest.TestCase):
+    def test_production_requires_token(self):
+        app = Flask(__name__)
+        app.config["APP_ENV"] = "production"
+        with self.assertRaises(RuntimeError):
+            init_request_metrics(app)
+        app.config["METRICS_ENABLED"] = False
+        self.assertIsNone(init_request_metrics(app))
+        app.config.update(METRICS_ENABLED=True, METRICS_TOKEN="s3cret")
+        self.assertIsNotNone(init_request_metrics(app))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import importlib.util
+import json
+import os
+import unittest
+from datetime import date, datetime
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from database.db import db
+from database.models import Order, OrderItem, Product, RevenueDaily, RevenueDailySeller, RevenueDailyCategory
+from admin.admin_routes import admin_bp
+from orders.revenue_service import record_order_revenue, get_revenue_summary
+from security.encryption import encrypt_data
+from db_test_case import DatabaseTestCase, ApiTestCase
+
+MIGRATION = os.path.join(os.path.dirname(__file__), "..", "migrations", "versions", "1d9f4b6e7a20_add_revenue_rollups.py")
+
+DAY_1 = date(2026, 2, 1)
+DAY_2 = date(2026, 2, 2)
+
+def item(product_id, seller_id, quantity, unit_price):
+    return OrderItem(product_id=product_id, seller_id=seller_id, quantity=quantity, unit_price=unit_price)
+
+class RevenueServiceTestCase(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        categories = {1: "Books", 2: "Home", 3: None}
+        # Two orders land in the same (day, seller 10, Books) bucket; seller 20 and Home only once.
+        record_order_revenue(DAY_1, 50.0, [item(1, 10, 2, 10.0), item(2, 20, 1, 30.0)], categories)
+        record_order_revenue(DAY_1, 15.0, [item(1, 10, 1, 15.0)], categories)
+        record_order_revenue(DAY_2, 8.0, [item(3, 10, 4, 2.0)], categories)
+        db.session.commit()
+
+    def test_repeat_orders_upsert_one_row_per_bucket(self):
+        daily = db.session.get(RevenueDaily, DAY_1)
+        self.assertEqual((daily.order_count, daily.revenue), (2, 65.0))
+        seller = db.session.get(RevenueDailySeller, (DAY_1, 10))
+        self.assertEqual((seller.order_count, seller.items_sold, seller.revenue), (2, 3, 35.0))
+        books = db.session.get(RevenueDailyCategory, (DAY_1, "Books"))
+        self.assertEqual((books.order_count, books.items_sold, books.revenue), (2, 3, 35.0))
+        self.assertEqual(RevenueDailySeller.query.count(), 3)
+        self.assertEqual(RevenueDailyCategory.query.count(), 3)
+        self.assertEqual(db.session.get(RevenueDailyCategory, (DAY_2, "General")).items_sold, 4)
+
+    def test_totals_and_group_by(self):
+        self.assertEqual(get_revenue_summary(), {"total_revenue": 73.0, "order_count": 3})
+        by_day = get_revenue_summary(group_by="day")["groups"]
+        self.assertEqual(by_day, [
+            {"day": "2026-02-01", "order_count": 2, "revenue": 65.0},
+            {"day": "2026-02-02", "order_count": 1, "revenue": 8.0},
+        ])
+        by_seller = get_revenue_summary(group_by="seller")["groups"]
+        self.assertEqual(by_seller, [
+            {"seller": 10, "order_count": 3, "revenue": 43.0, "items_sold": 7},
+            {"seller": 20, "order_count": 1, "revenue": 30.0, "items_sold": 1},
+        ])
+        by_category = get_revenue_summary(group_by="category")["groups"]
+        self.assertEqual([g["category"] for g in by_category], ["Books", "General", "Home"])
+
+    def test_date_range_is_inclusive(self):
+        self.assertEqual(get_revenue_summary(start=DAY_2)["order_count"], 1)
+        self.assertEqual(get_revenue_summary(end=DAY_1)["total_revenue"], 65.0)
+        summary = get_revenue_summary(DAY_1, DAY_1, "seller")
+        self.assertEqual(summary["order_count"], 2)
+        self.assertEqual([g["items_sold"] for g in summary["groups"]], [3, 1])
+        self.assertEqual(get_revenue_summary(date(2026, 3, 1), None, "day"),
+                         {"total_revenue": 0.0, "order_count": 0, "group_by": "day", "groups": []})
+
+class RevenueRouteTestCase(ApiTestCase):
+    blueprints = ((admin_bp, "/admin"),)
+
+    def setUp(self):
+        super().setUp()
+        self.admin = self.auth(self.make_user("Admin", "ADMIN"))
+        record_order_revenue(DAY_1, 20.0, [item(1, 10, 1, 20.0)], {1: "Books"})
+        db.session.commit()
+
+    def test_summary(self):
+        response = self.client.get("/admin/revenue", query_string={"group_by": "category", "from": "2026-02-01"}, headers=self.admin)
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual((data["total_revenue"], data["invalid_signatures"]), (20.0, 0))
+        self.assertEqual(data["groups"], [{"category": "Books", "order_count": 1, "revenue": 20.0, "items_sold": 1}])
+
+    def test_invalid_parameters_are_rejected(self):
+        for query in ({"group_by": "product"}, {"from": "02/01/2026"}, {"to": "yesterday"}):
+            response = self.client.get("/admin/revenue", query_string=query, headers=self.admin)
+            self.assertEqual(response.status_code, 400, query)
+
+class RevenueBackfillMigrationTestCase(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        spec = importlib.util.spec_from_file_location("revenue_migration", MIGRATION)
+        self.migration = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(self.migration)
+        db.session.add_all([Product(product_id=1, product_name="Novel", category="Books", price=10, stock=5),
+                            Product(product_id=2, product_name="Lamp", category="Home", price=30, stock=5)])
+        for total, created_at, items in (
+            (50.0, datetime(2026, 2, 1, 9), [item(1, 10, 2, 10.0), item(2, 20, 1, 30.0)]),
+            (15.0, datetime(2026, 2, 1, 18), [item(1, 10, 1, 15.0)]),
+            (30.0, datetime(2026, 2, 2, 8), [item(2, 20, 1, 30.0)]),
+        ):
+            order = Order(user_id=1, encrypted_data=encrypt_data(json.dumps({"total": total})), created_at=created_at)
+            order.order_items = items
+            db.session.add(order)
+        db.session.add(Order(user_id=1, encrypted_data="not a token", created_at=datetime(2026, 2, 2, 9)))
+        db.session.commit()
+        for model in (RevenueDaily, RevenueDailySeller, RevenueDailyCategory):
+            model.__table__.drop(db.engine)
+
+    def test_upgrade_backfills_rollups_from_existing_orders(self):
+        with db.engine.begin() as connection:
+            with Operations.context(MigrationContext.configure(connection)):
+                self.migration.upgrade()
+        self.assertEqual(get_revenue_summary(), {"total_revenue": 95.0, "order_count": 4})
+        self.assertEqual(get_revenue_summary(DAY_2, DAY_2)["total_revenue"], 30.0)
+        seller = db.session.get(RevenueDailySeller, (DAY_1, 10))
+        self.assertEqual((seller.order_count, seller.items_sold, seller.revenue), (2, 3, 35.0))
+        home = db.session.get(RevenueDailyCategory, (DAY_2, "Home"))
+        self.assertEqual((home.order_count, home.items_sold, home.revenue), (1, 1, 30.0))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+from database.db import db
+from database.models import OrderItem, Product
+from orders.order_routes import order_bp
+from orders.order_service import get_seller_order_products
+from middleware.sql_profiler import profile_sql
+from db_test_case import ApiTestCase
+
+class SellerOrdersTestCase(ApiTestCase):
+    blueprints = ((order_bp, "/order"),)
+
+    def setUp(self):
+        super().setUp()
+        self.buyer = self.make_user("Buyer")
+        self.seller_a = self.make_user("Alice", "SELLER")
+        self.seller_b = self.make_user("Bob", "SELLER")
+        db.session.add_all([
+            Product(product_id=1, product_name="Mug", category="Home", price=5, stock=1000, seller_id=self.seller_a),
+            Product(product_id=2, product_name="Plate", category="Home", price=7, stock=1000, seller_id=self.seller_a),
+            Product(product_id=3, product_name="Novel", category="Books", price=12, stock=1000, seller_id=self.seller_b),
+        ])
+        db.session.commit()
+
+    def place(self, items):
+        total = sum(i["price"] * i["quantity"] for i in items)
+        response = self.client.post("/order/place", json={"items": items, "total": total}, headers=self.auth(self.buyer))
+        self.assertEqual(response.status_code, 200, response.get_json())
+
+    def place_mixed(self):
+        self.place([
+            {"product_id": 1, "quantity": 2, "price": 5},
+            {"product_id": 3, "quantity": 1, "price": 12},
+            {"product_id": 2, "quantity": 1, "price": 7},
+        ])
+
+    def seller_orders(self, seller_id):
+        response = self.client.get("/order/seller-orders", headers=self.auth(seller_id))
+        self.assertEqual(response.status_code, 200)
+        return response.get_json()["data"]
+
+    def test_multi_seller_order_is_split_per_seller(self):
+        self.place_mixed()
+        self.place([{"product_id": 3, "quantity": 2, "price": 12}])
+
+        rows = OrderItem.query.order_by(OrderItem.order_item_id).all()
+        self.assertEqual([(r.product_id, r.seller_id, r.quantity, r.unit_price) for r in rows], [
+            (1, self.seller_a, 2, 5), (3, self.seller_b, 1, 12), (2, self.seller_a, 1, 7), (3, self.seller_b, 2, 12),
+        ])
+        self.assertEqual(get_seller_order_products(self.seller_a), {1: {1, 2}})
+        self.assertEqual(get_seller_order_products(self.seller_b), {1: {3}, 2: {3}})
+
+        alice = self.seller_orders(self.seller_a)
+        self.assertEqual(len(alice), 1)
+        self.assertEqual([i["product_id"] for i in alice[0]["items"]], [1, 2])
+        self.assertEqual(alice[0]["total_for_seller"], 17)
+        self.assertEqual(alice[0]["user_id"], self.buyer)
+
+        bob = self.seller_orders(self.seller_b)
+        self.assertEqual([o["order_id"] for o in bob], [1, 2])
+        self.assertEqual([[i["product_id"] for i in o["items"]] for o in bob], [[3], [3]])
+        self.assertEqual([o["total_for_seller"] for o in bob], [12, 24])
+
+    def test_seller_without_sales_sees_nothing(self):
+        self.place([{"product_id": 3, "quantity": 1, "price": 12}])
+        self.assertEqual(self.seller_orders(self.seller_a), [])
+
+    def test_query_count_does_not_grow_with_orders(self):
+        self.place_mixed()
+        self.seller_orders(self.seller_a)  # warm the principal cache
+        with profile_sql() as few:
+            self.assertEqual(len(self.seller_orders(self.seller_a)), 1)
+        for _ in range(5):
+            self.place_mixed()
+        with profile_sql() as many:
+            self.assertEqual(len(self.seller_orders(self.seller_a)), 6)
+        self.assertEqual(many.count, few.count, many.report())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import time
+import unittest
+from unittest import mock
+from flask_jwt_extended import JWTManager, decode_token, jwt_required
+from database.db import db
+from database.models import Role, User, SellerProfile
+from auth.session_manager import issue_access_token
+from middleware.principal import current_token_version, bump_token_version, invalidate_principal, load_principal
+from middleware.role_middleware import role_required
+from db_test_case import DatabaseTestCase
+
+class SessionManagerTestCase(DatabaseTestCase):
+    config = {
+        "JWT_SECRET_KEY": "test-secret-key-with-enough-length",
+        "TOKEN_VERSION_CACHE_TTL": 60,
+    }
+
+    def setUp(self):
+        super().setUp()
+        JWTManager(self.app)
+        db.session.add(Role(role_id=3, role_name="SELLER"))
+        user = User(name="Seller", email="s@example.com", password_hash="x", role_id=3)
+        db.session.add(user)
+        db.session.flush()
+        db.session.add(SellerProfile(user_id=user.user_id, shop_name="Shop", status="APPROVED"))
+        db.session.commit()
+        self.user_id = user.user_id
+
+    def tearDown(self):
+        invalidate_principal(self.user_id)
+        super().tearDown()
+
+    def test_token_carries_role_claims(self):
+        claims = decode_token(issue_access_token(str(self.user_id)))
+        self.assertEqual(claims["role"], "SELLER")
+        self.assertEqual(claims["seller_status"], "APPROVED")
+        self.assertEqual(claims["shop_name"], "Shop")
+        self.assertEqual(claims["tv"], 0)
+
+    def test_bump_invalidates_cached_version(self):
+        self.assertEqual(current_token_version(self.user_id), 0)
+        bump_token_version(self.user_id)
+        db.session.commit()
+        self.assertEqual(current_token_version(self.user_id), 0)
+        invalidate_principal(self.user_id)
+        self.assertEqual(current_token_version(self.user_id), 1)
+
+    def test_role_required_accepts_any_listed_role(self):
+        @self.app.route("/either")
+        @jwt_required()
+        @role_required("USER", "SELLER")
+        def either(user_id):
+            return {"user_id": user_id}
+
+        @self.app.route("/admin-only")
+        @jwt_required()
+        @role_required("ADMIN")
+        def admin_only(user_id):
+            return {"user_id": user_id}
+
+        client = self.app.test_client()
+        headers = {"Authorization": f"Bearer {issue_access_token(str(self.user_id))}"}
+        self.assertEqual(client.get("/either", headers=headers).get_json(), {"user_id": self.user_id})
+        self.assertEqual(client.get("/admin-only", headers=headers).status_code, 403)
+
+class CrossProcessRevocationTestCase(DatabaseTestCase):
+    """An admin action handled by another worker: this process's caches are never invalidated."""
+
+    config = {
+        "JWT_SECRET_KEY": "test-secret-key-with-enough-length",
+        "TOKEN_VERSION_CACHE_TTL": 5,
+        "PRINCIPAL_CACHE_TTL": 300,
+    }
+
+    def setUp(self):
+        super().setUp()
+        JWTManager(self.app)
+        db.session.add(Role(role_id=1, role_name="USER"))
+        user = User(name="Shopper", email="u@example.com", password_hash="x", role_id=1, status="ACTIVE")
+        db.session.add(user)
+        db.session.commit()
+        self.user_id = user.user_id
+
+        @self.app.route("/me")
+        @jwt_required()
+        @role_required("USER")
+        def me(user_id):
+            return {"user_id": user_id}
+
+        self.client = self.app.test_client()
+        self.headers = {"Authorization": f"Bearer {issue_access_token(str(self.user_id))}"}
+
+    def tearDown(self):
+        invalidate_principal(self.user_id)
+        super().tearDown()
+
+    def test_disabled_elsewhere_is_rejected_once_ttl_elapses(self):
+        self.assertEqual(self.client.get("/me", headers=self.headers).status_code, 200)
+        load_principal(self.user_id)  # an ACTIVE principal cached well past the version TTL
+
+        # What toggle_user does on another worker: no invalidate_principal here.
+        db.session.get(User, self.user_id).status = "DISABLED"
+        bump_token_version(self.user_id)
+        db.session.commit()
+
+        self.assertEqual(self.client.get("/me", headers=self.headers).status_code, 200)
+        later = time.monotonic() + 6
+        with mock.patch("middleware.principal.time.monotonic", return_value=later):
+            response = self.client.get("/me", headers=self.headers)
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.get_json()["message"], "Account disabled")
+
+if __name__ == "__main__":
+    unittest.main()
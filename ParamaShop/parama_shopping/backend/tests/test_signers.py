@@ -0,0 +1,78 @@
+import json
+import unittest
+from cryptography.hazmat.primitives.asymmetric import ed25519
+from database.db import db
+from database.models import Order
+from security.encryption import encrypt_data
+from security.digital_signature import sign_text_base64
+from security.crypto_context import CryptoContext, get_crypto_context, set_crypto_context
+from security.signers import RSAPSSSigner, Ed25519Signer, SignerRegistry, RSA_PSS_SHA256, ED25519
+from orders.order_audit import resign_orders
+from db_test_case import DatabaseTestCase
+
+class SignerRegistryTestCase(unittest.TestCase):
+    def setUp(self):
+        context = get_crypto_context()
+        self.rsa = RSAPSSSigner(context.rsa_private_key, context.rsa_public_key)
+        self.ed = Ed25519Signer(ed25519.Ed25519PrivateKey.generate())
+
+    def test_ed25519_round_trip_and_tagging(self):
+        registry = SignerRegistry([self.rsa, self.ed], ED25519)
+        signature, algorithm, key_id = registry.sign("payload")
+        self.assertEqual((algorithm, key_id), (ED25519, self.ed.key_id))
+        self.assertTrue(registry.verify("payload", signature, algorithm, key_id))
+        self.assertFalse(registry.verify("tampered", signature, algorithm, key_id))
+
+    def test_untagged_signatures_verify_as_legacy_rsa(self):
+        registry = SignerRegistry([self.rsa, self.ed], ED25519)
+        legacy = sign_text_base64("payload")
+        self.assertTrue(registry.verify("payload", legacy))
+        self.assertFalse(registry.verify("payload", legacy, ED25519, self.ed.key_id))
+
+    def test_unknown_key_id_fails_closed(self):
+        registry = SignerRegistry([self.rsa, self.ed], RSA_PSS_SHA256)
+        signature, algorithm, _ = registry.sign("payload")
+        self.assertFalse(registry.verify("payload", signature, algorithm, "0" * 16))
+
+class ResignOrdersTestCase(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.original = get_crypto_context()
+        ed_key = ed25519.Ed25519PrivateKey.generate()
+        self.ed = Ed25519Signer(ed_key)
+        set_crypto_context(CryptoContext(
+            self.original.fernet_keys,
+            self.original.rsa_private_key,
+            self.original.rsa_public_key,
+            ed25519_private_key=ed_key,
+            signature_algorithm=ED25519,
+        ))
+        for total in (1, 2):
+            payload = json.dumps({"total": total})
+            db.session.add(Order(user_id=1, encrypted_data=encrypt_data(payload), order_signature=sign_text_base64(payload)))
+        tampered = Order(user_id=1, encrypted_data=encrypt_data(json.dumps({"total": 999})),
+                         order_signature=sign_text_base64(json.dumps({"total": 3})))
+        db.session.add(tampered)
+        db.session.commit()
+        self.tampered_id = tampered.order_id
+
+    def tearDown(self):
+        set_crypto_context(self.original)
+        super().tearDown()
+
+    def test_resign_moves_valid_orders_and_flags_tampered(self):
+        result = resign_orders(ED25519, batch_size=1)
+        self.assertEqual(result["resigned"], 2)
+        self.assertEqual(result["skipped_order_ids"], [self.tampered_id])
+        for order in Order.query.filter(Order.order_id != self.tampered_id):
+            self.assertEqual((order.signature_alg, order.signature_key_id), (ED25519, self.ed.key_id))
+            self.assertTrue(order.integrity_valid)
+        self.assertFalse(db.session.get(Order, self.tampered_id).integrity_valid)
+        self.assertEqual(resign_orders(ED25519)["resigned"], 0)
+
+    def test_resign_requires_matching_active_signer(self):
+        with self.assertRaises(ValueError):
+            resign_orders(RSA_PSS_SHA256)
+
+if __name__ == "__main__":
+    unittest.main()
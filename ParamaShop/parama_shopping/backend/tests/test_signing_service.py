@@ -0,0 +1,53 @@
+import json
+import unittest
+from database.db import db
+from database.models import Order
+from security.encryption import encrypt_data
+from security.digital_signature import verify_text_base64
+from security.signing_service import SigningService, sign_pending_orders
+from db_test_case import DatabaseTestCase
+
+class SigningServiceTestCase(DatabaseTestCase):
+    threaded = True
+
+    def setUp(self):
+        super().setUp()
+        self.payload = json.dumps({"items": [{"product_id": 1, "quantity": 1}], "total": 10})
+        order = Order(user_id=1, encrypted_data=encrypt_data(self.payload), signature_pending=True)
+        db.session.add(order)
+        db.session.commit()
+        self.order_id = order.order_id
+
+    def _order(self):
+        db.session.expire_all()
+        return db.session.get(Order, self.order_id)
+
+    def test_worker_signs_and_clears_pending(self):
+        service = SigningService(self.app, workers=2, queue_size=4)
+        service.start()
+        self.assertTrue(service.reserve())
+        service.submit(self.order_id, self.payload)
+        service.stop()
+        order = self._order()
+        self.assertFalse(order.signature_pending)
+        self.assertTrue(order.integrity_valid)
+        self.assertTrue(verify_text_base64(self.payload, order.order_signature))
+        self.assertEqual(service.stats()["signed"], 1)
+
+    def test_full_queue_rejects_reservation(self):
+        service = SigningService(self.app, workers=1, queue_size=1)
+        service.start()
+        self.assertTrue(service.reserve())
+        self.assertFalse(service.reserve())
+        service.release()
+        service.stop()
+        self.assertEqual(service.stats()["rejected"], 1)
+
+    def test_sign_pending_orders_recovers_leftovers(self):
+        self.assertEqual(sign_pending_orders(), 1)
+        order = self._order()
+        self.assertFalse(order.signature_pending)
+        self.assertTrue(order.integrity_valid)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import threading
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+from flask import Flask
+from database.db import db
+from database.models import Order, Product, TransactionNodeLease
+from orders import order_routes, transaction_ids
+from orders.order_routes import order_bp
+from orders.transaction_ids import TransactionIdGenerator, NodeLease, MAX_SEQUENCE, EPOCH_MS, init_transaction_ids
+from db_test_case import DatabaseTestCase, ApiTestCase
+
+class TransactionIdGeneratorTestCase(unittest.TestCase):
+    def test_format_matches_existing_scheme(self):
+        txn = TransactionIdGenerator(node_id=7).next_id("42")
+        self.assertRegex(txn, r"^TXN-42-\d{8}-\d+$")
+
+    def test_ids_are_unique_across_threads(self):
+        generator = TransactionIdGenerator(node_id=1)
+        ids = []
+        lock = threading.Lock()
+
+        def worker():
+            batch = [generator.next_id("MULTI") for _ in range(2000)]
+            with lock:
+                ids.extend(batch)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(set(ids)), 16000)
+
+    def test_sequence_overflow_waits_for_next_millisecond(self):
+        ticks = iter([EPOCH_MS + 5] * (MAX_SEQUENCE + 3) + [EPOCH_MS + 6] * 5)
+        generator = TransactionIdGenerator(node_id=0, clock=lambda: next(ticks))
+        values = [generator.next_value() for _ in range(MAX_SEQUENCE + 2)]
+        self.assertEqual(values[MAX_SEQUENCE][1], EPOCH_MS + 5)
+        self.assertEqual(values[-1][1], EPOCH_MS + 6)
+        self.assertEqual(len({value for value, _ in values}), MAX_SEQUENCE + 2)
+
+    def test_clock_going_backwards_keeps_ids_increasing(self):
+        ticks = iter([EPOCH_MS + 100, EPOCH_MS + 50, EPOCH_MS + 101])
+        generator = TransactionIdGenerator(node_id=3, clock=lambda: next(ticks))
+        values = [generator.next_value()[0] for _ in range(3)]
+        self.assertEqual(values, sorted(values))
+        self.assertEqual(len(set(values)), 3)
+
+class NodeSettingTestCase(unittest.TestCase):
+    def tearDown(self):
+        transaction_ids._node_setting = None
+        transaction_ids._generator = None
+
+    def _init(self, **config):
+        app = Flask(__name__)
+        app.config.update(config)
+        init_transaction_ids(app)
+
+    def test_production_requires_node_id(self):
+        with self.assertRaises(RuntimeError):
+            self._init(APP_ENV="production")
+        self._init(APP_ENV="production", TXN_NODE_ID="17")
+        self.assertIn("-", transaction_ids.generate_transaction_id("1"))
+        self.assertEqual(transaction_ids._generator.node_id, 17)
+
+    def test_node_id_is_validated(self):
+        with self.assertRaises(ValueError):
+            self._init(TXN_NODE_ID="1024")
+        self._init(TXN_NODE_ID="lease")
+        self.assertEqual(transaction_ids._node_setting, "lease")
+
+class NodeLeaseTestCase(DatabaseTestCase):
+    def test_live_processes_get_distinct_node_ids(self):
+        leases = [NodeLease(db.engine) for _ in range(5)]
+        self.assertEqual(len({lease.current() for lease in leases}), 5)
+        self.assertEqual(TransactionNodeLease.query.count(), 5)
+
+    def test_expired_lease_is_reused_and_lost_lease_replaced(self):
+        first = NodeLease(db.engine, ttl_seconds=60)
+        node_id = first.current()
+        TransactionNodeLease.query.update({"expires_at": datetime.utcnow() - timedelta(seconds=1)})
+        db.session.commit()
+        second = NodeLease(db.engine, ttl_seconds=60)
+        self.assertEqual(second.current(), node_id)
+        # first's lease now belongs to second; renewing must move it to a new id.
+        first.expires_at = datetime.utcnow()
+        self.assertNotEqual(first.current(), node_id)
+
+class DuplicateTransactionIdTestCase(ApiTestCase):
+    blueprints = ((order_bp, "/order"),)
+
+    def test_duplicate_id_is_regenerated(self):
+        user_id = self.make_user("Buyer")
+        db.session.add(Product(product_id=1, product_name="Mug", price=5, stock=10))
+        db.session.add(Order(user_id=user_id, transaction_id=order_routes.base64_encode("TXN-X-20260101-1")))
+        db.session.commit()
+        ids = iter(["TXN-X-20260101-1", "TXN-X-20260101-1", "TXN-X-20260101-2"])
+        with mock.patch.object(order_routes, "generate_transaction_id", lambda token: next(ids)):
+            response = self.client.post(
+                "/order/place",
+                json={"items": [{"product_id": 1, "quantity": 2, "price": 5}], "total": 10},
+                headers=dict(self.auth(user_id), **{"Idempotency-Key": "k1"}),
+            )
+        self.assertEqual(response.status_code, 200, response.get_json())
+        self.assertEqual(response.get_json()["data"]["transaction_id"], "TXN-X-20260101-2")
+        self.assertEqual(Order.query.count(), 2)
+        self.assertEqual(db.session.get(Product, 1).stock, 8)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,6 +4,7 @@ from flask_jwt_extended import jwt_required, get_jwt_identity, verify_jwt_in_req
 from database.models import db, User, Order
 from utils.response_handler import success, error
 from logs.activity_logger import log_activity
+from middleware.principal import invalidate_principal
 
 user_bp = Blueprint("user", __name__)
 logger = logging.getLogger("user_routes")
@@ -95,6 +96,7 @@ def delete_user():
             pass
         db.session.delete(user)
         db.session.commit()
+        invalidate_principal(user.user_id)
         logger.info(f"User deleted: {user_id}")
         log_activity(user_id, "User Account Deleted")
         return success("User deleted")
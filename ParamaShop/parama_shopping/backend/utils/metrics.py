@@ -0,0 +1,148 @@
+import math
+import threading
+import time
+
+# Prometheus default latency buckets (seconds).
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Every Nth call of an operation is logged at DEBUG; 0 disables sampled logging.
+DEFAULT_LOG_SAMPLE_RATE = 1000
+
+
+class OperationMetrics:
+    """Thread-safe counters and timers for hot-path primitives (encoding, crypto).
+
+    Each named operation keeps calls, errors, bytes processed and cumulative /
+    maximum duration, replacing a log line per call with a few integer updates.
+    """
+
+    def __init__(self, log_sample_rate=DEFAULT_LOG_SAMPLE_RATE):
+        self.log_sample_rate = log_sample_rate
+        self._lock = threading.Lock()
+        self._operations = {}
+
+    def record(self, name, started, nbytes=0, error=False):
+        """Account one call that began at started (time.perf_counter()).
+
+        Returns True when this call is the sampled one and should be logged.
+        """
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            stats = self._operations.get(name)
+            if stats is None:
+                stats = self._operations[name] = [0, 0, 0, 0.0, 0.0]
+            stats[0] += 1
+            stats[1] += bool(error)
+            stats[2] += nbytes
+            stats[3] += elapsed
+            if elapsed > stats[4]:
+                stats[4] = elapsed
+            calls = stats[0]
+        rate = self.log_sample_rate
+        return bool(rate) and calls % rate == 1 % rate
+
+    def snapshot(self):
+        with self._lock:
+            items = [(name, list(stats)) for name, stats in self._operations.items()]
+        return {
+            name: {
+                "calls": calls,
+                "errors": errors,
+                "bytes": nbytes,
+                "total_seconds": round(total, 6),
+                "avg_us": round(total / calls * 1e6, 2) if calls else None,
+                "max_us": round(longest * 1e6, 2),
+            }
+            for name, (calls, errors, nbytes, total, longest) in sorted(items)
+        }
+
+    def reset(self):
+        with self._lock:
+            self._operations.clear()
+
+
+operation_metrics = OperationMetrics()
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(names, values, extra=None):
+    pairs = list(zip(names, values)) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """Labelled histogram rendered in the Prometheus text exposition format."""
+
+    def __init__(self, name, documentation, labelnames, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def observe(self, labels, value):
+        """labels is a tuple of values in labelnames order."""
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * len(self.buckets), 0.0, 0]
+            counts = series[0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        with self._lock:
+            series = sorted((labels, list(counts), total, count) for labels, (counts, total, count) in self._series.items())
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labels, counts, total, count in series:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = format_labels(self.labelnames, labels, ("le", format_value(bound)))
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            label_text = format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {format_value(total)}")
+            lines.append(f"{self.name}_count{label_text} {count}")
+        return lines
+
+
+def render_operation_metrics(metrics, prefix="parama_crypto_operation"):
+    """OperationMetrics counters as Prometheus summaries (_sum/_count) plus error and byte counters."""
+    snapshot = metrics.snapshot()
+    lines = [
+        f"# HELP {prefix}_seconds Time spent in encoding and crypto primitives.",
+        f"# TYPE {prefix}_seconds summary",
+    ]
+    for name, stats in snapshot.items():
+        labels = format_labels(("operation",), (name,))
+        lines.append(f"{prefix}_seconds_sum{labels} {format_value(stats['total_seconds'])}")
+        lines.append(f"{prefix}_seconds_count{labels} {stats['calls']}")
+    for suffix, key, documentation in (
+        ("errors_total", "errors", "Failed calls of encoding and crypto primitives."),
+        ("bytes_total", "bytes", "Input bytes processed by encoding and crypto primitives."),
+    ):
+        lines.append(f"# HELP {prefix}_{suffix} {documentation}")
+        lines.append(f"# TYPE {prefix}_{suffix} counter")
+        for name, stats in snapshot.items():
+            lines.append(f"{prefix}_{suffix}{format_labels(('operation',), (name,))} {stats[key]}")
+    return lines
+
+
+def init_metrics(app):
+    operation_metrics.log_sample_rate = app.config.get("METRICS_LOG_SAMPLE_RATE", DEFAULT_LOG_SAMPLE_RATE)
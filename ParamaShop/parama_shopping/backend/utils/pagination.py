@@ -0,0 +1,41 @@
+import base64
+import binascii
+import json
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(values):
+    """Pack the sort key of the last row on a page into an opaque cursor string."""
+    raw = json.dumps(list(values), separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, size, types=None):
+    """Unpack a cursor produced by encode_cursor. Raises ValueError if it is malformed.
+
+    types, if given, holds one type (or tuple of types) per position; values of
+    any other type (or null) are rejected before they reach a query.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    if types is not None:
+        for value, expected in zip(values, types):
+            if isinstance(value, bool) or not isinstance(value, expected):
+                raise ValueError("Invalid cursor")
+    return values
+
+
+def parse_limit(value, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    if value in (None, ""):
+        return default
+    limit = int(value)
+    if limit <= 0:
+        raise ValueError("limit must be positive")
+    return min(limit, maximum)
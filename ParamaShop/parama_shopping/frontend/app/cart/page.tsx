@@ -1,6 +1,6 @@
 "use client";
 
-import { useEffect, useState } from "react";
+import { useEffect, useRef, useState } from "react";
 import Navbar from "@/components/Navbar";
 import ProtectedRoute from "@/components/ProtectedRoute";
 import CartItemRow, { type CartItem } from "@/components/CartItem";
@@ -28,11 +28,18 @@ export default function CartPage() {
     postal_code: "",
     country: "",
   });
+  // One Idempotency-Key per checkout attempt: retries of the same cart reuse it
+  // (and the same timestamp) so the server replays instead of ordering twice.
+  const pendingOrder = useRef<{ key: string; timestamp: string } | null>(null);
 
   useEffect(() => {
     setCartState(getCart());
   }, []);
 
+  useEffect(() => {
+    pendingOrder.current = null;
+  }, [cart, delivery]);
+
   const total = cart.reduce((sum, item) => sum + item.price * item.quantity, 0);
 
   function handleIncrease(id?: number) {
@@ -73,6 +80,11 @@ export default function CartPage() {
     setIsSubmitting(true);
     setTransactionId(null);
 
+    if (!pendingOrder.current) {
+      pendingOrder.current = { key: crypto.randomUUID(), timestamp: new Date().toISOString() };
+    }
+    const { key, timestamp } = pendingOrder.current;
+
     try {
       const items = cart.map((item) => ({
         product_id: item.product_id,
@@ -83,7 +95,7 @@ export default function CartPage() {
       const res = await api.post<{ status: string; data?: { transaction_id?: string } }>("/order/place", {
         items,
         total,
-        timestamp: new Date().toISOString(),
+        timestamp,
         delivery: {
           name: delivery.name.trim(),
           phone: delivery.phone.trim(),
@@ -94,7 +106,7 @@ export default function CartPage() {
           postal_code: delivery.postal_code.trim(),
           country: delivery.country.trim(),
         },
-      });
+      }, { headers: { "Idempotency-Key": key } });
       setSuccess("Order placed successfully.");
       setTransactionId(res.data?.data?.transaction_id ?? null);
       clearCart();